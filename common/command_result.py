@@ -0,0 +1,163 @@
+"""
+The result record of a remote command execution. It keeps the raw output
+bytes and decodes them only when they are accessed, while offering the
+same dictionary view ( 'Flag', 'msg', 'error_msg', 'error_code', 'cmd',
+'node' ) which the callers have been using.
+"""
+from collections.abc import MutableMapping
+from .gluster_xml import decode_cli_output
+
+
+def split_lines(text: str) -> list:
+    """
+    Split the text into lines keeping the newlines, the way readlines
+    does.
+    """
+    parts = text.split("\n")
+    lines = [f"{part}\n" for part in parts[:-1]]
+    if parts[-1]:
+        lines.append(parts[-1])
+    return lines
+
+
+class CommandResult(MutableMapping):
+    """
+    Result of a command. The dictionary view has the same keys as the
+    result dictionaries had,
+        - Flag : True if the command succeeded
+        - msg : stdout lines, or the decoded cliOutput for a successful
+                gluster command run with --xml
+        - error_msg : stderr, present only if the command failed
+        - error_code : exit code of the command
+        - cmd : command that got executed
+        - node : node on which the command got executed
+        - truncated : present only if a part of the stdout wasn't kept
+    The stdout is split into lines or decoded as XML only on the first
+    access of 'msg'.
+    """
+
+    __slots__ = ('cmd', 'node', 'error_code', 'truncated', 'stdout',
+                 'stderr', '_msg', '_extra')
+
+    def __init__(self, cmd: str, node: str, error_code: int,
+                 stdout: bytes = b"", stderr: bytes = b"",
+                 truncated: bool = False):
+        """
+        Args:
+            cmd (str): The command which was run.
+            node (str): The node it was run on.
+            error_code (int): Exit code of the command.
+            stdout (bytes): The stdout kept for the command.
+            stderr (bytes): The stderr of the command.
+            truncated (bool): Whether a part of the stdout was dropped.
+        """
+        self.cmd = cmd
+        self.node = node
+        self.error_code = error_code
+        self.stdout = stdout
+        self.stderr = stderr
+        self.truncated = truncated
+        self._msg = None
+        self._extra = None
+
+    @property
+    def is_xml(self) -> bool:
+        """
+        Whether the msg is the decoded XML output of a gluster command.
+        """
+        return (self.error_code == 0 and not self.truncated
+                and self.cmd.find("--xml") != -1)
+
+    @property
+    def lines(self) -> list:
+        """
+        The stdout split into lines, keeping the newlines.
+        """
+        return split_lines(self.stdout.decode("utf-8", "replace"))
+
+    @property
+    def msg(self):
+        """
+        The stdout lines, or the decoded cliOutput for the XML output.
+        """
+        if self._msg is None:
+            if self.is_xml:
+                self._msg = decode_cli_output(self.stdout)
+            else:
+                self._msg = self.lines
+        return self._msg
+
+    @property
+    def error_msg(self) -> str:
+        """
+        The stderr of the command.
+        """
+        return self.stderr.decode("utf-8", "replace")
+
+    def _keys(self) -> list:
+        if self.error_code != 0:
+            keys = ['Flag', 'msg', 'error_msg', 'node', 'cmd', 'error_code']
+        else:
+            keys = ['msg', 'Flag', 'node', 'cmd', 'error_code']
+        if self.truncated:
+            keys.append('truncated')
+        if self._extra:
+            keys.extend(key for key in self._extra if key not in keys)
+        return keys
+
+    def __getitem__(self, key):
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        if key == 'msg':
+            return self.msg
+        if key == 'Flag':
+            return self.error_code == 0
+        if key == 'error_code':
+            return self.error_code
+        if key == 'node':
+            return self.node
+        if key == 'cmd':
+            return self.cmd
+        if key == 'error_msg' and self.error_code != 0:
+            return self.error_msg
+        if key == 'truncated' and self.truncated:
+            return True
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if self._extra is None:
+            self._extra = {}
+        self._extra[key] = value
+
+    def __delitem__(self, key):
+        if self._extra is None or key not in self._extra:
+            raise KeyError(key)
+        del self._extra[key]
+
+    def __contains__(self, key) -> bool:
+        return key in self._keys()
+
+    def __iter__(self):
+        return iter(self._keys())
+
+    def __len__(self) -> int:
+        return len(self._keys())
+
+    def copy(self):
+        """
+        Returns:
+            CommandResult: A fresh record of the same output, which
+                           decodes it again on access.
+        """
+        return CommandResult(self.cmd, self.node, self.error_code,
+                             self.stdout, self.stderr, self.truncated)
+
+    def to_dict(self) -> dict:
+        """
+        Returns:
+            dict: A plain dictionary copy of the result.
+        """
+        return {key: self[key] for key in self._keys()}
+
+    def __repr__(self) -> str:
+        return repr(self.to_dict())
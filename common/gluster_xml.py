@@ -0,0 +1,110 @@
+"""
+Decoder for the XML output of the gluster CLI ( the commands run with
+--xml ). The elements are turned into plain dicts straight from the
+parser's events, without building an element tree, and the result has
+the same shape as the xmltodict one,
+    - attributes are keys prefixed with '@'
+    - an element with only text becomes the text
+    - an element without text, attributes and children becomes None
+    - the text of an element having attributes or children is kept
+      under '#text'
+    - repeated child elements become a list
+    - whitespace around the text is stripped
+"""
+from xml.etree.ElementTree import XMLParser
+
+
+class _DictBuilder:
+    """
+    Parser target building the dicts from the element events.
+    """
+
+    def __init__(self):
+        # Every open element is [tag, item, text chunks].
+        self._stack = [[None, {}, []]]
+
+    def start(self, tag, attrib):
+        if attrib:
+            item = {f"@{key}": value for (key, value) in attrib.items()}
+        else:
+            item = {}
+        self._stack.append([tag, item, []])
+
+    def data(self, data):
+        self._stack[-1][2].append(data)
+
+    def end(self, tag):
+        _, item, texts = self._stack.pop()
+        if not texts:
+            text = ""
+        elif len(texts) == 1:
+            text = texts[0].strip()
+        else:
+            text = "".join(texts).strip()
+        if text:
+            if item:
+                item['#text'] = text
+            else:
+                item = text
+        elif not item:
+            item = None
+        parent = self._stack[-1][1]
+        if tag not in parent:
+            parent[tag] = item
+        elif isinstance(parent[tag], list):
+            parent[tag].append(item)
+        else:
+            parent[tag] = [parent[tag], item]
+
+    def close(self) -> dict:
+        return self._stack[0][1]
+
+
+class CliXmlDecoder:
+    """
+    Incremental decoder, the document can be fed in chunks as it is
+    received and the decoded dict is obtained with close().
+    """
+
+    def __init__(self):
+        self._parser = XMLParser(target=_DictBuilder())
+
+    def feed(self, data):
+        """
+        Feed the next chunk of the document.
+        Args:
+            data (str|bytes)
+        """
+        self._parser.feed(data)
+
+    def close(self) -> dict:
+        """
+        Finish the decoding.
+        Returns:
+            dict: {root tag: decoded root element}
+        """
+        return self._parser.close()
+
+
+def decode_cli_xml(data) -> dict:
+    """
+    Decode a complete XML document.
+    Args:
+        data (str|bytes)
+    Returns:
+        dict: {root tag: decoded root element}
+    """
+    decoder = CliXmlDecoder()
+    decoder.feed(data)
+    return decoder.close()
+
+
+def decode_cli_output(data) -> dict:
+    """
+    Decode the XML output of a gluster command.
+    Args:
+        data (str|bytes)
+    Returns:
+        dict: The decoded cliOutput element.
+    """
+    return decode_cli_xml(data)['cliOutput']
@@ -2,6 +2,7 @@
     Module Name:
     Purpose: Refer to the redhat_mixin.md for more information
 """
+import os
 
 from .rexe import Rexe
 from .relog import Logger
@@ -37,7 +38,58 @@ class RedantMixin(GlusterdOps, VolumeOps, BrickOps, PeerOps,
     level data structure for volume and cleanup.
     """
 
+    # The ops object of the process, which the tests run one after the
+    # other by a long lived worker take in turn, and its pid.
+    _worker_obj = None
+    _worker_pid = None
+
     def __init__(self, server_config, client_config, es, res):
         super().__init__(server_config, client_config)
         self.es = es
         self.TEST_RES = res
+        # The attributes of a fresh object, the others being left by a
+        # test.
+        self._base_attrs = frozenset(vars(self)) | {'_base_attrs'}
+
+    @classmethod
+    def for_test(cls, server_config, client_config, es, res):
+        """
+        The ops object for a test. It is built once per process and
+        reset for every test, as a worker runs its tests one at a time.
+        Args:
+            server_config (dict): Server details of the config.
+            client_config (dict): Client details of the config.
+            es: The FrameworkEnv of the test.
+            res (list): The TEST_RES of the test.
+        Returns:
+            RedantMixin object
+        """
+        redant = cls._worker_obj
+        if (redant is None or cls._worker_pid != os.getpid()
+           or redant.server_dict != server_config
+           or redant.client_dict != client_config):
+            redant = cls(server_config, client_config, es, res)
+            cls._worker_obj = redant
+            cls._worker_pid = os.getpid()
+        else:
+            redant.reset(es, res)
+        return redant
+
+    def reset(self, es, res):
+        """
+        Drop the state left by the earlier test, so that the object is
+        as fresh as a new one : the leases of the connections it didn't
+        release are released, the attributes it set are removed, which
+        takes the query cache, its ttl and the logger, and the rest is
+        built anew. The logger is rebound by init_logger and the
+        connections by establish_connection. The class level settings,
+        like the execution mode of Rexe, are the process's and are kept.
+        Args:
+            es: The FrameworkEnv of the test.
+            res (list): The TEST_RES of the test.
+        """
+        if getattr(self, 'node_dict', None):
+            self.deconstruct_connection()
+        for attr in set(vars(self)) - self._base_attrs:
+            delattr(self, attr)
+        self.__init__(self.server_dict, self.client_dict, es, res)
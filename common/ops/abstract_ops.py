@@ -5,7 +5,92 @@ call the functions in the AbstractOps which in turn
 call the funtions in the remote executioner which is
 responsible for executing commands on the nodes.
 """
-from collections import OrderedDict
+import re
+import time
+import threading
+from common.poller import poll
+
+
+class QueryCache:
+    """
+    Short lived cache of the results of the read only gluster queries,
+    keyed by the node and the normalised command. Every command run by
+    the owning Rexe object is observed and the cache is cleared as soon
+    as a command touching gluster which isn't known to be read only is
+    seen.
+    """
+
+    # Read only queries whose results only change through a mutating
+    # command. The runtime state ( volume status, heal info, the peer
+    # states of pool list, ... ) isn't cached as it changes by itself.
+    cacheable = re.compile(r"^gluster (--xml )?(volume (info|list|get)\b"
+                           r"|--version$)")
+    # Gluster commands which only read the state, hence leave the cache
+    # as it is. Any other command touching gluster clears it.
+    read_only = re.compile(r"^gluster (--xml )?(volume (info|list|get|status)"
+                           r"\b|volume heal \S+ info\b|pool list\b"
+                           r"|peer status\b|--version$)")
+
+    def __init__(self, ttl: float):
+        """
+        Args:
+            ttl (float): Seconds for which a cached result stays valid.
+        """
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalise(cmd: str) -> str:
+        return " ".join(cmd.split())
+
+    def is_cacheable(self, cmd: str) -> bool:
+        return self.cacheable.match(self.normalise(cmd)) is not None
+
+    def is_mutating(self, cmd: str) -> bool:
+        if cmd.strip() == "reboot":
+            return True
+        if "gluster" not in cmd:
+            return False
+        # A compound command might mutate after a read only query.
+        return (cmd.count("gluster") > 1
+                or self.read_only.match(self.normalise(cmd)) is None)
+
+    def get(self, node: str, cmd: str):
+        """
+        Returns:
+            A fresh copy of the cached result, or None.
+        """
+        key = (node, self.normalise(cmd))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.time():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self.hits += 1
+        return entry[1].copy()
+
+    def put(self, node: str, cmd: str, ret):
+        with self._lock:
+            self._entries[(node, self.normalise(cmd))] = (
+                time.time() + self.ttl, ret.copy())
+
+    def observe(self, cmd: str):
+        """
+        Clear the cache if the command might change the cached state.
+        """
+        if self.is_mutating(cmd):
+            self.invalidate()
+
+    def invalidate(self):
+        with self._lock:
+            if self._entries:
+                self.invalidations += 1
+            self._entries = {}
 
 
 class AbstractOps:
@@ -15,8 +100,60 @@ class AbstractOps:
     commands on the nodes
     """
 
+    query_cache_ttl = 3
+
+    def enable_query_cache(self, ttl: float = None):
+        """
+        Opt in to caching the results of the read only gluster queries
+        ( volume info, volume list, volume get and the gluster version )
+        run through execute_abstract_op_node. A cached result is served
+        for ttl seconds, unless a mutating command is run in the meantime,
+        which clears the cache.
+        Kwargs:
+            ttl (float): Validity of a cached result in seconds. Defaults
+                         to query_cache_ttl.
+        """
+        if ttl is None:
+            ttl = self.query_cache_ttl
+        self.query_cache = QueryCache(ttl)
+
+    def disable_query_cache(self):
+        """
+        Stop caching the query results and drop the cache.
+        """
+        cache = getattr(self, 'query_cache', None)
+        if cache is not None:
+            self.logger.debug(f"Query cache hits: {cache.hits}, misses: "
+                              f"{cache.misses}, invalidations: "
+                              f"{cache.invalidations}")
+        self.query_cache = None
+
+    def wait_until(self, predicate, timeout: float, name: str = "wait",
+                   **kwargs):
+        """
+        Wait till the condition is met, through the shared polling engine,
+        and log the metrics of the wait.
+        Args:
+            predicate (callable): The condition, met when it returns a
+                                  truthy value.
+            timeout (float): Seconds after which the wait gives up.
+            name (str): Name of the wait for the log.
+        Kwargs:
+            fast_interval, fast_phase, max_interval, backoff and jitter of
+            common.poller.poll
+        Returns:
+            PollStats: Truthy if the condition was met, with the number of
+                       attempts, the time waited and the last value of the
+                       condition.
+        """
+        stats = poll(predicate, timeout, **kwargs)
+        outcome = "met" if stats else "timed out"
+        self.logger.debug(f"{name} {outcome} after {stats.attempts} "
+                          f"attempts in {stats.waited:.2f}s")
+        return stats
+
     def execute_abstract_op_node(self, cmd: str, node: str = None,
-                                 excep: bool = True):
+                                 excep: bool = True, **kwargs):
         """
         Calls the function in the remote executioner to execute
         commands on the nodes. Logging is also performed along
@@ -31,11 +168,24 @@ class AbstractOps:
                           cmd fails. If set to False the exception is
                           bypassed and value from remote executioner is
                           returned. Defaults to True
+            The rest of the kwargs ( line_callback, max_output ) are
+            passed on to the remote executioner.
+        If the query cache is enabled, the read only gluster queries are
+        served from it while their cached result is valid.
 
         """
+        cache = getattr(self, 'query_cache', None)
+        if cache is not None and not kwargs and cache.is_cacheable(cmd):
+            ret = cache.get(node, cmd)
+            if ret is not None:
+                self.logger.info(f"Cached result of {cmd} on {node}")
+                return ret
+        else:
+            cache = None
+
         self.logger.info(f"Running {cmd} on {node}")
 
-        ret = self.execute_command(cmd, node)
+        ret = self.execute_command(cmd, node, **kwargs)
 
         if not excep:
             return ret
@@ -43,11 +193,13 @@ class AbstractOps:
         if ret['error_code'] != 0:
             self.logger.error(ret['error_msg'])
             raise Exception(ret['error_msg'])
-        elif isinstance(ret['msg'], (OrderedDict, dict)):
+        elif ret.is_xml:
             if int(ret['msg']['opRet']) != 0:
                 self.logger.error(ret['msg']['opErrstr'])
                 raise Exception(ret['msg']['opErrstr'])
 
+        if cache is not None:
+            cache.put(node, cmd, ret)
         return ret
 
     def execute_abstract_op_multinode(self, cmd: str,
@@ -79,9 +231,48 @@ class AbstractOps:
             if each_ret['error_code'] != 0:
                 self.logger.error(each_ret['error_msg'])
                 raise Exception(each_ret['error_msg'])
-            elif isinstance(each_ret['msg'], (OrderedDict, dict)):
+            elif each_ret.is_xml:
                 if int(each_ret['msg']['opRet']) != 0:
                     self.logger.error(each_ret['msg']['opErrstr'])
                     raise Exception(each_ret['msg']['opErrstr'])
 
         return ret
+
+    def execute_abstract_op_pernode(self, cmd_dict: dict,
+                                    excep: bool = True, timer=None,
+                                    phase: str = None) -> dict:
+        """
+        Calls the function in the remote executioner to execute a
+        command of its own on each of the nodes concurrently. The steps
+        of a node are to be merged into its command, to spend a single
+        round trip on each node.
+        Args:
+            cmd_dict (dict): Node to the command to be run on it.
+            excep (bool): exception flag to bypass the exception if a
+                          cmd fails. If set to False the exception is
+                          bypassed and value from remote executioner is
+                          returned. Defaults to True
+            timer (PhaseTimer): Optional timer recording the run on each
+                                node as a phase of the node.
+            phase (str): Name of the phase.
+        Returns:
+            dict of node to the result dictionary.
+        """
+        for (node, cmd) in cmd_dict.items():
+            self.logger.info(f"Running {cmd} on {node}")
+
+        errors = {}
+        ret = self.execute_command_pernode(cmd_dict, timer, phase, errors)
+
+        if not excep:
+            return ret
+
+        for node in cmd_dict:
+            if node not in ret:
+                err = errors.get(node)
+                raise Exception(f"Command on {node} raised : {err}") from err
+            if ret[node]['error_code'] != 0:
+                self.logger.error(ret[node]['error_msg'])
+                raise Exception(ret[node]['error_msg'])
+
+        return ret
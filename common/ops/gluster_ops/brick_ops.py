@@ -3,7 +3,6 @@ Brick ops module deals with the functions related to brick related operations.
 """
 # pylint: disable=too-many-lines
 
-from time import sleep
 import random
 import re
 from common.ops.abstract_ops import AbstractOps
@@ -192,28 +191,28 @@ class BrickOps(AbstractOps):
         if not isinstance(bricks_list, list):
             bricks_list = [bricks_list]
 
-        count = 0
-        while count < timeout:
+        def remove_brick_ended():
             status_info = self.get_remove_brick_status(node, volname,
                                                        bricks_list)
             if status_info is None:
-                return False
+                return 'unknown'
 
             status = status_info['aggregate']['statusStr']
-            if status == 'completed':
-                self.logger.info("Remove brick is successfully completed in "
-                                 f"{count} sec")
-                return True
-            elif status == 'failed':
-                self.logger.error("Remove brick failed on one or more nodes. "
-                                  "Check remove brick status for more details")
-                return False
-            else:
-                sleep(10)
-                count += 10
-                self.logger.info("Remove brick operation has not completed. "
-                                 f"Wait timeout is {count}")
+            if status in ('completed', 'failed'):
+                return status
+            self.logger.info("Remove brick operation has not completed.")
+            return None
 
+        stats = self.wait_until(remove_brick_ended, timeout,
+                                "wait_for_remove_brick_to_complete",
+                                max_interval=10)
+        if stats.value == 'completed':
+            self.logger.info("Remove brick is successfully completed in "
+                             f"{stats.waited:.0f} sec")
+            return True
+        elif stats.value == 'failed':
+            self.logger.error("Remove brick failed on one or more nodes. "
+                              "Check remove brick status for more details")
         return False
 
     def replace_brick(self, node: str, volname: str,
@@ -1110,16 +1109,19 @@ class BrickOps(AbstractOps):
         for brickd in brick_list:
             if brickd.split(':')[0] not in nd_list:
                 nd_list.append(brickd.split(':')[0])
-        itr = 0
-        while itr < timeout:
+        offline_brick_list = None
+
+        def bricks_offline():
+            nonlocal offline_brick_list
             random_node = random.choice(nd_list)
             offline_brick_list = self.get_offline_bricks_list(volname,
                                                               random_node)
-            if offline_brick_list is not None and\
-                    set(brick_list).issubset(set(offline_brick_list)):
-                return True
-            itr += 5
-            sleep(5)
+            return (offline_brick_list is not None
+                    and set(brick_list).issubset(set(offline_brick_list)))
+
+        if self.wait_until(bricks_offline, timeout,
+                           "wait_for_bricks_to_go_offline"):
+            return True
         self.logger.error(f"Current offline brick list : {offline_brick_list}"
                           " Compared to expected offline brick list :"
                           f" {brick_list}")
@@ -1147,16 +1149,19 @@ class BrickOps(AbstractOps):
         if not isinstance(brick_list, list):
             brick_list = [brick_list]
 
-        itr = 0
-        while itr < timeout:
+        online_brick_list = None
+
+        def bricks_online():
+            nonlocal online_brick_list
             random_node = random.choice(server_list)
             online_brick_list = self.get_online_bricks_list(volname,
                                                             random_node)
-            if online_brick_list is not None and\
-                    set(brick_list).issubset(set(online_brick_list)):
-                return True
-            itr += 5
-            sleep(5)
+            return (online_brick_list is not None
+                    and set(brick_list).issubset(set(online_brick_list)))
+
+        if self.wait_until(bricks_online, timeout,
+                           "wait_for_bricks_to_come_online"):
+            return True
 
         self.logger.error(f"Current online brick list : {online_brick_list}"
                           " Compared to expected online brick list :"
@@ -1587,11 +1592,11 @@ class BrickOps(AbstractOps):
         if not isinstance(bricks_list, list):
             bricks_list = [bricks_list]
 
-        time_counter = 240
+        timeout = 240
         self.logger.debug("The heal monitoring timeout is : "
-                          f" {(time_counter // 60)} minutes")
+                          f" {(timeout // 60)} minutes")
 
-        while time_counter > 0:
+        def xattr_same():
             attr_vals = {}
             for brick in bricks_list:
                 brick_node, brick_path = brick.split(":")
@@ -1600,14 +1605,13 @@ class BrickOps(AbstractOps):
                      f"{brick_path}/{file_path}", attr_name=xattr))
                 if not attr_vals[brick]:
                     self.logger.error("Failed to get extended attributes")
-                    return False
+                    return 'failed'
 
             ec_version_vals = [list(val.values())[0][xattr] for val in
                                list(attr_vals.values())]
-            if len(set(ec_version_vals)) == 1:
-                return True
-            else:
-                sleep(20)
-                time_counter -= 20
+            return len(set(ec_version_vals)) == 1
 
-        return False
+        stats = self.wait_until(xattr_same, timeout,
+                                "validate_xattr_on_all_bricks",
+                                max_interval=20)
+        return stats.value is True
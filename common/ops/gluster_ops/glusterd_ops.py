@@ -3,7 +3,6 @@ This file contains one class - GlusterdOps wich holds
 operations on the glusterd service on the server
 or the client.
 """
-from time import sleep
 import configparser
 from common.ops.abstract_ops import AbstractOps
 
@@ -255,14 +254,9 @@ class GlusterdOps(AbstractOps):
         Returns:
             bool: True if glusterd started on the node or else False.
         """
-        count = 0
-        while count <= timeout:
-            ret = self.is_glusterd_running(node)
-            if ret == 1:
-                return True
-            sleep(1)
-            count += 1
-        return False
+        return bool(self.wait_until(
+            lambda: self.is_glusterd_running(node) == 1, timeout,
+            "wait_for_glusterd_to_start", max_interval=2))
 
     def kill_glusterd_ungraceful(self, node: str):
         """
@@ -294,16 +288,15 @@ class GlusterdOps(AbstractOps):
         Returns:
             bool: True if glusterd stopped on the node or else False.
         """
-        count = 0
-        while count <= timeout:
+        def glusterd_stopped():
             ret = self.is_glusterd_running(node)
-            if ret == 0:
-                return True
-            elif ret == -1:
+            if ret == -1:
                 self.kill_glusterd_ungraceful(node)
-            sleep(1)
-            count += 1
-        return False
+            return ret == 0
+
+        return bool(self.wait_until(glusterd_stopped, timeout,
+                                    "wait_for_glusterd_to_stop",
+                                    max_interval=2))
 
     # TODO: Handle command execution in such a manner that this doesn't
     # go under xml version.
@@ -2,8 +2,6 @@
 Heal ops module deals with the functions related to heal related operations.
 """
 
-from time import sleep
-
 
 class HealOps:
     """
@@ -53,18 +51,10 @@ class HealOps:
                              "to be online")
             return True
 
-        counter = 0
-        flag = 0
-        while counter < timeout:
-            status = self.are_all_self_heal_daemons_online(volname, node)
-            if status:
-                flag = 1
-                break
-            if not status:
-                sleep(10)
-                counter = counter + 10
-
-        if not flag:
+        if not self.wait_until(
+                lambda: self.are_all_self_heal_daemons_online(volname, node),
+                timeout, "wait_for_self_heal_daemons_to_be_online",
+                max_interval=10):
             self.logger.error(f"All self-heal-daemons of the volume {volname}"
                               f" are not online even after {timeout//60}"
                               " minutes")
@@ -263,9 +253,7 @@ class HealOps:
 
             return False
 
-        while time_counter > 0:
-            heal_complete = True
-
+        def indices_empty():
             for brick in bricks_list:
                 brick_node, brick_path = brick.split(":")
                 cmd = (f"ls -1 {brick_path}/.glusterfs/indices/xattrop/ | "
@@ -273,12 +261,12 @@ class HealOps:
                 ret = self.execute_abstract_op_node(cmd, brick_node, False)
                 out = int((ret['msg'][0]).rstrip("\n"))
                 if out != 0:
-                    heal_complete = False
-                    break
-            if heal_complete:
-                break
-            sleep(interval_check)
-            time_counter = time_counter - interval_check
+                    return False
+            return True
+
+        heal_complete = bool(self.wait_until(indices_empty, time_counter,
+                                             "monitor_heal_completion",
+                                             max_interval=interval_check))
 
         if heal_complete and bricks:
             # In EC volumes, check heal completion only on online bricks
@@ -423,21 +411,18 @@ class HealOps:
             bool : True if glustershd releases its parent.
                    False Otherwise
         """
-        counter = 0
-
         if not isinstance(nodes, list):
             nodes = [nodes]
 
-        while counter < timeout:
+        def shd_daemonized():
             ret, _ = self.get_self_heal_daemon_pid(nodes)
+            if not ret:
+                self.logger.info("Retrying to get self-heal daemon"
+                                 " process.....")
+            return ret
 
-            if ret:
-                break
-
-            self.logger.info("Retry after 3 sec to get"
-                             " self-heal daemon process.....")
-            sleep(3)
-            counter = counter + 3
+        ret = bool(self.wait_until(shd_daemonized, timeout,
+                                   "is_shd_daemonized", max_interval=3))
 
         if not ret:
             self.logger.error("Either No self heal daemon process found "
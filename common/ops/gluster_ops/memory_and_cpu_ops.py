@@ -222,31 +222,32 @@ class MemoryAndCpuOps(AbstractOps):
         Returns:
          dataframe: Pandas dataframe if CSV file exits else None
         """
-        # Read the csv file generated by memory_and_cpu_logger.py
-        ret = self.execute_abstract_op_node(f"cat /root/{proc_name}.csv", node)
-        if ret['error_code'] != 0:
-            self.logger.error("Cannot read the csv file")
-            return None
-
-        raw_data = ret['msg']
-        # Split the complete dump to individual lines
-        data = []
-        for i in raw_data:
-            data.append(i.split("\r\n")[0])
+        # Read the csv file generated by memory_and_cpu_logger.py. The
+        # lines are parsed as they arrive, so the dump isn't kept.
         rows, flag = [], False
-        for line in data:
-            values = line.split(',')
+
+        def parse_line(line):
+            nonlocal rows, flag
+            values = line.split("\r")[0].split(',')
             if test_name == values[0]:
                 # Reset rows if it's the second instance
                 if flag:
                     rows = []
                 flag = True
-                continue
+                return
 
             # Pick and append values which have complete entry
             if flag and len(values) == 4:
                 rows.append(values)
 
+        ret = self.execute_abstract_op_node(f"cat /root/{proc_name}.csv",
+                                            node,
+                                            line_callback=parse_line,
+                                            max_output=0)
+        if ret['error_code'] != 0:
+            self.logger.error("Cannot read the csv file")
+            return None
+
         # Create a panda dataframe and set the type for columns
         dataframe = pd.DataFrame(rows[1:], columns=rows[0])
         conversion_dict = {'Process ID': int,
@@ -5,7 +5,6 @@ from the test case.
 """
 
 import random
-from time import sleep
 import socket
 from common.ops.abstract_ops import AbstractOps
 
@@ -94,8 +93,9 @@ class PeerOps(AbstractOps):
 
         # Validating whether peer is in connected state after peer probe
         if validate:
-            sleep(time_delay)
-            if not self.is_peer_connected(servers, node):
+            if not self.wait_until(
+                    lambda: self.is_peer_connected(servers, node),
+                    time_delay, "peer_probe_servers", max_interval=2):
                 self.logger.error("Validation after peer probe failed.")
                 return False
             else:
@@ -176,7 +176,10 @@ class PeerOps(AbstractOps):
 
         # Validating whether peer detach is successful
         if validate:
-            sleep(time_delay)
+            self.wait_until(
+                lambda: not set(servers).intersection(
+                    self.nodes_from_pool_list(node) or []),
+                time_delay, "peer_detach_servers", max_interval=2)
             nodes_in_pool = self.nodes_from_pool_list(node)
             rc = True
             for server in servers:
@@ -270,12 +273,15 @@ class PeerOps(AbstractOps):
 
         return pool_list
 
-    def create_cluster(self, node_list: list) -> bool:
+    def create_cluster(self, node_list: list, timeout: int = 300) -> bool:
         """
         Creates a cluster out of given set of nodes irrespective
         of their existing cluster configurations.
         Args:
             node_list (list): All nodes which are to be part of the cluster.
+        Optional:
+            timeout (int): Seconds to wait for all the nodes to show up in
+                           the pool list. Defaults to 300.
         Returns:
             bool: Representing whether the cluster created failed
             or passed.
@@ -297,9 +303,13 @@ class PeerOps(AbstractOps):
             if nd == node:
                 continue
             self.peer_probe(nd, node)
-        while len(self.nodes_from_pool_list(node_list[0])) != \
-                desired_cluster_size:
-            sleep(1)
+        if not self.wait_until(
+                lambda: len(self.nodes_from_pool_list(node_list[0])) ==
+                desired_cluster_size, timeout, "create_cluster",
+                max_interval=2):
+            self.logger.error(f"Cluster of {node_list} not formed even "
+                              f"after {timeout} seconds")
+            return False
         return True
 
     def delete_cluster(self, node_list: list):
@@ -389,14 +399,9 @@ class PeerOps(AbstractOps):
         if not isinstance(servers, list):
             servers = [servers]
 
-        count = 0
-        while count <= wait_timeout:
-            ret = self.is_peer_connected(servers, node)
-            if ret:
-                return True
-            sleep(1)
-            count += 1
-        return False
+        return bool(self.wait_until(
+            lambda: self.is_peer_connected(servers, node), wait_timeout,
+            "wait_for_peers_to_connect", max_interval=1))
 
     def validate_peers_are_connected(self, server_list: list,
                                      node: str = None) -> bool:
@@ -451,12 +456,6 @@ class PeerOps(AbstractOps):
         Returns:
             bool: True if everything is perfect. Else False
         """
-        iter_v = 0
-        while iter_v < timeout:
-            ret = self.validate_peers_are_connected(server_list)
-            if ret:
-                return True
-            sleep(1)
-            iter_v += 1
-
-        return False
+        return bool(self.wait_until(
+            lambda: self.validate_peers_are_connected(server_list), timeout,
+            "wait_till_all_peers_connected", max_interval=1))
@@ -3,7 +3,6 @@ This file contains one class - RebalanceOps which
 holds rebalance operation functions which will be called
 from the test case.
 """
-import time
 from common.ops.abstract_ops import AbstractOps
 
 
@@ -125,23 +124,25 @@ class RebalanceOps(AbstractOps):
             True on success, False otherwise
         """
 
-        count = 0
-        while count < timeout:
+        def fix_layout_ended():
             status_info = self.get_rebalance_status(volname, node, False)
-
-            if "error_code" not in status_info:
-                status = status_info['aggregate']['statusStr']
-                if status == 'fix-layout completed':
-                    self.logger.info("Fix-layout is successfully completed")
-                    return True
-                if status == 'fix-layout failed':
-                    self.logger.error("Fix-layout failed on one or more nodes."
-                                      "Check rebalance status for more "
-                                      "details")
-                    return False
-
-            time.sleep(5)
-            count += 5
+            if "error_code" in status_info:
+                return None
+            status = status_info['aggregate']['statusStr']
+            if status in ('fix-layout completed', 'fix-layout failed'):
+                return status
+            return None
+
+        stats = self.wait_until(fix_layout_ended, timeout,
+                                "wait_for_fix_layout_to_complete")
+        if stats.value == 'fix-layout completed':
+            self.logger.info("Fix-layout is successfully completed")
+            return True
+        if stats.value == 'fix-layout failed':
+            self.logger.error("Fix-layout failed on one or more nodes."
+                              "Check rebalance status for more "
+                              "details")
+            return False
         self.logger.error("Fix layout has not completed. Wait timeout.")
         return False
 
@@ -159,22 +160,25 @@ class RebalanceOps(AbstractOps):
             True on success, False otherwise
         """
 
-        count = 0
-        while count < timeout:
+        def rebalance_ended():
             status_info = self.get_rebalance_status(volname, node, False)
-            if "error_code" not in status_info:
-                status = status_info['aggregate']['statusStr']
-                if status == 'completed':
-                    self.logger.info("Rebalance is successfully completed")
-                    return True
-                if status == 'failed':
-                    self.logger.error("Rebalance failed on one or more nodes."
-                                      "Check rebalance status for more "
-                                      "details")
-                    return False
-
-            time.sleep(5)
-            count += 5
+            if "error_code" in status_info:
+                return None
+            status = status_info['aggregate']['statusStr']
+            if status in ('completed', 'failed'):
+                return status
+            return None
+
+        stats = self.wait_until(rebalance_ended, timeout,
+                                "wait_for_rebalance_to_complete")
+        if stats.value == 'completed':
+            self.logger.info("Rebalance is successfully completed")
+            return True
+        if stats.value == 'failed':
+            self.logger.error("Rebalance failed on one or more nodes."
+                              "Check rebalance status for more "
+                              "details")
+            return False
         self.logger.error("Rebalance operation has not completed."
                           "Wait timeout.")
         return False
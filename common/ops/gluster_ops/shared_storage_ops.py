@@ -3,7 +3,6 @@ Shared storage ops module deals with the functions related to shared storage
 operations.
 """
 
-from time import sleep
 from common.ops.abstract_ops import AbstractOps
 
 
@@ -72,10 +71,10 @@ class SharedStorageOps(AbstractOps):
             bool : True if shared storage volume is mounted/unmounted as
                    expected, False otherwise.
         """
-        counter = 0
         path = "/run/gluster/shared_storage"
         ip_node = self.convert_hosts_to_ip(node)[0]
-        while counter < timeout:
+
+        def mount_as_expected():
             ret = self.execute_abstract_op_node("df -h", ip_node, False)
             if is_mounted and path in " ".join(ret['msg']):
                 self.logger.info("Shared storage is mounted")
@@ -83,11 +82,11 @@ class SharedStorageOps(AbstractOps):
             elif not is_mounted and path not in " ".join(ret['msg']):
                 self.logger.info("Shared storage not mounted")
                 return True
+            return False
 
-            sleep(2)
-            counter += 2
-
-        return False
+        return bool(self.wait_until(mount_as_expected, timeout,
+                                    "is_shared_volume_mounted",
+                                    max_interval=2))
 
     def check_gluster_shared_volume(self, node: str,
                                     present: bool = True,
@@ -106,23 +105,23 @@ class SharedStorageOps(AbstractOps):
             bool : True if gluster_shared_storage volume present/absent in
                    volume list as expected, False otherwise.
         """
-        counter = 0
         self.logger.info("Waiting for shared storage to be"
                          " created/deleted")
 
-        while counter < timeout:
+        def volume_as_expected():
             vol_list = self.get_volume_list(node)
             if vol_list is None:
                 self.logger.error("Failed to get vol list")
-                return False
-            if present and "gluster_shared_storage" in vol_list:
-                return True
-            elif (not present
-                  and "gluster_shared_storage" not in vol_list):
-                return True
-            else:
-                sleep(2)
-                counter += 2
+                return 'failed'
+            return present == ("gluster_shared_storage" in vol_list)
+
+        stats = self.wait_until(volume_as_expected, timeout,
+                                "check_gluster_shared_volume",
+                                max_interval=2)
+        if stats.value == 'failed':
+            return False
+        if stats:
+            return True
 
         if present:
             self.logger.info("Shared storage volume is not created")
@@ -5,7 +5,7 @@ from the test case.
 """
 # pylint: disable=too-many-lines
 
-from time import sleep
+import os
 import socket
 from common.ops.abstract_ops import AbstractOps
 
@@ -727,34 +727,32 @@ class VolumeOps(AbstractOps):
                           "status", replica_count, False)
 
         # Wait for rebalance started by remove-brick to complete
-        _rc = False
-        while rebal_timeout > 0:
+        def remove_brick_ended():
             ret = self.remove_brick(node, volname, bricks_list_to_remove,
                                     "status", replica_count, False)
             if ret['msg']['opRet'] != '0':
                 self.logger.error("Failed to get remove-brick status of "
                                   f"bricks {bricks_list_to_remove} on volume"
                                   f"{volname}")
-                return False
+                return 'failed'
 
             status = ""
             if ret['msg']['volRemoveBrick'] is not None:
                 status = ret['msg']['volRemoveBrick']['aggregate']['statusStr']
 
-            if status == "completed":
-                _rc = True
-            elif status == "in progress":
-                rebal_timeout = rebal_timeout - 30
-                sleep(30)
-            else:
+            if status == "in progress":
+                return None
+            if status != "completed":
                 self.logger.error("Invalid status string in remove brick"
                                   " status")
-                return False
-
-            if _rc:
-                break
+                return 'failed'
+            return status
 
-        if not _rc:
+        stats = self.wait_until(remove_brick_ended, rebal_timeout,
+                                "shrink_volume", max_interval=30)
+        if stats.value == 'failed':
+            return False
+        if not stats:
             self.logger.error("Rebalance started by remove-brick is not yet "
                               f"complete on the volume {volname}")
             return False
@@ -982,8 +980,46 @@ class VolumeOps(AbstractOps):
                      else brick_path_info[:-1])
 
         host = socket.gethostbyname(host)
-        volume_list = self.get_volume_list(host)
-        for volume in volume_list:
+        volume = self._find_brick_volume(host, path_info)
+        if volume is None:
+            self.logger.error("Failed to find volume type for brick-path "
+                              f"{brickdir_path}")
+            return None
+
+        ret = self.get_volume_info(host, volume)
+        if not ret:
+            self.logger.error(f"Failed to get volume type for {volume}")
+            return None
+        list_of_replica = ('Replicate', 'Distributed-Replicate')
+        if (ret[volume]['typeStr'] in list_of_replica
+           and int(ret[volume]['arbiterCount']) == 1):
+            if int(ret[volume]['distCount']) >= 2:
+                return 'Distributed-Arbiter'
+            else:
+                return 'Arbiter'
+        return ret[volume]['typeStr']
+
+    def _find_brick_volume(self, host: str, path_info: str) -> str:
+        """
+        Find the volume having a brick which holds the given path. The
+        bricks of the volumes created by the framework are looked up in
+        the environment, the other volumes of the cluster are scanned.
+
+        Args:
+            host (str): The node of the brick.
+            path_info (str): Path of the brick or of a dir under it.
+
+        Returns:
+            str: Name of the volume, or None if not found.
+        """
+        brick_path = path_info
+        while brick_path not in ("", "/"):
+            volume = self.es.get_brick_volume(f"{host}:{brick_path}")
+            if volume is not None:
+                return volume
+            brick_path = os.path.dirname(brick_path)
+
+        for volume in self.get_volume_list(host):
             brick_list = self.get_all_bricks(volume, host)
             if brick_list is None:
                 self.logger.error("Failed to get the brick list for volume")
@@ -992,23 +1028,7 @@ class VolumeOps(AbstractOps):
             for brick in brick_list:
                 brick_path = brick.split(':')[1]
                 if brick_path in path_info:
-                    ret = self.get_volume_info(host, volume)
-                    if not ret:
-                        self.logger.error("Failed to get volume type for "
-                                          f"{volume}")
-                        return None
-                    list_of_replica = ('Replicate', 'Distributed-Replicate')
-                    if (ret[volume]['typeStr'] in list_of_replica
-                       and int(ret[volume]['arbiterCount']) == 1):
-                        if int(ret[volume]['distCount']) >= 2:
-                            return 'Distributed-Arbiter'
-                        else:
-                            return 'Arbiter'
-                    else:
-                        return ret[volume]['typeStr']
-
-        self.logger.error("Failed to find volume type for brick-path "
-                          f"{brickdir_path}")
+                    return volume
         return None
 
     def get_replica_count(self, node: str, volname: str) -> int:
@@ -1062,13 +1082,9 @@ class VolumeOps(AbstractOps):
         Returns:
             True if offline else False.
         """
-        itr = 0
-        while itr < timeout:
-            if not self.is_volume_started(volname, node):
-                return True
-            itr += 5
-            sleep(5)
-        return False
+        return bool(self.wait_until(
+            lambda: not self.is_volume_started(volname, node), timeout,
+            "wait_for_vol_to_go_offline"))
 
     def wait_for_vol_to_come_online(self, volname: str, node: str,
                                     timeout: int = 120) -> bool:
@@ -1085,13 +1101,9 @@ class VolumeOps(AbstractOps):
         Returns:
             True if online else False.
         """
-        itr = 0
-        while itr < timeout:
-            if self.is_volume_started(volname, node):
-                return True
-            itr += 5
-            sleep(5)
-        return False
+        return bool(self.wait_until(
+            lambda: self.is_volume_started(volname, node), timeout,
+            "wait_for_vol_to_come_online"))
 
     def get_volume_list(self, node: str = None) -> list:
         """
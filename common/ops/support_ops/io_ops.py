@@ -491,8 +491,8 @@ class IoOps(AbstractOps):
         all_mounts_arequal_checksums = []
         _rc = True
         error_msg = ""
-        for i, async_obj in enumerate(all_mounts_async_objs):
-            ret = self.wait_till_async_command_ends(async_obj)
+        rets = self.wait_all(all_mounts_async_objs)
+        for i, ret in enumerate(rets):
             if ret['error_code'] != 0:
                 self.logger.error(f"Collecting arequal-checksum failed on "
                                   f"{mounts[i]['client']}:"
@@ -617,7 +617,8 @@ class IoOps(AbstractOps):
                 f"Stat of mount {mount['client']}:{mount['mountpath']}")
             cmd = (f"python3 /usr/share/redant/script/file_dir_ops.py stat -R"
                    f" {mount['mountpath']}")
-            ret = self.execute_abstract_op_node(cmd, mount['client'], False)
+            ret = self.execute_abstract_op_node(cmd, mount['client'], False,
+                                                max_output=0)
             if ret['error_code'] != 0:
                 _rc = False
 
@@ -693,12 +694,13 @@ class IoOps(AbstractOps):
             self.logger.info(f"Listing files and dirs on {mount['client']}:"
                              f"{mount['mountpath']}")
             cmd = f"find {mount['mountpath']} | grep -ve '{ignore_dirs}'"
-            async_obj = self.execute_command_async(cmd, mount['client'])
+            async_obj = self.execute_command_async(cmd, mount['client'],
+                                                   max_output=0)
             all_mounts_async_objs.append(async_obj)
         _rc = True
         error_msg = ""
-        for i, async_obj in enumerate(all_mounts_async_objs):
-            ret = self.wait_till_async_command_ends(async_obj)
+        rets = self.wait_all(all_mounts_async_objs)
+        for i, ret in enumerate(rets):
             if ret['error_code'] != 0:
                 self.logger.error(f"Failed to list all files and dirs under "
                                   f"{mounts[i]['client']}:"
@@ -775,8 +777,8 @@ class IoOps(AbstractOps):
                                           self.execute_command_async method.
             mounts (list): List of all mountpoints on which process were
                            started.
-            timeout (int) : Time until which the async command status shall
-                            be checked
+            timeout (int) : Time within which all the async commands shall
+                            end
         Returns:
             bool: True if IO is successful on all mounts. False otherwise.
         """
@@ -788,10 +790,11 @@ class IoOps(AbstractOps):
 
         _rc = True
         self.logger.info("Start validating IO procs")
-        for i, async_obj in enumerate(all_mounts_async_objs):
-            self.logger.info(f"Validating IO on {mounts[i]['client']}:"
-                             f"{mounts[i]['mountpath']}")
-            ret = self.wait_till_async_command_ends(async_obj, timeout)
+        for mount in mounts[:len(all_mounts_async_objs)]:
+            self.logger.info(f"Validating IO on {mount['client']}:"
+                             f"{mount['mountpath']}")
+        rets = self.wait_all(all_mounts_async_objs, timeout)
+        for i, ret in enumerate(rets):
             if ret['error_code'] != 0:
                 self.logger.error(f"IO Failed on {mounts[i]['client']}:"
                                   f"{mounts[i]['mountpath']}")
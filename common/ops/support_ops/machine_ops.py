@@ -3,7 +3,6 @@ Machine ops is the swiss army knife of operational functions required
 to perform server related configuration changes, be it network stack,
 systemd changes or maybe a node reboot itself.
 """
-import time
 import os
 import socket
 from common.ops.abstract_ops import AbstractOps
@@ -15,6 +14,10 @@ class MachineOps(AbstractOps):
     handling the machine specific operations.
     """
 
+    # The line after which the hard terminate command of a server prints
+    # its LV paths.
+    lv_marker = "--redant-lv-paths--"
+
     def reboot_nodes(self, nodes: list):
         """
         To reboot a given set of node(s)
@@ -77,25 +80,17 @@ class MachineOps(AbstractOps):
         Returns:
             bool value: True if node is online or False.
         """
-        node_status = {}
-        iter_v = 0
-        while iter_v < timeout:
+        nodes = node if isinstance(node, list) else [node]
+
+        def nodes_online():
             status = self.check_node_power_status(node)
-            if isinstance(node, list):
-                for n in node:
-                    if status[n]:
-                        self.logger.debug(f"{n} online.")
-                        node_status[n] = True
-                    else:
-                        node_status[n] = False
-                if all(node_status.values()):
-                    return True
-            else:
-                if status[node]:
-                    self.logger.debug(f"{node} online.")
-                    return True
-            time.sleep(1)
-            iter_v += 1
+            for n in nodes:
+                if status[n]:
+                    self.logger.debug(f"{n} online.")
+            return all(status[n] for n in nodes)
+
+        if self.wait_until(nodes_online, timeout, "wait_node_power_up"):
+            return True
 
         self.logger.error(f"{node} still offline.")
         return False
@@ -108,43 +103,38 @@ class MachineOps(AbstractOps):
         Returns:
             bool value: True if node is offline or False.
         """
-        node_status = {}
-        iter_v = 0
-        while iter_v < timeout:
+        nodes = node if isinstance(node, list) else [node]
+
+        def nodes_offline():
             status = self.check_node_power_status(node)
-            if isinstance(node, list):
-                for n in node:
-                    if not status[n]:
-                        self.logger.debug(f"{n} offline.")
-                        node_status[n] = True
-                    else:
-                        node_status[n] = False
-                if all(node_status.values()):
-                    return True
-            else:
-                if not status[node]:
-                    self.logger.debug(f"{node} offline.")
-                    return True
-            time.sleep(1)
-            iter_v += 1
+            for n in nodes:
+                if not status[n]:
+                    self.logger.debug(f"{n} offline.")
+            return not any(status[n] for n in nodes)
+
+        if self.wait_until(nodes_offline, timeout, "wait_node_power_down"):
+            return True
 
         self.logger.error(f"{node} still online.")
         return False
 
     def hard_terminate(self, server_list: list, client_list: list,
-                       brick_root: dict):
+                       brick_root: dict, timer=None):
         """
         hard terminate is inconsiderate. It will clear out the env
         completely and is to be used with caution. Don't use it inside the
         non disruptive tests or else, you might have a string of failures.
+        The clean up steps of a node are run as a single command, on all
+        the nodes at once.
         Args:
             server_list (list): List of gluster server machines
             client_list (list): List of gluster client machines
             brick_root (dict): Dictionary of brick roots and nodes.
+            timer (PhaseTimer): Optional timer recording the clean up of
+                                each node as a phase of the node.
         """
         # Wait for nodes to power up.
-        for server in server_list:
-            self.wait_node_power_up(server)
+        self.wait_node_power_up(server_list)
 
         # Stop glusterd on the servers.
         self.stop_glusterd(server_list)
@@ -154,54 +144,73 @@ class MachineOps(AbstractOps):
             raise Exception("Sheer panic! As hard terminate fails to stop"
                             "glusterd!")
 
-        # Kill glusterfs and glusterfsd processes in the server machines.
-        # TODO. Add other gluster related processes later.
-        cmd = "pkill glusterfs; pkill glusterfsd"
-        for node in server_list:
-            self.execute_abstract_op_node(cmd, node, False)
-
-        # Also need to kill the fuse process in the clients
-        cmd = "pkill glusterfs"
-        for node in client_list:
-            self.execute_abstract_op_node(cmd, node, False)
-
-        # Clear out the content in vol, peer, snaps and glusterfind keys
-        # directory on the servers.
-        cmd = ("rm -rf /var/lib/glusterd/vols/*; rm -rf /var/lib/glusterd"
-               "/peers/*; rm -rf /var/lib/glusterd/snaps/*; "
-               "rm -rf /var/lib/glusterd/glusterfind/.keys/*; "
-               "rm -rf /var/run/gluster*; ")
-        for node in server_list:
-            self.execute_abstract_op_node(cmd, node, False)
-
-        # Clear out the brick dirs under the brick roots.
-        for (server, brick_list) in brick_root.items():
-            for brick in brick_list:
-                cmd = (f"rm -rf {brick}/*")
-                ret = self.execute_abstract_op_node(cmd, server, False)
-                if ret['error_code'] != 0:
-                    cmd = f"umount {brick}"
-                    self.execute_abstract_op_node(cmd, server, False)
-                    cmd = f"mount {brick}"
-                    self.execute_abstract_op_node(cmd, server, False)
-                    cmd = (f"rm -rf {brick}/*")
-                    self.execute_abstract_op_node(cmd, server, False)
-
-        # Clear out the mountpoints in clients.
-        cmd = "umount /mnt/*; rm -rf /mnt/*"
-        for node in client_list:
-            self.execute_abstract_op_node(cmd, node, False)
-
-        # Unmount snap bricks.
-        self.umount_snap_brick_from_servers(server_list)
+        cmd_dict = {}
+        for node in set(server_list + client_list):
+            cmd_dict[node] = self._hard_terminate_cmd(
+                node in server_list, node in client_list,
+                brick_root.get(node, []))
+        rets = self.execute_abstract_op_pernode(cmd_dict, False, timer,
+                                                "terminate.node")
 
         # Check for stray LVs and delete them.
-        lv_dict = self.get_lv_paths_from_servers(server_list)
+        lv_dict = {}
+        for node in server_list:
+            if node not in rets:
+                continue
+            lines = [line.strip() for line in rets[node]['msg']]
+            if self.lv_marker in lines:
+                lines = lines[lines.index(self.lv_marker) + 1:]
+                lv_dict[node] = [line for line in lines if line]
 
         self.remove_snap_lv(lv_dict)
 
         self.es.reset_ds()
 
+    def _hard_terminate_cmd(self, server: bool, client: bool,
+                            bricks: list) -> str:
+        """
+        The clean up steps of a node for the hard terminate, merged into
+        one command. The LV paths of a server are printed at the end,
+        after the lv_marker line.
+        Args:
+            server (bool): Whether the node is a gluster server.
+            client (bool): Whether the node is a gluster client.
+            bricks (list): The brick roots of the node.
+        Returns:
+            str: The command.
+        """
+        steps = []
+        if server:
+            # Kill glusterfs and glusterfsd processes in the server
+            # machines.
+            # TODO. Add other gluster related processes later.
+            steps.append("pkill glusterfs; pkill glusterfsd")
+
+            # Clear out the content in vol, peer, snaps and glusterfind
+            # keys directory on the servers.
+            steps.append("rm -rf /var/lib/glusterd/vols/*; rm -rf "
+                         "/var/lib/glusterd/peers/*; rm -rf "
+                         "/var/lib/glusterd/snaps/*; rm -rf "
+                         "/var/lib/glusterd/glusterfind/.keys/*; "
+                         "rm -rf /var/run/gluster*")
+
+            # Clear out the brick dirs under the brick roots, remounting
+            # the brick root if that fails.
+            for brick in bricks:
+                steps.append(f"rm -rf {brick}/* || {{ umount {brick}; "
+                             f"mount {brick}; rm -rf {brick}/*; }}")
+        if client:
+            # Also need to kill the fuse process in the clients and clear
+            # out the mountpoints.
+            steps.append("pkill glusterfs; umount /mnt/*; rm -rf /mnt/*")
+        if server:
+            # Unmount snap bricks and list the LVs.
+            steps.append("for mnt in `mount | grep 'run/gluster/snaps' |"
+                         "awk '{print $3}'`;do umount $mnt; done")
+            steps.append(f"echo {self.lv_marker}; lvs --noheadings -o "
+                         "lv_path | awk '{if ($1) print $1}'")
+        return "; ".join(steps)
+
     def check_os(self, os_name: str, nodes: str,
                  os_version: str = None) -> bool:
         """
@@ -362,10 +371,13 @@ class MachineOps(AbstractOps):
             lv_dict (dict): It is a dictionary wherein the key is the node
             and the value being the list of LVs corresponding to that node.
         """
+        cmd_dict = {}
         for node in lv_dict:
-            for lv_path in lv_dict[node]:
-                cmd = (f"lvremove {lv_path} --force")
-                self.execute_abstract_op_node(cmd, node)
+            if lv_dict[node]:
+                cmd_dict[node] = (f"lvremove {' '.join(lv_dict[node])}"
+                                  " --force")
+        if cmd_dict:
+            self.execute_abstract_op_pernode(cmd_dict)
 
     def remove_snap_lv(self, lv_dict: dict):
         """
@@ -486,6 +498,6 @@ class MachineOps(AbstractOps):
         total_nodes = server_list + client_list
         self.logger.debug("Clearing old glusterfs logs on the nodes: "
                           f"{total_nodes}")
-        for node in total_nodes:
-            cmd = "rm -rf /var/log/glusterfs/*"
-            self.execute_abstract_op_node(cmd, node, False)
+        cmd = "rm -rf /var/log/glusterfs/*"
+        self.execute_abstract_op_multinode(cmd, list(set(total_nodes)),
+                                           False)
@@ -0,0 +1,103 @@
+"""
+The phase timer records where the time of a test goes, as a timeline of
+named phases, each with its duration and the count and output size of
+the remote commands run during it. The phases of the set up and the
+tear down done by the framework are named with a prefix, as in
+'setup.volume' or 'terminate.cleanup', while the run of the test itself
+is the 'body'. The work done on the nodes concurrently, as in the set up
+of the environment, is recorded as phases of the node it ran on.
+"""
+import time
+from contextlib import contextmanager
+
+
+class PhaseTimer:
+    """
+    Timeline of the phases of a test.
+    """
+
+    def __init__(self):
+        self.origin = time.time()
+        self.phases = []
+        self.rexe = None
+
+    def watch(self, rexe):
+        """
+        Take the command counts of the phases from a Rexe object.
+        Args:
+            rexe (Rexe): The object running the commands of the test.
+        """
+        self.rexe = rexe
+
+    def _counters(self) -> tuple:
+        if self.rexe is None:
+            return (0, 0)
+        stats = self.rexe.command_stats
+        return (stats['commands'], stats['bytes'])
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        Time the block as a phase, which is recorded even if the block
+        raises.
+        Args:
+            name (str): Name of the phase.
+        """
+        start = time.time()
+        (commands, out_bytes) = self._counters()
+        try:
+            yield
+        finally:
+            (end_commands, end_bytes) = self._counters()
+            self.add(name, start, commands=end_commands - commands,
+                     out_bytes=end_bytes - out_bytes)
+
+    def add(self, name: str, start: float, node: str = None,
+            commands: int = 0, out_bytes: int = 0):
+        """
+        Record a phase which started at the given time and ended now.
+        Args:
+            name (str): Name of the phase.
+            start (float): The time.time() at the start of the phase.
+            node (str): The node the phase ran on, if it is of a node.
+            commands (int): Remote commands run during the phase.
+            out_bytes (int): Bytes of output received during the phase.
+        """
+        entry = {
+            'phase': name,
+            'offset': round(start - self.origin, 3),
+            'duration': round(time.time() - start, 3),
+            'commands': commands,
+            'bytes': out_bytes
+        }
+        if node is not None:
+            entry['node'] = node
+        self.phases.append(entry)
+
+    def merge(self, other):
+        """
+        Add the phases of another timer, with their offsets taken from
+        the start of this one.
+        Args:
+            other (PhaseTimer)
+        """
+        shift = other.origin - self.origin
+        for phase in other.phases:
+            phase = dict(phase)
+            phase['offset'] = round(phase['offset'] + shift, 3)
+            self.phases.append(phase)
+
+    def timeline(self) -> list:
+        """
+        Returns:
+            list: The phases in the order they ended, each a dict,
+                  {
+                    'phase': name,
+                    'offset': seconds from the start of the timer,
+                    'duration': seconds taken,
+                    'commands': remote commands run,
+                    'bytes': bytes of output received,
+                    'node': the node, only for the phases of a node
+                  }
+        """
+        return list(self.phases)
@@ -0,0 +1,78 @@
+"""
+Polling engine shared by the wait helpers of the ops. A condition is
+checked at a fast rate for a short while, so a condition which becomes
+true quickly is noticed at once, and the interval then grows
+exponentially, with some jitter, up to a maximum, so a long wait doesn't
+keep hammering the nodes. The wait always ends by the deadline.
+"""
+import time
+import random
+
+
+class PollStats:
+    """
+    Outcome of a poll. It is truthy if the condition was met, hence it
+    can be used in place of the boolean returned by the wait helpers.
+    """
+
+    __slots__ = ('satisfied', 'attempts', 'waited', 'value')
+
+    def __init__(self, satisfied: bool, attempts: int, waited: float,
+                 value):
+        """
+        Args:
+            satisfied (bool): Whether the condition was met in time.
+            attempts (int): Number of times the condition was checked.
+            waited (float): Seconds spent in the poll.
+            value: The last value returned by the condition.
+        """
+        self.satisfied = satisfied
+        self.attempts = attempts
+        self.waited = waited
+        self.value = value
+
+    def __bool__(self) -> bool:
+        return self.satisfied
+
+    def __repr__(self) -> str:
+        return (f"PollStats(satisfied={self.satisfied}, "
+                f"attempts={self.attempts}, waited={self.waited:.2f})")
+
+
+def poll(predicate, timeout: float, fast_interval: float = 0.1,
+         fast_phase: float = 1, max_interval: float = 5,
+         backoff: float = 1.5, jitter: float = 0.1) -> PollStats:
+    """
+    Check the condition till it is met or the timeout elapses. The
+    condition is checked once more at the deadline.
+    Args:
+        predicate (callable): The condition, met when it returns a truthy
+                              value.
+        timeout (float): Seconds after which the poll gives up.
+    Kwargs:
+        fast_interval (float): Interval during the fast phase.
+        fast_phase (float): Seconds for which the fast interval is kept.
+        max_interval (float): The interval doesn't grow beyond this.
+        backoff (float): Factor by which the interval grows per attempt
+                         after the fast phase.
+        jitter (float): Fraction by which an interval is randomly varied,
+                        so that the waits started together spread out.
+    Returns:
+        PollStats
+    """
+    start = time.monotonic()
+    deadline = start + timeout
+    interval = fast_interval
+    attempts = 0
+    while True:
+        attempts += 1
+        value = predicate()
+        now = time.monotonic()
+        if value:
+            return PollStats(True, attempts, now - start, value)
+        if now >= deadline:
+            return PollStats(False, attempts, now - start, value)
+        if now - start >= fast_phase:
+            interval = min(interval * backoff, max_interval)
+        delay = interval * random.uniform(1 - jitter, 1 + jitter)
+        time.sleep(max(min(delay, deadline - now), 0))
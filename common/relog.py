@@ -43,10 +43,21 @@ class Logger(logging.Logger):
         test_log_dir = self.get_test_log_dir(log_file_path)
         if not os.path.isdir(test_log_dir):
             os.makedirs(test_log_dir)
+        # A logger of the same name left by an earlier test in the
+        # process shouldn't write to the log of this one.
+        self.close_logger()
         log_file_handler = logging.handlers.WatchedFileHandler(log_file_path)
         log_file_handler.setFormatter(log_format)
         self.logger.addHandler(log_file_handler)
 
+    def close_logger(self):
+        """
+        Detach and close the file handlers of the logger.
+        """
+        for handler in list(self.logger.handlers):
+            self.logger.removeHandler(handler)
+            handler.close()
+
     @classmethod
     def log_dir_creation(cls, parent_path: str, test_path_list: list):
         """
@@ -1,20 +1,724 @@
 import os
 import time
+import base64
 import random
+import functools
+import asyncio
+import threading
 import concurrent.futures
-import json
 import socket
+import tempfile
 import paramiko
-import xmltodict
 from multipledispatch import dispatch
+from .command_result import CommandResult
+
+
+# Source of the agent run on a node in the multiplexed execution mode. It
+# reads framed requests "<id> <len>\n<cmd>" from stdin, runs each one in a
+# thread and writes framed results "<id> <rc> <outlen> <errlen>\n<out><err>"
+# to stdout.
+_MUX_AGENT_SRC = """
+import sys, threading, subprocess
+inp, out = sys.stdin.buffer, sys.stdout.buffer
+lock = threading.Lock()
+
+def run(rid, cmd):
+    try:
+        proc = subprocess.Popen(cmd, shell=True, executable="/bin/bash",
+                                stdin=subprocess.DEVNULL,
+                                stdout=subprocess.PIPE,
+                                stderr=subprocess.PIPE)
+        sout, serr = proc.communicate()
+        rc = proc.returncode
+    except Exception as exc:
+        sout, serr, rc = b"", str(exc).encode(), -1
+    head = ("%s %d %d %d\\n" % (rid, rc, len(sout), len(serr))).encode()
+    with lock:
+        out.write(head + sout + serr)
+        out.flush()
+
+out.write(b"READY\\n")
+out.flush()
+workers = []
+while True:
+    head = inp.readline()
+    if not head:
+        break
+    rid, size = head.split()
+    cmd = inp.read(int(size)).decode("utf-8", "replace")
+    workers = [worker for worker in workers if worker.is_alive()]
+    worker = threading.Thread(target=run, args=(rid.decode(), cmd))
+    worker.start()
+    workers.append(worker)
+for worker in workers:
+    worker.join()
+"""
+
+
+class MuxSessionError(Exception):
+    """
+    Raised when a multiplexed session can't serve a command. The sent
+    attribute tells if the command had already reached the agent.
+    """
+
+    def __init__(self, msg: str, sent: bool = False):
+        super().__init__(msg)
+        self.sent = sent
+
+
+class OutputBuffer:
+    """
+    Incremental capture of an output stream of a command. The data is kept
+    in memory up to spill_size bytes and spilled to a temporary file after
+    that, so a long running command's output doesn't have to stay in the
+    worker's memory while it is being received. The data past max_size
+    bytes is counted but not kept. An optional callback is handed every
+    complete line, without the newline, as soon as it arrives.
+    """
+
+    spill_size = 8 * 1024 * 1024
+
+    def __init__(self, max_size: int = None, line_callback=None):
+        """
+        Args:
+            max_size (int): Number of bytes to be kept at most. None keeps
+                            everything.
+            line_callback (callable): Called with every line received.
+        """
+        self.max_size = max_size
+        self.line_callback = line_callback
+        self.size = 0
+        self.kept = 0
+        self._data = bytearray()
+        self._file = None
+        self._partial = bytearray()
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def truncated(self) -> bool:
+        """
+        Whether a part of the data was dropped due to the size cap.
+        """
+        return self.kept < self.size
+
+    def extend(self, data: bytes):
+        """
+        Add the received data to the buffer.
+        """
+        self.size += len(data)
+        if self.line_callback is not None:
+            self._feed_lines(data)
+        if self.max_size is not None:
+            data = data[:max(self.max_size - self.kept, 0)]
+        if not data:
+            return
+        self.kept += len(data)
+        if self._file is None:
+            self._data.extend(data)
+            if len(self._data) > self.spill_size:
+                self._file = tempfile.TemporaryFile()
+                self._file.write(self._data)
+                self._data = bytearray()
+        else:
+            self._file.write(data)
+
+    def _feed_lines(self, data: bytes):
+        self._partial.extend(data)
+        start = 0
+        while True:
+            index = self._partial.find(b"\n", start)
+            if index == -1:
+                break
+            self.line_callback(
+                self._partial[start:index].decode("utf-8", "replace"))
+            start = index + 1
+        del self._partial[:start]
+
+    def finish(self):
+        """
+        Hand the last line to the callback if it didn't end with a newline.
+        """
+        if self.line_callback is not None and self._partial:
+            self.line_callback(self._partial.decode("utf-8", "replace"))
+        self._partial = bytearray()
+
+    def getvalue(self) -> bytes:
+        """
+        Returns:
+            bytes: The data kept in the buffer.
+        """
+        if self._file is None:
+            return bytes(self._data)
+        self._file.seek(0)
+        data = self._file.read()
+        self._file.seek(0, os.SEEK_END)
+        return data
+
+    def close(self):
+        """
+        Release the memory or the temporary file of the buffer.
+        """
+        self._data = bytearray()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class RexeLoop:
+    """
+    Holder of the one asyncio event loop per worker process on which all
+    the remote executions are scheduled. The loop runs in a daemon thread,
+    the blocking channel opens are handed to a small executor and the
+    command completions are driven by the channel file descriptors, hence
+    any number of in-flight commands cost only a few threads.
+    """
+
+    _loop = None
+    _thread = None
+    _lock = threading.Lock()
+    _owner_pid = None
+    executor_workers = 8
+
+    @classmethod
+    def _check_owner(cls):
+        """
+        The loop thread doesn't survive a fork, so a forked child starts
+        its own loop. The lock is renewed before use as it might have been
+        held by another thread at the time of the fork.
+        """
+        pid = os.getpid()
+        if cls._owner_pid != pid:
+            cls._lock = threading.Lock()
+            cls._loop = None
+            cls._thread = None
+            cls._owner_pid = pid
+
+    @staticmethod
+    def _run_loop(loop):
+        asyncio.set_event_loop(loop)
+        loop.run_forever()
+
+    @classmethod
+    def get_loop(cls):
+        """
+        Obtain the event loop of the process, starting it if needed.
+        Returns:
+            asyncio event loop
+        """
+        cls._check_owner()
+        with cls._lock:
+            if cls._loop is None:
+                loop = asyncio.new_event_loop()
+                loop.set_default_executor(
+                    concurrent.futures.ThreadPoolExecutor(
+                        max_workers=cls.executor_workers))
+                thread = threading.Thread(target=cls._run_loop,
+                                          args=(loop,), daemon=True,
+                                          name="rexe-loop")
+                thread.start()
+                cls._loop = loop
+                cls._thread = thread
+            return cls._loop
+
+    @classmethod
+    def in_loop_thread(cls) -> bool:
+        """
+        Check whether the caller runs on the loop thread.
+        """
+        return threading.current_thread() is cls._thread
+
+    @classmethod
+    def run(cls, coro, timeout: int = None):
+        """
+        Schedule a coroutine on the loop and block till its result.
+        Args:
+            coro (coroutine)
+            timeout (int): Optional time to wait for the result.
+        Returns:
+            The result of the coroutine.
+        """
+        loop = cls.get_loop()
+        if cls.in_loop_thread():
+            coro.close()
+            raise RuntimeError("Blocking Rexe call from the event loop "
+                               "thread, await the coroutine instead.")
+        return asyncio.run_coroutine_threadsafe(coro, loop).result(timeout)
+
+
+class MuxSession:
+    """
+    A long lived agent on a node which receives framed commands and
+    returns framed results over a single SSH channel, removing the per
+    command channel open round trips. The results are demultiplexed on
+    the Rexe event loop, so commands are pipelined over the same channel.
+    """
+
+    def __init__(self, client, loop, timeout: int = 10):
+        """
+        Start the agent on the node and wait for it to be ready. This
+        blocks and is not to be called from the event loop thread.
+        Args:
+            client (SSHClient): Connected client of the node.
+            loop (asyncio loop): Loop demultiplexing the results.
+            timeout (int): Time to wait for the agent to start.
+        """
+        self._buf = bytearray()
+        self._pending = {}
+        self._next_id = 0
+        self._closed = None
+        self._attached = False
+        self._fd = None
+        self._loop = loop
+        # Held while a frame is being written, so frames don't interleave.
+        self._write_lock = threading.Lock()
+        encoded = base64.b64encode(_MUX_AGENT_SRC.encode()).decode()
+        self._channel = client.get_transport().open_session()
+        self._channel.settimeout(timeout)
+        self._channel.exec_command(
+            "python3 -c \"import base64;exec(base64.b64decode("
+            f"'{encoded}').decode())\"")
+        while b"\n" not in self._buf:
+            data = self._channel.recv(64)
+            if not data:
+                break
+            self._buf.extend(data)
+        if not self._buf.startswith(b"READY\n"):
+            self._channel.close()
+            raise MuxSessionError("Mux agent failed to start")
+        del self._buf[:len(b"READY\n")]
+        self._channel.settimeout(None)
+        loop.call_soon_threadsafe(self._attach)
+
+    def _attach(self):
+        if self._closed is not None:
+            return
+        self._attached = True
+        self._fd = self._channel.fileno()
+        self._loop.add_reader(self._fd, self._on_readable)
+        self._on_readable()
+
+    def _on_readable(self):
+        """
+        Read whatever has arrived and hand over the complete frames.
+        """
+        try:
+            while self._channel.recv_ready():
+                self._buf.extend(self._channel.recv(65536))
+            self._dispatch_frames()
+        except Exception as error:
+            self._fail(f"Mux agent terminated: {error}")
+            return
+        if self._closed is not None or self._channel.eof_received or \
+                self._channel.closed:
+            self._fail(self._closed or "Mux agent channel closed")
+
+    def _dispatch_frames(self):
+        while True:
+            index = self._buf.find(b"\n")
+            if index == -1:
+                return
+            rid, rc, outlen, errlen = (int(val) for val in
+                                       self._buf[:index].split())
+            out_end = index + 1 + outlen
+            end = out_end + errlen
+            if len(self._buf) < end:
+                return
+            result = (rc, bytes(self._buf[index + 1:out_end]),
+                      bytes(self._buf[out_end:end]))
+            del self._buf[:end]
+            future = self._pending.pop(rid, None)
+            if future is not None and not future.done():
+                future.set_result(result)
+
+    def _fail(self, reason: str):
+        if self._closed is None:
+            self._closed = reason
+        if self._attached:
+            self._attached = False
+            self._loop.remove_reader(self._fd)
+        pending = self._pending
+        self._pending = {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(MuxSessionError(reason, sent=True))
+
+    def is_alive(self) -> bool:
+        """
+        Returns:
+            bool: True if the session can take commands.
+        """
+        return self._closed is None and not self._channel.closed
+
+    async def run(self, cmd: str) -> tuple:
+        """
+        Run a command through the agent and wait for its result. To be
+        awaited on the loop the session was created with.
+        Args:
+            cmd (str)
+        Returns:
+            tuple: (exit code, stdout bytes, stderr bytes)
+        Raises:
+            MuxSessionError: If the session is closed or dies before the
+                             result arrives.
+        """
+        if self._closed is not None:
+            raise MuxSessionError(self._closed)
+        future = self._loop.create_future()
+        rid = self._next_id
+        self._next_id += 1
+        self._pending[rid] = future
+        payload = cmd.encode()
+        try:
+            await self._send(f"{rid} {len(payload)}\n".encode() + payload)
+        except Exception as error:
+            self._pending.pop(rid, None)
+            raise MuxSessionError(str(error))
+        return await future
+
+    async def _send(self, frame: bytes):
+        """
+        Write a frame to the agent without blocking the loop. What fits
+        in the send window is written right away, and the rest by a
+        thread of the loop's executor, which waits for the window.
+        """
+        locked = self._write_lock.acquire(blocking=False)
+        if locked:
+            try:
+                while frame and self._channel.send_ready():
+                    frame = frame[self._channel.send(frame):]
+            except Exception:
+                self._write_lock.release()
+                raise
+            if not frame:
+                self._write_lock.release()
+                return
+        await self._loop.run_in_executor(None, self._write, frame, locked)
+
+    def _write(self, frame: bytes, locked: bool):
+        """
+        Blocking write of a frame, run in an executor thread. Releases
+        the write lock, taking it first if the caller didn't.
+        """
+        if not locked:
+            self._write_lock.acquire()
+        try:
+            self._channel.sendall(frame)
+        finally:
+            self._write_lock.release()
+
+    def close(self):
+        """
+        Stop the agent by closing its channel. The channel is detached
+        from the loop first, as closing it closes the watched descriptor.
+        """
+        if self._closed is None:
+            self._closed = "Mux session closed"
+        if self._attached:
+            if RexeLoop.in_loop_thread():
+                self._fail(self._closed)
+            else:
+                detached = threading.Event()
+
+                def detach():
+                    self._fail(self._closed)
+                    detached.set()
+
+                self._loop.call_soon_threadsafe(detach)
+                detached.wait(5)
+        try:
+            self._channel.close()
+        except Exception:
+            pass
+
+
+class ConnectionPool:
+    """
+    Per worker process pool of authenticated SSH clients keyed by host.
+    Every Rexe object leases its clients from here instead of opening a
+    fresh connection, so the handshake cost is paid once per node per
+    process. A paramiko transport multiplexes channels, hence a leased
+    client can be shared by all the Rexe objects of the process.
+    """
+
+    _clients = {}
+    # Count of the leases of every client, and the clients dropped from
+    # the pool which are still leased, with their multiplexed sessions.
+    # Such a client is closed once its last lease is returned.
+    _leases = {}
+    _retired = {}
+    _host_locks = {}
+    _mux_sessions = {}
+    _mux_failures = {}
+    _lock = threading.Lock()
+    _owner_pid = None
+    max_mux_failures = 3
+
+    @classmethod
+    def _check_owner(cls):
+        """
+        Forked children inherit the parent's pool, but the transport
+        threads don't survive a fork. Drop the inherited entries without
+        closing them, as closing would tear down the parent's sessions.
+        The lock is renewed too, it might have been held at the fork.
+        """
+        pid = os.getpid()
+        if cls._owner_pid != pid:
+            cls._clients = {}
+            cls._leases = {}
+            cls._retired = {}
+            cls._host_locks = {}
+            cls._mux_sessions = {}
+            cls._mux_failures = {}
+            cls._lock = threading.Lock()
+            cls._owner_pid = pid
+
+    @classmethod
+    def _host_lock(cls, node: str):
+        """
+        Obtain the lock serialising connection attempts to a node.
+        """
+        cls._check_owner()
+        with cls._lock:
+            if node not in cls._host_locks:
+                cls._host_locks[node] = threading.Lock()
+            return cls._host_locks[node]
+
+    @staticmethod
+    def is_healthy(client) -> bool:
+        """
+        Check if a pooled client still has a usable transport.
+        Args:
+            client (SSHClient)
+        Returns:
+            bool: True if the transport is active and writable.
+        """
+        if client is None:
+            return False
+        transport = client.get_transport()
+        if transport is None or not transport.is_active():
+            return False
+        try:
+            transport.send_ignore()
+        except Exception:
+            return False
+        return True
+
+    @staticmethod
+    def _open(node: str, timeout: int = None):
+        """
+        Open a new authenticated SSH client to the node.
+        """
+        if timeout is None:
+            timeout_opt = {}
+        else:
+            timeout_opt = {'timeout': timeout, 'banner_timeout': timeout,
+                           'auth_timeout': timeout}
+
+        node_ssh_client = paramiko.SSHClient()
+        node_ssh_client.load_host_keys(
+            os.path.expanduser('~/.ssh/known_hosts'))
+        node_ssh_client.connect(hostname=node, username='root',
+                                **timeout_opt)
+        node_ssh_client.get_transport().set_keepalive(30)
+        return node_ssh_client
+
+    @classmethod
+    def lease(cls, node: str, timeout: int = None):
+        """
+        Lease a connected client for the node. A pooled client is
+        health checked before reuse and evicted if it is dead, in which
+        case a new one is opened.
+        Args:
+            node (str)
+            timeout (int): Connection timeout for a fresh connection.
+        Returns:
+            SSHClient
+        """
+        with cls._host_lock(node):
+            client = cls._clients.get(node)
+            if not cls.is_healthy(client):
+                if client is not None:
+                    cls._drop(node)
+                client = cls._open(node, timeout)
+                cls._clients[node] = client
+            with cls._lock:
+                cls._leases[client] = cls._leases.get(client, 0) + 1
+            return client
+
+    @classmethod
+    def release(cls, node: str, client=None):
+        """
+        Return a lease. A pooled client stays in the pool for the next
+        lease, while a client dropped from the pool is closed with its
+        last lease.
+        Args:
+            node (str)
+            client (SSHClient): The leased client. Defaults to the pooled
+                                client of the node.
+        """
+        cls._check_owner()
+        with cls._lock:
+            if client is None:
+                client = cls._clients.get(node)
+            count = cls._leases.get(client, 0)
+            if count > 1:
+                cls._leases[client] = count - 1
+                return
+            cls._leases.pop(client, None)
+            if client not in cls._retired:
+                return
+            session = cls._retired.pop(client)
+        if session is not None:
+            session.close()
+        cls._close(client)
+
+    @classmethod
+    def evict(cls, node: str):
+        """
+        Drop the pooled client of the node, if any, so that the next
+        lease opens a new one. The client is closed right away if it
+        isn't leased, else with its last lease, as the Rexe objects of
+        the process sharing it might have commands running on it.
+        Args:
+            node (str)
+        """
+        with cls._host_lock(node):
+            cls._drop(node)
+
+    @classmethod
+    def _drop(cls, node: str):
+        """
+        Drop the pooled client of the node, with the host lock held.
+        """
+        session = cls._mux_sessions.pop(node, None)
+        client = cls._clients.pop(node, None)
+        if client is not None:
+            with cls._lock:
+                if cls._leases.get(client, 0) > 0:
+                    cls._retired[client] = session
+                    return
+            cls._close(client)
+        if session is not None:
+            session.close()
+
+    @classmethod
+    def cached_mux_session(cls, node: str):
+        """
+        Non blocking lookup of a live multiplexed session of the node.
+        Args:
+            node (str)
+        Returns:
+            MuxSession or None
+        """
+        cls._check_owner()
+        session = cls._mux_sessions.get(node)
+        if session is not None and session.is_alive():
+            return session
+        return None
+
+    @classmethod
+    def mux_session(cls, node: str):
+        """
+        Obtain the multiplexed session of the node, starting the agent
+        over the pooled client if needed. Nodes where the agent failed to
+        start max_mux_failures times aren't tried again. This blocks while
+        the agent starts.
+        Args:
+            node (str)
+        Returns:
+            MuxSession or None if no session could be provided.
+        """
+        with cls._host_lock(node):
+            session = cls._mux_sessions.get(node)
+            if session is not None and session.is_alive():
+                return session
+            if cls._mux_failures.get(node, 0) >= cls.max_mux_failures:
+                return None
+            client = cls._clients.get(node)
+            if not cls.is_healthy(client):
+                return None
+            try:
+                session = MuxSession(client, RexeLoop.get_loop())
+            except Exception:
+                cls._mux_failures[node] = cls._mux_failures.get(node, 0) + 1
+                return None
+            cls._mux_sessions[node] = session
+            return session
+
+    @classmethod
+    def drop_mux_session(cls, node: str):
+        """
+        Close and drop the multiplexed session of the node, if any.
+        Args:
+            node (str)
+        """
+        with cls._host_lock(node):
+            session = cls._mux_sessions.pop(node, None)
+            if session is not None:
+                session.close()
+
+    @classmethod
+    def close_all(cls):
+        """
+        Close every pooled client of this process.
+        """
+        cls._check_owner()
+        with cls._lock:
+            nodes = list(cls._clients.keys())
+        for node in nodes:
+            cls.evict(node)
+
+    @staticmethod
+    def _close(client):
+        try:
+            client.close()
+        except Exception:
+            pass
 
 
 class Rexe:
+    # Execution mode of execute_command. 'channel' opens a new channel for
+    # every command while 'mux' runs the commands through a long lived
+    # agent per node.
+    exec_mode = "channel"
+    valid_exec_modes = ["channel", "mux"]
+
     def __init__(self, server_dict, client_dict):
         self.host_generic = ['alls', 'allp']
         self.host_dict = {**client_dict, **server_dict}
         self.server_dict = server_dict
         self.client_dict = client_dict
+        # Observer of every command run, set when the query cache of
+        # AbstractOps is enabled.
+        self.query_cache = None
+        # Count of the commands run and the bytes of output received.
+        self.command_stats = {'commands': 0, 'bytes': 0}
+
+    @classmethod
+    def set_exec_mode(cls, mode: str):
+        """
+        Select the execution mode for all the Rexe objects of the process
+        and the processes forked from it.
+        Args:
+            mode (str): 'channel' or 'mux'
+        """
+        if mode not in cls.valid_exec_modes:
+            raise ValueError(f"Invalid execution mode {mode}")
+        cls.exec_mode = mode
+
+    def _build_result(self, cmd: str, node: str, error_code: int,
+                      stdout: bytes, stderr: bytes,
+                      truncated: bool = False) -> CommandResult:
+        """
+        Build the result of a command execution. The output is kept as
+        bytes and decoded by the result when it is accessed.
+        """
+        self.command_stats['commands'] += 1
+        self.command_stats['bytes'] += len(stdout) + len(stderr)
+        return CommandResult(cmd, node, error_code, stdout, stderr,
+                             truncated)
 
     def _random_node(self):
         """
@@ -25,54 +729,157 @@ class Rexe:
 
     def connect_node(self, node, timeout=None):
         """
-        Function to establish connection with the given node.
+        Function to establish connection with the given node. The
+        connection is leased from the process wide ConnectionPool.
         """
-        if timeout is None:
-            timeout_opt = {}
-        else:
-            timeout_opt = {'timeout': timeout}
-
-        node_ssh_client = paramiko.SSHClient()
-        node_ssh_client.load_host_keys(
-            os.path.expanduser('~/.ssh/known_hosts'))
         try:
-            node_ssh_client.connect(
-                hostname=node,
-                username='root',
-                **timeout_opt
-            )
+            node_ssh_client = ConnectionPool.lease(node, timeout)
         except Exception as e:
             self.logger.error(f"Connection failure. Exception: {e}")
             self.connect_flag = False
             raise e
         self.node_dict[node] = node_ssh_client
 
-    def establish_connection(self, timeout=15):
+    def reconnect_node(self, node, timeout=None):
+        """
+        Function to drop a broken pooled connection of the given node
+        and establish a new one.
+        """
+        client = self.node_dict.pop(node, None)
+        ConnectionPool.evict(node)
+        if client is not None:
+            ConnectionPool.release(node, client)
+        self.connect_node(node, timeout)
+
+    @staticmethod
+    def _classify_connect_error(error) -> str:
+        """
+        Map a connection exception to the status reported for the node.
+        """
+        if isinstance(error, paramiko.ssh_exception.AuthenticationException):
+            return "auth_failure"
+        if isinstance(error, socket.timeout):
+            return "timeout"
+        if isinstance(error, paramiko.ssh_exception.NoValidConnectionsError):
+            return "unreachable"
+        return "failure"
+
+    @staticmethod
+    def _timed_connect(node: str, timeout: int) -> tuple:
+        """
+        Lease a connection to the node.
+        Returns:
+            tuple: The client and the time it took.
+        """
+        start = time.time()
+        client = ConnectionPool.lease(node, timeout)
+        return (client, time.time() - start)
+
+    @staticmethod
+    def _drop_late_connect(node: str, future):
+        """
+        Return the lease of a node connected after the deadline, which
+        the Rexe object doesn't hold.
+        """
+        if not future.cancelled() and future.exception() is None:
+            ConnectionPool.release(node, future.result()[0])
+
+    def establish_connection(self, timeout=15, deadline=None):
         """
         Function to establish connection with the given
-        set of hosts.
+        set of hosts. The nodes are connected concurrently and the outcome
+        for every node is recorded in `connection_report`, a dictionary
+        of the form,
+            {
+                node : {
+                    "status" : connected/auth_failure/timeout/
+                               unreachable/failure,
+                    "error" : Exception string or None,
+                    "time_taken" : Seconds spent on the node
+                }
+            }
+        Args:
+            timeout (int): Connection timeout for every node.
+            deadline (int): Overall time budget for connecting all the
+                            nodes. Defaults to twice the timeout.
+        Raises:
+            The exception of the first failed node, or socket.timeout if
+            a node couldn't be connected within the deadline.
         """
         self.logger.debug("establish connection")
         self.node_dict = {}
         self.connect_flag = True
+        self.connection_report = {}
+        if deadline is None:
+            deadline = timeout * 2
+
+        nodes = list(self.host_dict)
+        if not nodes:
+            return
+        start = time.time()
+        executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=len(nodes))
+        future_map = {executor.submit(self._timed_connect, node,
+                                      min(timeout, deadline)): node
+                      for node in nodes}
+        done, _ = concurrent.futures.wait(future_map, timeout=deadline)
+        # Stragglers are left to finish in the background, their
+        # connections land in the pool and their leases are returned.
+        for (future, node) in future_map.items():
+            if future not in done:
+                future.add_done_callback(
+                    functools.partial(self._drop_late_connect, node))
+        executor.shutdown(wait=False)
+
+        first_error = None
+        for future, node in future_map.items():
+            if future not in done:
+                error = socket.timeout(f"{node} not connected within the "
+                                       f"deadline of {deadline}s")
+                self.connection_report[node] = {
+                    "status": "timeout", "error": str(error),
+                    "time_taken": time.time() - start}
+            elif future.exception() is not None:
+                error = future.exception()
+                self.connection_report[node] = {
+                    "status": self._classify_connect_error(error),
+                    "error": str(error),
+                    "time_taken": time.time() - start}
+            else:
+                error = None
+                (self.node_dict[node], time_taken) = future.result()
+                self.connection_report[node] = {
+                    "status": "connected", "error": None,
+                    "time_taken": time_taken}
+            if error is not None and first_error is None:
+                first_error = error
 
-        for node in self.host_dict:
-            self.connect_node(node, timeout)
+        self.logger.debug(f"Connection report : {self.connection_report}")
+        if first_error is not None:
+            self.logger.error(f"Connection failure. Exception: {first_error}")
+            self.connect_flag = False
+            raise first_error
 
-    def deconstruct_connection(self):
+    def deconstruct_connection(self, purge: bool = False):
         """
-        Function to close the existing connections.
+        Function to release the leased connections. The connections
+        stay in the pool for the next test unless purge is set.
+        Args:
+            purge (bool): If True, close all the pooled connections of
+                          this process. Defaults to False.
         """
         self.logger.debug("Deconstructing connection.")
-        if not self.connect_flag:
-            return
-        for node in self.host_dict:
-            if self.node_dict[node]:
-                (self.node_dict[node]).close()
+        # The nodes connected before a failed connection attempt hold
+        # their leases too.
+        for (node, client) in list(getattr(self, 'node_dict', {}).items()):
+            ConnectionPool.release(node, client)
+        self.node_dict = {}
+        if purge:
+            ConnectionPool.close_all()
         return
 
     @dispatch(str)
-    def execute_command(self, cmd):
+    def execute_command(self, cmd, **kwargs):
         """
         Module to handle random node execution.
         Returns:
@@ -84,58 +891,204 @@ class Rexe:
                 - cmd : command that got executed
                 - node : node on which the command got executed
         """
-        return self.execute_command(cmd, self._random_node())
+        return self.execute_command(cmd, self._random_node(), **kwargs)
 
     @dispatch(str, str)
-    def execute_command(self, cmd, node):
+    def execute_command(self, cmd, node, **kwargs):
         """
-        Function to execute command in the given node.
+        Function to execute command in the given node. Thin synchronous
+        wrapper over aexecute_command.
+        Kwargs:
+            line_callback (callable): Called on the event loop thread with
+                                      every stdout line as it arrives.
+                                      It shouldn't block.
+            max_output (int): Number of stdout bytes to be kept at most.
+                              The rest is still read but dropped.
         Returns:
-            ret: A dictionary consisting
+            ret: A CommandResult, which can be accessed as a dictionary
+                 consisting
                 - Flag : Flag to check if connection failed
                 - msg : message
                 - error_msg: error message
                 - error_code: error code returned
                 - cmd : command that got executed
                 - node : node on which the command got executed
+                - truncated : Present and True if a part of the stdout
+                              wasn't kept due to max_output.
+
+        """
+        return RexeLoop.run(self.aexecute_command(cmd, node, **kwargs))
 
+    async def aexecute_command(self, cmd: str, node: str = None,
+                               line_callback=None,
+                               max_output: int = None) -> dict:
+        """
+        Coroutine to execute command in the given node or in a random node
+        if the node isn't given. The commands with a line_callback or a
+        max_output always run over a channel, as the mux agent returns the
+        output only after the command ends.
+        Returns:
+            The same CommandResult as execute_command.
         """
         ret_dict = {}
 
         if not self.connect_flag:
             ret_dict['Flag'] = False
             return ret_dict
+        if node is None:
+            node = self._random_node()
+
+        if self.query_cache is not None:
+            self.query_cache.observe(cmd)
+        output = None
+        streaming = line_callback is not None or max_output is not None
+        if Rexe.exec_mode == "mux" and not streaming:
+            output = await self._aexecute_command_mux(cmd, node)
+        if output is None:
+            output = await self._aexecute_command_channel(
+                cmd, node, line_callback, max_output)
+        ret_dict = self._build_result(cmd, node, *output)
+        if self.query_cache is not None:
+            # Again after the command, a query run concurrently might
+            # have cached the state from before the change.
+            self.query_cache.observe(cmd)
+
+        self.logger.debug(ret_dict)
+        return ret_dict
+
+    def _open_channel(self, cmd: str, node: str):
+        """
+        Open a channel on the node and start the command in it. This
+        blocks for the round trips and is run in the loop's executor.
+        """
         try:
-            _, stdout, stderr = self.node_dict[node].exec_command(cmd)
+            channel = self.node_dict[node].get_transport().open_session()
+            channel.exec_command(cmd)
         except Exception:
             # Reconnection to be done.
-            self.connect_node(node)
+            self.reconnect_node(node)
             # On rebooting the node
-            _, stdout, stderr = self.node_dict[node].exec_command(cmd)
+            channel = self.node_dict[node].get_transport().open_session()
+            channel.exec_command(cmd)
+        return channel
 
-        if stdout.channel.recv_exit_status() != 0:
-            ret_dict['Flag'] = False
-            ret_dict['msg'] = stdout.readlines()
-            ret_dict['error_msg'] = stderr.readlines()
-            if isinstance(ret_dict['error_msg'], list):
-                ret_dict['error_msg'] = "".join(ret_dict['error_msg'])
-        else:
-            if cmd.find("--xml") != -1:
-                stdout_xml_string = "".join(stdout.readlines())
-                ret_dict['msg'] = json.loads(json.dumps(xmltodict.parse(
-                    stdout_xml_string)))['cliOutput']
-            else:
-                ret_dict['msg'] = stdout.readlines()
-            ret_dict['Flag'] = True
-        ret_dict['node'] = node
-        ret_dict['cmd'] = cmd
-        ret_dict['error_code'] = stdout.channel.recv_exit_status()
+    @staticmethod
+    def _drain_channel(channel, out: bytearray, err: bytearray):
+        """
+        Move whatever stdout and stderr data has arrived on the channel
+        into the given buffers, without blocking.
+        """
+        while channel.recv_ready():
+            out.extend(channel.recv(65536))
+        while channel.recv_stderr_ready():
+            err.extend(channel.recv_stderr(65536))
 
-        self.logger.debug(ret_dict)
-        return ret_dict
+    async def _await_channel(self, channel, out: bytearray,
+                             err: bytearray) -> int:
+        """
+        Wait for the command in the channel to end while draining its
+        output. The wake ups come from the channel's file descriptor which
+        turns readable on new data and on EOF.
+        Returns:
+            int: The exit status of the command.
+        """
+        loop = asyncio.get_event_loop()
+        wake = asyncio.Event()
+        fd = channel.fileno()
+        loop.add_reader(fd, wake.set)
+        watching = True
+        backoff = 0.001
+        try:
+            while True:
+                self._drain_channel(channel, out, err)
+                if channel.exit_status_ready():
+                    self._drain_channel(channel, out, err)
+                    break
+                wake.clear()
+                if channel.eof_received or channel.closed:
+                    # The descriptor stays readable after EOF, so stop
+                    # watching it. Only the exit status is pending now.
+                    if watching:
+                        loop.remove_reader(fd)
+                        watching = False
+                    await asyncio.sleep(backoff)
+                    backoff = min(backoff * 2, 0.1)
+                    continue
+                try:
+                    await asyncio.wait_for(wake.wait(), 1)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            if watching:
+                loop.remove_reader(fd)
+        return channel.recv_exit_status()
+
+    async def _aexecute_command_channel(self, cmd: str, node: str,
+                                        line_callback=None,
+                                        max_output: int = None) -> tuple:
+        """
+        Run the command over a new channel of the node, streaming its
+        output into OutputBuffers.
+        Returns:
+            tuple: (exit code, stdout, stderr, truncated)
+        """
+        loop = asyncio.get_event_loop()
+        channel = await loop.run_in_executor(None, self._open_channel, cmd,
+                                             node)
+        out = OutputBuffer(max_output, line_callback)
+        err = OutputBuffer()
+        try:
+            error_code = await self._await_channel(channel, out, err)
+        finally:
+            channel.close()
+        return (error_code,) + self._buffered_output(out, err)
+
+    def _buffered_output(self, out: OutputBuffer,
+                         err: OutputBuffer) -> tuple:
+        """
+        Take the data out of the filled buffers and release them.
+        Returns:
+            tuple: (stdout, stderr, truncated)
+        """
+        try:
+            out.finish()
+            truncated = out.truncated
+            if truncated and out.max_size:
+                self.logger.warning(f"Kept {out.kept} of {out.size} bytes "
+                                    "of the output")
+            return (out.getvalue(), err.getvalue(), truncated)
+        finally:
+            out.close()
+            err.close()
+
+    async def _aexecute_command_mux(self, cmd: str, node: str):
+        """
+        Run the command through the multiplexed session of the node.
+        Returns:
+            tuple: (exit code, stdout, stderr, truncated) or None if the
+                   command has to fall back to the channel mode.
+        """
+        session = ConnectionPool.cached_mux_session(node)
+        if session is None:
+            loop = asyncio.get_event_loop()
+            session = await loop.run_in_executor(
+                None, ConnectionPool.mux_session, node)
+        if session is None:
+            return None
+        try:
+            error_code, out, err = await session.run(cmd)
+        except MuxSessionError as error:
+            ConnectionPool.drop_mux_session(node)
+            if not error.sent:
+                return None
+            self.logger.error(f"{cmd} on {node} lost : {error}")
+            return (-1, b"",
+                    f"Command lost by the mux agent: {error}".encode(),
+                    False)
+        return (error_code, out, err, False)
 
     @dispatch(str)
-    def execute_command_async(self, cmd: str) -> dict:
+    def execute_command_async(self, cmd: str, **kwargs) -> dict:
         """
         Module to handle random node async execution.
         Returns:
@@ -145,15 +1098,20 @@ class Rexe:
                 - stdout : The stdout handle
                 - stderr : The stderr handle
         """
-        return self.execute_command_async(cmd, self._random_node())
+        return self.execute_command_async(cmd, self._random_node(),
+                                          **kwargs)
 
     @dispatch(str, str)
-    def execute_command_async(self, cmd: str, node: str) -> dict:
+    def execute_command_async(self, cmd: str, node: str, **kwargs) -> dict:
         """
         Function to execute command asynchronously in the given node.
+        Thin synchronous wrapper over aexecute_command_async.
         Args:
             cmd (string): Command to be executed.
             node (string) : The node ip wherein the command is to be run.
+        Kwargs:
+            line_callback (callable) and max_output (int), same as for
+            execute_command.
         Returns:
             ret: A dictionary consisting
                 - cmd : Command requested
@@ -161,20 +1119,47 @@ class Rexe:
                 - stdout : The stdout handle
                 - stderr : The stderr handle
         """
-        async_obj = {}
+        return RexeLoop.run(self.aexecute_command_async(cmd, node, **kwargs))
 
-        if not self.connect_flag:
-            return async_obj
+    def _open_async(self, cmd: str, node: str) -> dict:
+        """
+        Start the command on the node and build the async object. This
+        blocks for the round trips and is run in the loop's executor.
+        """
         try:
             stdin, stdout, stderr = self.node_dict[node].exec_command(cmd)
         except Exception:
             # Reconnection to be done.
-            self.connect_node(node)
+            self.reconnect_node(node)
             # On rebooting the node
             stdin, stdout, stderr = self.node_dict[node].exec_command(cmd)
 
-        async_obj = {"cmd": cmd, "node": node, "stdout": stdout,
-                     "stderr": stderr, "stdin": stdin}
+        return {"cmd": cmd, "node": node, "stdout": stdout,
+                "stderr": stderr, "stdin": stdin}
+
+    async def aexecute_command_async(self, cmd: str, node: str = None,
+                                     line_callback=None,
+                                     max_output: int = None) -> dict:
+        """
+        Coroutine to start a command in the given node, or in a random
+        node, without waiting for it to end. Its output is streamed into
+        the async object from the start, so a command with a long output
+        doesn't stall while nobody waits for it.
+        Returns:
+            The same async object as execute_command_async.
+        """
+        if not self.connect_flag:
+            return {}
+        if node is None:
+            node = self._random_node()
+        if self.query_cache is not None:
+            self.query_cache.observe(cmd)
+        loop = asyncio.get_event_loop()
+        async_obj = await loop.run_in_executor(None, self._open_async, cmd,
+                                               node)
+        async_obj['out_buf'] = OutputBuffer(max_output, line_callback)
+        async_obj['err_buf'] = OutputBuffer()
+        self._async_obj_waiter(async_obj)
         return async_obj
 
     def check_async_command_status(self, async_obj: dict) -> bool:
@@ -198,33 +1183,70 @@ class Rexe:
         Returns:
             dict: Returns the resultant dictionary
         """
+        # The output is taken from the buffers the waiter of the command
+        # drains the channel into, hence the waiter is to be done first.
+        if not RexeLoop.in_loop_thread():
+            RexeLoop.run(self._await_async_obj(async_obj))
+        elif not self._async_obj_waiter(async_obj).done():
+            raise RuntimeError("Async command still running, await "
+                               "await_till_async_command_ends instead.")
+        error_code = async_obj['waiter'].result()
+        ret_dict = self._build_result(
+            async_obj['cmd'], async_obj['node'], error_code,
+            *self._buffered_output(async_obj['out_buf'],
+                                   async_obj['err_buf']))
+
+        self.logger.debug(ret_dict)
+        return ret_dict
+
+    @staticmethod
+    def _incomplete_result(async_obj: dict) -> dict:
+        """
+        The result of an async command which didn't end in time.
+        """
         ret_dict = {}
-        if async_obj['stdout'].channel.recv_exit_status() != 0:
-            ret_dict['Flag'] = False
-            ret_dict['msg'] = async_obj['stdout'].readlines()
-            ret_dict['error_msg'] = async_obj['stderr'].readlines()
-            if isinstance(ret_dict['error_msg'], list):
-                ret_dict['error_msg'] = "".join(ret_dict['error_msg'])
-        else:
-            if async_obj['cmd'].find("--xml") != -1:
-                stdout_xml_string = "".join(async_obj['stdout'].readlines())
-                ret_dict['msg'] = json.loads(json.dumps(xmltodict.parse(
-                    stdout_xml_string)))['cliOutput']
-            else:
-                ret_dict['msg'] = async_obj['stdout'].readlines()
-            ret_dict['Flag'] = True
+        ret_dict['error_code'] = -1
+        ret_dict['Flag'] = False
+        ret_dict['msg'] = ""
+        ret_dict['error_msg'] = "Command execution incomplete"
         ret_dict['node'] = async_obj['node']
         ret_dict['cmd'] = async_obj['cmd']
-        ret_dict['error_code'] = async_obj['stdout'].channel.recv_exit_status()
-
-        self.logger.debug(ret_dict)
         return ret_dict
 
+    def _async_obj_waiter(self, async_obj: dict):
+        """
+        Obtain the task tracking the completion of the async command,
+        starting it on the first call. The task drains the output into
+        the async object as it arrives and resolves as soon as the exit
+        status is received. To be called on the loop thread.
+        Returns:
+            asyncio Task
+        """
+        waiter = async_obj.get('waiter')
+        if waiter is None:
+            async_obj.setdefault('out_buf', OutputBuffer())
+            async_obj.setdefault('err_buf', OutputBuffer())
+            waiter = asyncio.ensure_future(
+                self._await_channel(async_obj['stdout'].channel,
+                                    async_obj['out_buf'],
+                                    async_obj['err_buf']))
+            async_obj['waiter'] = waiter
+        return waiter
+
+    async def _await_async_obj(self, async_obj: dict) -> int:
+        """
+        Coroutine waiting for the waiter of the async command.
+        Returns:
+            int: The exit status of the command.
+        """
+        return await asyncio.shield(self._async_obj_waiter(async_obj))
+
     def wait_till_async_command_ends(self, async_obj: dict,
                                      timeout: int = None) -> dict:
         """
         Stay put till the async command finished it's execution and
-        provide the required return value.
+        provide the required return value. Thin synchronous wrapper over
+        await_till_async_command_ends.
         Args:
             async_obj (dict) : Contains the details about the async command,
                                with keys -> 'stdout', 'stderr', 'cmd', 'node'
@@ -233,31 +1255,82 @@ class Rexe:
         Returns:
             dict: Returns the resultant dictionary after the command ends.
         """
+        return RexeLoop.run(self.await_till_async_command_ends(async_obj,
+                                                               timeout))
 
-        ret_dict = {}
-        if timeout:
-            while timeout:
-                if not async_obj['stdout'].channel.exit_status_ready():
-                    time.sleep(1)
-                    timeout -= 1
-                else:
-                    break
+    async def await_till_async_command_ends(self, async_obj: dict,
+                                            timeout: int = None) -> dict:
+        """
+        Coroutine waiting for the async command to end. It wakes up as soon
+        as the exit status of the command arrives.
+        Args:
+            async_obj (dict) : Contains the details about the async command,
+                               with keys -> 'stdout', 'stderr', 'cmd', 'node'
+            timeout (int) : Time until which the async command status shall
+                            be checked
+        Returns:
+            dict: Returns the resultant dictionary after the command ends.
+        """
+        waiter = self._async_obj_waiter(async_obj)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout or None)
+        except asyncio.TimeoutError:
+            return self._incomplete_result(async_obj)
+        return self.collect_async_result(async_obj)
+
+    def wait_all(self, async_objs: list, timeout: int = None) -> list:
+        """
+        Wait for all the async commands to end under one shared deadline.
+        Thin synchronous wrapper over await_all.
+        Args:
+            async_objs (list): Async objects as returned by
+                               execute_command_async.
+            timeout (int): Time within which all the commands shall end.
+        Returns:
+            list: The resultant dictionaries in the order of the async
+                  objects. The commands which didn't end in time have
+                  the error_code -1.
+        """
+        return RexeLoop.run(self.await_all(async_objs, timeout))
 
-            if not timeout:
-                ret_dict['error_code'] = -1
-                ret_dict['Flag'] = False
-                ret_dict['msg'] = ""
-                ret_dict['error_msg'] = "Command execution incomplete"
-                ret_dict['node'] = async_obj['node']
-                ret_dict['cmd'] = async_obj['cmd']
-                return ret_dict
+    async def await_all(self, async_objs: list, timeout: int = None) -> list:
+        """
+        Coroutine waiting for all the async commands to end under one
+        shared deadline. Refer wait_all.
+        """
+        waiters = [self._async_obj_waiter(obj) for obj in async_objs]
+        if waiters:
+            await asyncio.wait(waiters, timeout=timeout or None)
+        return [self.collect_async_result(obj) if waiter.done()
+                else self._incomplete_result(obj)
+                for (obj, waiter) in zip(async_objs, waiters)]
 
-        else:
-            while not async_obj['stdout'].channel.exit_status_ready():
-                time.sleep(1)
+    def wait_any(self, async_objs: list, timeout: int = None) -> list:
+        """
+        Wait till at least one of the async commands ends. Thin synchronous
+        wrapper over await_any.
+        Args:
+            async_objs (list): Async objects as returned by
+                               execute_command_async.
+            timeout (int): Time within which a command shall end.
+        Returns:
+            list: The async objects whose commands have ended, empty if
+                  none ended in time. Their results can be obtained with
+                  collect_async_result.
+        """
+        return RexeLoop.run(self.await_any(async_objs, timeout))
 
-        ret_dict = self.collect_async_result(async_obj)
-        return ret_dict
+    async def await_any(self, async_objs: list, timeout: int = None) -> list:
+        """
+        Coroutine waiting till at least one of the async commands ends.
+        Refer wait_any.
+        """
+        waiters = [self._async_obj_waiter(obj) for obj in async_objs]
+        if waiters:
+            await asyncio.wait(waiters, timeout=timeout or None,
+                               return_when=asyncio.FIRST_COMPLETED)
+        return [obj for (obj, waiter) in zip(async_objs, waiters)
+                if waiter.done()]
 
     @dispatch(str)
     def execute_command_multinode(self, cmd):
@@ -271,23 +1344,102 @@ class Rexe:
     def execute_command_multinode(self, cmd, node_list):
         """
         Function to execute command in multiple nodes
-        parallely.
+        parallely. Thin synchronous wrapper over
+        aexecute_command_multinode.
         """
-        ret_val = []
+        return RexeLoop.run(self.aexecute_command_multinode(cmd, node_list))
 
-        with concurrent.futures.ThreadPoolExecutor(
-                max_workers=len(node_list)) as executor:
+    async def aexecute_command_multinode(self, cmd: str,
+                                         node_list: list = None) -> list:
+        """
+        Coroutine to execute command in multiple nodes concurrently, all
+        the nodes if the node list isn't given.
+        Returns:
+            list of result dictionaries, in the order of the nodes.
+        """
+        if node_list is None:
+            node_list = list(self.node_dict.keys())
+        ret_val = []
 
-            future_exec = {executor.submit(
-                self.execute_command, cmd, node): node for node in node_list}
-            for future_handle in concurrent.futures.as_completed(future_exec):
-                try:
-                    ret_val.append(future_handle.result())
-                except Exception as exc:
-                    print(f"Generated exception : {exc}")
+        results = await asyncio.gather(*[self.aexecute_command(cmd, node)
+                                         for node in node_list],
+                                       return_exceptions=True)
+        for (node, result) in zip(node_list, results):
+            if isinstance(result, Exception):
+                self.logger.error(f"Generated exception on {node} : "
+                                  f"{result}")
+            else:
+                ret_val.append(result)
         self.logger.info(ret_val)
         return ret_val
 
+    def execute_command_pernode(self, cmd_dict: dict, timer=None,
+                                phase: str = None,
+                                errors: dict = None) -> dict:
+        """
+        Function to execute a command of its own on each of the nodes
+        parallely. Thin synchronous wrapper over
+        aexecute_command_pernode.
+        """
+        return RexeLoop.run(self.aexecute_command_pernode(cmd_dict, timer,
+                                                          phase, errors))
+
+    async def aexecute_command_pernode(self, cmd_dict: dict, timer=None,
+                                       phase: str = None,
+                                       errors: dict = None) -> dict:
+        """
+        Coroutine to execute the command of each node concurrently, as the
+        steps of a node merged into a single command.
+        Args:
+            cmd_dict (dict): Node to the command to be run on it.
+            timer (PhaseTimer): Optional timer in which the run on each
+                                node is recorded as a phase of the node.
+            phase (str): Name of the phase.
+            errors (dict): Optional dictionary into which the exception
+                           of every node whose command raised is put.
+        Returns:
+            dict of node to the result dictionary, the nodes whose
+            command raised being left out.
+        """
+        async def run_on_node(node: str, cmd: str):
+            start = time.time()
+            result = await self.aexecute_command(cmd, node)
+            if timer is not None:
+                out_bytes = (len(getattr(result, 'stdout', b""))
+                             + len(getattr(result, 'stderr', b"")))
+                timer.add(phase, start, node, 1, out_bytes)
+            return result
+
+        nodes = list(cmd_dict.keys())
+        results = await asyncio.gather(*[run_on_node(node, cmd_dict[node])
+                                         for node in nodes],
+                                       return_exceptions=True)
+        ret_val = {}
+        for (node, result) in zip(nodes, results):
+            if isinstance(result, Exception):
+                self.logger.error(f"Generated exception on {node} : "
+                                  f"{result}")
+                if errors is not None:
+                    errors[node] = result
+            else:
+                ret_val[node] = result
+        return ret_val
+
+    def transfer_files_from_local(self, file_list: list, dest_node: str):
+        """
+        Method to transfer the given files to the dest node over a single
+        SFTP session. The existing files are overwritten.
+        Args:
+            file_list (list): (source path, dest path) pairs.
+            dest_node (str)
+        """
+        sftp = self.node_dict[dest_node].open_sftp()
+        try:
+            for (source_path, dest_path) in file_list:
+                sftp.put(source_path, dest_path)
+        finally:
+            sftp.close()
+
     def transfer_file_from_local(self, source_path, dest_path, dest_node,
                                  remove: bool = False):
         """
@@ -332,4 +1484,9 @@ class Rexe:
         if stdout:
             stdout.channel.close()
 
+        # The pooled connection dies with the reboot, drop it.
+        ConnectionPool.evict(node)
+        if self.query_cache is not None:
+            self.query_cache.invalidate()
+
         return True
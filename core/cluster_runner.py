@@ -0,0 +1,357 @@
+"""
+The cluster runner shards one test list across several clusters, each
+configured through a config file of its own, and runs the shards in
+parallel, one process per cluster. Every cluster process sets up its
+environment, runs its share through the TestRunner and tears the
+environment down, while the results stream back to the main process and
+are merged into one report. The tests of a cluster which fails are
+reported as skipped with the error of the cluster.
+"""
+import time
+import traceback
+from queue import Empty
+from multiprocessing import Event, Process, Queue
+from environ import environ, FrameworkEnv
+from test_runner import TestRunner
+from scheduler import DurationHistory
+
+
+class TestShard:
+    """
+    The share of the tests of a cluster. It stands in for the
+    TestListBuilder towards the TestRunner.
+    """
+
+    def __init__(self, nd_tests: dict, special_tests: list,
+                 spec_vol_types: list, dtest_queue):
+        """
+        Args:
+            nd_tests (dict): Volume type ( or Generic ) to the list of the
+                             non disruptive tests of the shard.
+            special_tests (list): The volume creation and deletion tests.
+            spec_vol_types (list): Volume types of the single test run.
+            dtest_queue (Queue): The disruptive tests, shared by all the
+                                 clusters and ending with a sentinel per
+                                 cluster.
+        """
+        self.nd_tests = nd_tests
+        self.special_tests = special_tests
+        self.spec_vol_types = [vol_type for vol_type in spec_vol_types
+                               if nd_tests.get(vol_type)]
+        self.dtest_queue = dtest_queue
+
+    def get_dtest_list(self):
+        """
+        Returns an iterator over the disruptive tests, each of which is
+        taken off the shared queue only when the cluster is free to run
+        it.
+        """
+        return iter(self.dtest_queue.get, None)
+
+    def get_ndtest_list(self, vol_type: str) -> list:
+        """
+        Returns the non disruptive tests of the shard for a volume type.
+        """
+        return self.nd_tests.get(vol_type, [])
+
+    def get_special_tests_dict(self) -> list:
+        """
+        Returns the special tests, if the shard has any volume type.
+        """
+        vol_tests = [tests for (vol_type, tests) in self.nd_tests.items()
+                     if vol_type != "Generic" and tests]
+        if not vol_tests:
+            return []
+        return self.special_tests
+
+    def get_spec_vol_types(self) -> list:
+        """
+        Returns the volume types of the single test run in the shard.
+        """
+        return self.spec_vol_types
+
+    def get_nd_tests_count(self) -> int:
+        """
+        Returns the count of the non disruptive tests of the shard.
+        """
+        return sum(len(tests) for tests in self.nd_tests.values())
+
+
+class ClusterRunner:
+    """
+    Runs the test list across the clusters, balancing the shards with
+    the duration history.
+    """
+
+    @classmethod
+    def init(cls, TestListBuilder, param_objs: list, base_log_path: str,
+             log_level: str, multiprocess_count: int, spec_test: bool,
+             duration_history: str, logger, ledger=None,
+             max_failures: int = None, volume_pool: bool = False):
+        """
+        Args:
+            TestListBuilder (class)
+            param_objs (list): The ParamsHandler of every cluster.
+            base_log_path (str)
+            log_level (str)
+            multiprocess_count (int): Concurrency within a cluster.
+            spec_test (bool): True if only one test is run.
+            duration_history (str): JSON file with the durations of the
+                                    earlier runs.
+            logger: The logger of the main process.
+            ledger (ResultsLedger): Optional ledger to record the results
+                                    in.
+            max_failures (int): Optional count of failures, across all
+                                the clusters, after which the remaining
+                                tests are skipped.
+            volume_pool (bool): Whether every cluster builds the volumes
+                                of its disruptive tests ahead of them.
+        """
+        cls.param_objs = param_objs
+        cls.base_log_path = base_log_path
+        cls.log_level = log_level
+        cls.concur_count = multiprocess_count
+        cls.spec_test = spec_test
+        cls.duration_history = duration_history
+        cls.history = DurationHistory(duration_history)
+        cls.logger = logger
+        cls.ledger = ledger
+        cls.max_failures = max_failures
+        cls.volume_pool = volume_pool
+        cls.stop_event = Event()
+        cls.result_queue = Queue()
+        cls._shard_tests(TestListBuilder)
+
+    @classmethod
+    def _shard_tests(cls, TestListBuilder):
+        """
+        Split the non disruptive tests into shards, a volume type with
+        all its tests or a single Generic test being the unit, assigned
+        longest first to the least loaded cluster which has the volume
+        type in its config. The disruptive tests
+        are queued longest first and the clusters take them one at a
+        time as they become free.
+        """
+        clusters = len(cls.param_objs)
+        special_tests = TestListBuilder.get_special_tests_dict()
+        vol_types = list(cls.param_objs[0].volume_types)
+        if cls.spec_test:
+            vol_types = TestListBuilder.get_spec_vol_types()
+
+        units = []
+        for vol_type in vol_types:
+            tests = TestListBuilder.get_ndtest_list(vol_type)
+            if not tests:
+                continue
+            work = sum(cls.history.estimate(test['modulePath'], vol_type)
+                       for test in tests)
+            work += sum(cls.history.estimate(test['modulePath'], vol_type,
+                                             special=True)
+                        for test in special_tests)
+            units.append((work, vol_type, tests))
+        for test in TestListBuilder.get_ndtest_list('Generic'):
+            units.append((cls.history.estimate(test['modulePath'],
+                                               "Generic"),
+                          "Generic", [test]))
+
+        loads = [0] * clusters
+        shards = [{} for _ in range(clusters)]
+        for (work, vol_type, tests) in sorted(units,
+                                              key=lambda unit: -unit[0]):
+            # A volume type goes to a cluster whose config has it.
+            eligible = [idx for idx in range(clusters)
+                        if vol_type == "Generic"
+                        or vol_type in cls.param_objs[idx].volume_types]
+            if not eligible:
+                eligible = list(range(clusters))
+            idx = min(eligible, key=lambda idx: loads[idx])
+            loads[idx] += work
+            shards[idx].setdefault(vol_type, []).extend(tests)
+
+        cls.dtest_queue = Queue()
+        dtests = sorted(TestListBuilder.get_dtest_list(),
+                        key=lambda test: -cls.history.estimate(
+                            test['modulePath'], test['volType']))
+        for test in dtests:
+            cls.dtest_queue.put(test)
+        for _ in range(clusters):
+            cls.dtest_queue.put(None)
+
+        spec_vol_types = TestListBuilder.get_spec_vol_types()
+        cls.shards = [TestShard(nd_tests, special_tests, spec_vol_types,
+                                cls.dtest_queue) for nd_tests in shards]
+        dwork = sum(cls.history.estimate(test['modulePath'],
+                                         test['volType'])
+                    for test in dtests)
+        for (idx, load) in enumerate(loads):
+            count = cls.shards[idx].get_nd_tests_count()
+            cls.logger.info(f"Cluster {idx} : {count} non disruptive "
+                            f"tests, estimated work {load:.0f}s")
+        cls.logger.info(f"{len(dtests)} disruptive tests shared by "
+                        f"{clusters} clusters, estimated work {dwork:.0f}s")
+
+    @classmethod
+    def _cluster_process(cls, idx: int, error_handler, keep_logs: bool):
+        """
+        Runs the shard of a cluster. The results are sent to the main
+        process as they are collected, followed by the end of the
+        cluster, None if it finished and its error if it failed.
+        """
+        error = None
+        try:
+            env_obj = FrameworkEnv.getInstance()
+            env_obj.init_ds()
+            env_set = environ(cls.param_objs[idx], env_obj, error_handler,
+                              f"{cls.base_log_path}/main-{idx}.log",
+                              cls.log_level)
+            env_set.setup_env(keep_logs)
+            volume_pool_log = None
+            if cls.volume_pool:
+                volume_pool_log = (f"{cls.base_log_path}/"
+                                   f"volume_pool-{idx}.log")
+            TestRunner.init(cls.shards[idx], cls.param_objs[idx], env_set,
+                            cls.base_log_path, cls.log_level,
+                            cls.concur_count, cls.spec_test,
+                            cls.duration_history,
+                            lambda result: cls.result_queue.put((idx,
+                                                                 result)),
+                            stop_event=cls.stop_event,
+                            volume_pool_log=volume_pool_log)
+            TestRunner.run_tests(env_obj)
+            env_set.teardown_env()
+        except SystemExit:
+            # The environ exits when the set up fails.
+            error = "Environment setup failed"
+        except Exception as err:
+            error = str(err)
+            cls.logger.error(f"Cluster {idx} failed : {err}")
+            cls.logger.error(traceback.format_exc())
+        finally:
+            cls.result_queue.put((idx, error))
+
+    @classmethod
+    def run_tests(cls, error_handler, keep_logs: bool) -> list:
+        """
+        Run the shards, one process per cluster, and merge the results.
+        Args:
+            error_handler (callable): The error handler of the environ.
+            keep_logs (bool): Don't clear the old glusterfs logs.
+        Returns:
+            list: The results of all the clusters, in the order they
+                  ended.
+        """
+        procs = []
+        for idx in range(len(cls.param_objs)):
+            proc = Process(target=cls._cluster_process,
+                           args=(idx, error_handler, keep_logs,))
+            procs.append(proc)
+            proc.start()
+
+        results = []
+        cls.failures = 0
+        reported = [set() for _ in procs]
+        ended = set()
+        exited = set()
+        start = time.time()
+        while len(ended) < len(procs):
+            try:
+                (idx, result) = cls.result_queue.get(timeout=5)
+            except Empty:
+                for (idx, proc) in enumerate(procs):
+                    if idx in ended or proc.is_alive():
+                        continue
+                    if idx not in exited:
+                        # Whatever it sent is read before it is given up.
+                        exited.add(idx)
+                        continue
+                    ended.add(idx)
+                    cls._shard_failed(idx, "Cluster process exited with "
+                                      f"code {proc.exitcode}",
+                                      reported[idx], results)
+                continue
+            if idx in ended:
+                continue
+            if result is None or isinstance(result, str):
+                ended.add(idx)
+                if result is None:
+                    cls.logger.info(f"Cluster {idx} finished after "
+                                    f"{time.time() - start:.0f}s")
+                else:
+                    cls._shard_failed(idx, result, reported[idx], results)
+                continue
+            test_stats = list(result.values())[0]
+            reported[idx].add((test_stats['modulePath'],
+                               test_stats['volType']))
+            cls._merge_result(idx, result, results)
+
+        # The disruptive tests no cluster was left to take.
+        while True:
+            try:
+                test = cls.dtest_queue.get_nowait()
+            except Empty:
+                break
+            if test is not None:
+                cls._merge_result(None, TestRunner._abandoned_result(
+                    test, test['volType'], "No cluster left to run it"),
+                    results)
+
+        for proc in procs:
+            proc.join()
+        try:
+            cls.history.save()
+        except OSError as error:
+            cls.logger.error(f"Couldn't save the duration history: {error}")
+        return results
+
+    @classmethod
+    def _shard_failed(cls, idx: int, error: str, reported: set,
+                      results: list):
+        """
+        Report the non disruptive tests of the shard of a failed cluster
+        which it didn't report, as skipped with the error of the cluster.
+        Args:
+            idx (int): The cluster.
+            error (str): The error of the cluster.
+            reported (set): (module path, volume type) of the results the
+                            cluster reported.
+            results (list): List to which the results are appended.
+        """
+        cls.logger.error(f"Cluster {idx} failed : {error}")
+        for (vol_type, tests) in cls.shards[idx].nd_tests.items():
+            for test in tests:
+                if (test['modulePath'], vol_type) in reported:
+                    continue
+                cls._merge_result(idx, TestRunner._abandoned_result(
+                    test, vol_type, f"Cluster {idx} failed : {error}"),
+                    results)
+
+    @classmethod
+    def _merge_result(cls, idx: int, result: dict, results: list):
+        """
+        Add the result of a test to the results of the run, stopping the
+        clusters once the failure limit is reached.
+        Args:
+            idx (int): The cluster which ran the test, None if none did.
+            result (dict): {test name: test stats}
+            results (list): List to which the result is appended.
+        """
+        results.append(result)
+        if cls.ledger is not None:
+            cls.ledger.record(result)
+        test_stats = list(result.values())[0]
+        source = "No cluster" if idx is None else f"Cluster {idx}"
+        cls.logger.info(f"{source} : {list(result.keys())[0]}-"
+                        f"{test_stats['volType']} : "
+                        f"{test_stats['testResult']}")
+        if test_stats['testResult'] == "FAIL":
+            cls.failures += 1
+            if (cls.max_failures is not None
+                    and cls.failures >= cls.max_failures
+                    and not cls.stop_event.is_set()):
+                cls.logger.error(f"{cls.failures} failures, skipping the "
+                                 "remaining tests.")
+                cls.stop_event.set()
+        if test_stats['testResult'] != "SKIP":
+            cls.history.record(test_stats['modulePath'],
+                               test_stats['volType'],
+                               test_stats['timeTaken'])
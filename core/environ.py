@@ -2,11 +2,23 @@ import os
 import sys
 from socket import timeout
 import copy
+import time
+import shutil
+import tempfile
+import functools
+import threading
 import traceback
+import concurrent.futures
+from collections.abc import Mapping, Sequence
+from multiprocessing import RawValue
+from multiprocessing.managers import BaseManager
 import paramiko
 from halo import Halo
 sys.path.insert(1, ".")
 from common.mixin import RedantMixin
+from common.phase_timer import PhaseTimer
+from script_manifest import (manifest_name, file_hashes, parse_manifest,
+                             render_manifest, build_bundle)
 
 
 class environ:
@@ -15,6 +27,17 @@ class environ:
     the setup and the cleanup.
     """
 
+    script_dir = '/usr/share/redant/script'
+    bundle_name = '.bundle.tar.gz'
+    # The I/O scripts under tools/scripts copied to every node.
+    scripts = ['file_dir_ops.py', 'compute_hash.py', 'file_lock.py',
+               'fd_writes.py', 'walk_dir.py', 'memory_and_cpu_logger.py']
+    # The prerequisite tools, with the exit code of the tool when run
+    # without arguments, if installed, and the script under
+    # tools/pre-req_scripts which installs it.
+    packages = [('arequal-checksum', 64, 'arequal_install.sh'),
+                ('crefi', 2, 'crefi_install.sh')]
+
     def __init__(self, param_obj, es, error_handler,
                  log_path: str, log_level: str):
         """
@@ -31,18 +54,21 @@ class environ:
             error_handler(e, '''
             It seems one of the nodes is down.
             Message: {exc}.
+            ''' + self._connection_report_str() + '''
             Check and run again.
             ''')
         except paramiko.ssh_exception.AuthenticationException as e:
             error_handler(e, """
             Authentication failed.
             Message: {exc}
+            """ + self._connection_report_str() + """
             Check and run again.
             """)
         except timeout as e:
             error_handler(e, """
             Oops! There was a timeout connecting the servers.
             Message: {exc}
+            """ + self._connection_report_str() + """
             Check and run again.
             """)
         except Exception as e:
@@ -52,126 +78,177 @@ class environ:
         self.client_list = param_obj.get_client_ip_list()
         self.brick_root = param_obj.get_brick_roots()
 
-    def get_framework_logger(self):
-        """
-        To return the framework logger object
-        """
-        return self.redant.logger
-
-    def _transfer_files_to_machines(self, machines: list, spath: str,
-                                    dpath: str):
-        """
-        Transfers files from source path to destination
-        path
-        """
-        remove = False
-        check_path = False
-        if not self.redant.path_exists(machines, "/usr/share/redant/script"):
-            for node in machines:
-                self.redant.create_dir('/usr/share', 'redant/script', node)
-                check_path = True
-
-        if check_path and self.redant.path_exists(machines, [dpath]):
-            remove = True
-
-        for node in machines:
-            self.redant.logger.info(f'Copying file to {node}')
-            self.redant.transfer_file_from_local(spath,
-                                                 dpath, node,
-                                                 remove)
-
-    def _check_and_copy_scripts(self):
-        """
-        Check if the I/O script exists in the client
-        machines. If not transfer it there.
-        """
-        scripts_dpath = ['/usr/share/redant/script/file_dir_ops.py',
-                         '/usr/share/redant/script/compute_hash.py',
-                         '/usr/share/redant/script/file_lock.py',
-                         '/usr/share/redant/script/fd_writes.py',
-                         '/usr/share/redant/script/walk_dir.py',
-                         '/usr/share/redant/script/memory_and_cpu_logger.py']
-        scripts_spath = ['tools/scripts/file_dir_ops.py',
-                         'tools/scripts/compute_hash.py',
-                         'tools/scripts/file_lock.py',
-                         'tools/scripts/fd_writes.py',
-                         'tools/scripts/walk_dir.py',
-                         'tools/scripts/memory_and_cpu_logger.py']
-
-        total_nodes = list(set(self.client_list + self.server_list))
-        for ind, script in enumerate(scripts_spath):
-            self._transfer_files_to_machines(total_nodes,
-                                             f'{os.getcwd()}/{script}',
-                                             scripts_dpath[ind])
-
-    def _list_of_machines_without_package(self, nodes: list, package: str,
-                                          error_code: int):
+    def _connection_report_str(self) -> str:
         """
-        This function returns the list of machines without
-        arequal checksum/crefi installed on it.
+        Render the per node connection report of the last
+        establish_connection call for the error messages.
         """
-        nodes = set(nodes)
-        machines = []
-        for node in nodes:
-            ret = self.redant.execute_abstract_op_node(package, node, False)
-            if ret['error_code'] != error_code:
-                machines.append(node)
-        return machines
+        report = getattr(self.redant, "connection_report", {})
+        lines = ["Per node connection report:"]
+        for (node, status) in report.items():
+            line = (f"{node} : {status['status']} "
+                    f"({status['time_taken']:.2f}s)")
+            if status['error'] is not None:
+                line += f" - {status['error']}"
+            self.redant.logger.error(line)
+            lines.append(line)
+        # The report is passed through str.format by the error handler.
+        return "\n            ".join(lines).replace("{", "{{").replace(
+            "}", "}}")
 
-    def _check_and_install_scripts(self):
+    def get_framework_logger(self):
         """
-        Checks if arequal checksum and crefi is present on
-        the servers and clients and if not present
-        installs it.
+        To return the framework logger object
         """
-        total_nodes = list(set(self.client_list + self.server_list))
-
-        # check for arequal checksum
-        arequal_dpath = '/usr/share/redant/script/arequal_install.sh'
-        arequal_spath = (f'{os.getcwd()}/tools/pre-req_scripts/'
-                         'arequal_install.sh')
-
-        arequal_machines = self._list_of_machines_without_package(
-            total_nodes, "arequal-checksum", 64)
-        if len(arequal_machines) > 0:
-            self._transfer_files_to_machines(arequal_machines, arequal_spath,
-                                             arequal_dpath)
-
-            cmd = f"sh {arequal_dpath}"
-            self.redant.execute_abstract_op_multinode(cmd, arequal_machines)
-
-        # check for crefi
-        crefi_dpath = '/usr/share/redant/script/crefi_install.sh'
-        crefi_spath = f'{os.getcwd()}/tools/pre-req_scripts/crefi_install.sh'
-
-        crefi_machines = self._list_of_machines_without_package(total_nodes,
-                                                                "crefi", 2)
-        if len(crefi_machines) > 0:
-            self._transfer_files_to_machines(crefi_machines, crefi_spath,
-                                             crefi_dpath)
+        return self.redant.logger
 
-            cmd = f"sh {crefi_dpath}"
-            self.redant.execute_abstract_op_multinode(cmd, crefi_machines)
+    def _prepare_nodes(self, nodes: list):
+        """
+        Deploy the I/O scripts to the nodes and install the prerequisite
+        tools missing on them, on all the nodes at once. A node gets a
+        single command probing for the tools and reading its manifest.
+        Only the scripts changed since the last deployment are sent, as
+        one bundle over one SFTP session, and a single command unpacks
+        it and runs the installs.
+        """
+        cwd = os.getcwd()
+        paths = {script: f"{cwd}/tools/scripts/{script}"
+                 for script in self.scripts}
+        for (_, _, installer) in self.packages:
+            paths[installer] = f"{cwd}/tools/pre-req_scripts/{installer}"
+        hashes = file_hashes(paths)
+
+        probe_steps = [f"mkdir -p {self.script_dir}"]
+        for (package, _, _) in self.packages:
+            probe_steps.append(f"{package} >/dev/null 2>&1; echo $?")
+        probe_steps.append(f"cat {self.script_dir}/{manifest_name} "
+                           "2>/dev/null; true")
+        probes = self.redant.execute_abstract_op_pernode(
+            {node: "; ".join(probe_steps) for node in nodes}, True,
+            self.timer, "setup.probe_scripts")
+
+        bundle_dir = tempfile.mkdtemp(prefix="redant-scripts-")
+        remote_bundle = f"{self.script_dir}/{self.bundle_name}"
+        bundles = {}
+        uploads = {}
+        remote_cmds = {}
+        try:
+            for node in nodes:
+                lines = [line.strip() for line in probes[node]['msg']]
+                exit_codes = lines[:len(self.packages)]
+                deployed = parse_manifest(lines[len(self.packages):])
+                wanted = list(self.scripts)
+                install_steps = []
+                for ((_, code, installer), exit_code) in \
+                        zip(self.packages, exit_codes):
+                    if exit_code != str(code):
+                        wanted.append(installer)
+                        install_steps.append(
+                            f"sh {self.script_dir}/{installer}")
+                changed = [name for name in wanted
+                           if deployed.get(name) != hashes[name]]
+                steps = []
+                if changed:
+                    manifest = dict(deployed)
+                    manifest.update({name: hashes[name] for name in changed})
+                    # The nodes in the same state share the bundle.
+                    key = (tuple(changed), render_manifest(manifest))
+                    if key not in bundles:
+                        bundle_path = f"{bundle_dir}/{len(bundles)}.tar.gz"
+                        size = build_bundle(bundle_path, paths, changed,
+                                            manifest)
+                        bundles[key] = bundle_path
+                        self.redant.logger.info(
+                            f"Bundled {changed} in {size} bytes")
+                    uploads[node] = [(bundles[key], remote_bundle)]
+                    steps.append(f"tar -xzf {remote_bundle} -C "
+                                 f"{self.script_dir} && rm -f "
+                                 f"{remote_bundle}")
+                else:
+                    self.redant.logger.info(f"Scripts up to date on {node}")
+                steps.extend(install_steps)
+                if steps:
+                    remote_cmds[node] = " && ".join(steps)
+
+            if uploads:
+                with concurrent.futures.ThreadPoolExecutor(
+                        max_workers=len(uploads)) as executor:
+                    futures = [executor.submit(self._copy_to_node, node,
+                                               files)
+                               for (node, files) in uploads.items()]
+                    for future in futures:
+                        future.result()
+        finally:
+            shutil.rmtree(bundle_dir, ignore_errors=True)
+
+        if remote_cmds:
+            self.redant.execute_abstract_op_pernode(remote_cmds, True,
+                                                    self.timer,
+                                                    "setup.install_scripts")
+
+    def _copy_to_node(self, node: str, files: list):
+        """
+        Transfer the files to a node over one SFTP session.
+        """
+        start = time.time()
+        self.redant.logger.info(f'Copying files to {node}')
+        self.redant.transfer_files_from_local(files, node)
+        self.timer.add("setup.copy_scripts", start, node)
+
+    def _log_timeline(self):
+        """
+        Log the timeline of the set up or the tear down, the phases run
+        on the nodes being grouped under their node.
+        """
+        timeline = self.timer.timeline()
+        by_node = {}
+        for phase in timeline:
+            by_node.setdefault(phase.get('node', 'cluster'), []).append(phase)
+        for node in sorted(by_node, key=lambda node: (node != 'cluster',
+                                                      node)):
+            phases = by_node[node]
+            steps = ", ".join(f"{phase['phase']} at {phase['offset']:.2f}s "
+                              f"for {phase['duration']:.2f}s"
+                              for phase in sorted(
+                                  phases, key=lambda phase: phase['offset']))
+            self.redant.logger.info(f"Timeline of {node} : {steps}")
+        if timeline:
+            total = max(phase['offset'] + phase['duration']
+                        for phase in timeline)
+            self.redant.logger.info(f"Took {total:.2f}s in all")
 
     def setup_env(self, keep_logs):
         """
         Setting up of the environment before the TC execution begins.
+        The scripts don't depend on gluster, hence the nodes get them
+        while the cluster is set up.
         """
-        # invoke the hard reset or hard terminate.
         self.spinner.start("Setting up environment")
-        self.redant.hard_terminate(self.server_list, self.client_list,
-                                   self.brick_root)
-        if not keep_logs:
-            self.redant.delete_glusterfs_logs(self.server_list,
-                                              self.client_list)
-        else:
-            self.redant.logger.debug("Not clearing the old glusterfs logs")
+        self.timer = PhaseTimer()
+        total_nodes = list(set(self.client_list + self.server_list))
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
         try:
-            self.redant.start_glusterd(self.server_list)
-            self.redant.create_cluster(self.server_list)
-            self.redant.wait_till_all_peers_connected(self.server_list)
-            self._check_and_copy_scripts()
-            self._check_and_install_scripts()
+            prepared = executor.submit(self._prepare_nodes, total_nodes)
+            # invoke the hard reset or hard terminate.
+            with self.timer.phase("setup.hard_terminate"):
+                self.redant.hard_terminate(self.server_list,
+                                           self.client_list,
+                                           self.brick_root, self.timer)
+            if not keep_logs:
+                with self.timer.phase("setup.delete_logs"):
+                    self.redant.delete_glusterfs_logs(self.server_list,
+                                                      self.client_list)
+            else:
+                self.redant.logger.debug("Not clearing the old glusterfs "
+                                         "logs")
+            with self.timer.phase("setup.start_glusterd"):
+                self.redant.start_glusterd(self.server_list)
+            with self.timer.phase("setup.create_cluster"):
+                self.redant.create_cluster(self.server_list)
+                self.redant.wait_till_all_peers_connected(self.server_list)
+            with self.timer.phase("setup.wait_scripts"):
+                prepared.result()
+            self._log_timeline()
             self.redant.logger.info("Environment setup success.")
             self.spinner.succeed("Environment setup successful.")
         except Exception as error:
@@ -180,6 +257,8 @@ class environ:
             self.redant.logger.error(tb)
             self.spinner.fail("Environment setup failed.")
             sys.exit(0)
+        finally:
+            executor.shutdown()
 
     def teardown_env(self):
         """
@@ -187,9 +266,14 @@ class environ:
         ends.
         """
         self.spinner.start("Tearing down environment.")
+        self.timer = PhaseTimer()
         try:
-            self.redant.hard_terminate(self.server_list, self.client_list,
-                                       self.brick_root)
+            with self.timer.phase("teardown.hard_terminate"):
+                self.redant.hard_terminate(self.server_list,
+                                           self.client_list,
+                                           self.brick_root, self.timer)
+            self.redant.deconstruct_connection(purge=True)
+            self._log_timeline()
             self.redant.logger.info("Environment teardown success.")
             self.spinner.succeed("Tearing down successful.")
         except Exception as error:
@@ -199,10 +283,195 @@ class environ:
             self.spinner.fail("Environment Teardown failed.")
 
 
+def _state_change(method):
+    """
+    Mark a method of the FrameworkEnv which changes the state. The change
+    is made by the store, which publishes it as a new snapshot, or on a
+    model, whose state it replaces. The snapshot changed is left as it
+    is, the change being made on a state which shares the parts it
+    doesn't touch, and a change which raises leaves the state as it was.
+    The arguments are copied, hence the caller may go on changing them.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        (args, kwargs) = copy.deepcopy((args, kwargs))
+        if self._store is not None:
+            return self._store.apply(method.__name__, args, kwargs)
+        snapshot = self._state
+        self._state = {part: _CopyOnWrite(value)
+                       for (part, value) in snapshot.items()}
+        try:
+            ret = method(self, *args, **kwargs)
+        except BaseException:
+            self._state = snapshot
+            raise
+        self._state = {part: dict(value)
+                       for (part, value) in self._state.items()}
+        return ret
+    return wrapper
+
+
+class _CopyOnWrite(dict):
+    """
+    A part of the state being changed. It holds the entries of the
+    snapshot and copies an entry the first time it is indexed, so that a
+    change copies only the volumes or the snapshots it touches.
+    """
+
+    def __init__(self, shared: dict):
+        super().__init__(shared)
+        self._copied = set()
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        if key not in self._copied:
+            value = copy.deepcopy(value)
+            self[key] = value
+        return value
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._copied.add(key)
+
+    def get(self, key, default=None):
+        if key not in self:
+            return default
+        return self[key]
+
+
+def _read_only(value):
+    """
+    A read only view of a part of a snapshot, its dicts and lists being
+    wrapped and the rest being returned as is.
+    """
+    if isinstance(value, dict):
+        return _ReadOnlyDict(value)
+    if isinstance(value, list):
+        return _ReadOnlyList(value)
+    return value
+
+
+class _ReadOnlyDict(Mapping):
+    """
+    A read only view of a dict of a snapshot. A deep copy of it is a
+    plain dict, which the caller may change.
+    """
+
+    __slots__ = ('_data',)
+
+    def __init__(self, data: dict):
+        self._data = data
+
+    def __getitem__(self, key):
+        return _read_only(self._data[key])
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return repr(self._data)
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(self._data, memo)
+
+
+class _ReadOnlyList(Sequence):
+    """
+    A read only view of a list of a snapshot. A deep copy of it is a
+    plain list, which the caller may change.
+    """
+
+    __slots__ = ('_data',)
+
+    def __init__(self, data: list):
+        self._data = data
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return _ReadOnlyList(self._data[index])
+        return _read_only(self._data[index])
+
+    def __len__(self):
+        return len(self._data)
+
+    def __eq__(self, other):
+        if isinstance(other, _ReadOnlyList):
+            other = other._data
+        if not isinstance(other, list):
+            return NotImplemented
+        return self._data == other
+
+    def __repr__(self):
+        return repr(self._data)
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(self._data, memo)
+
+
+class EnvStore:
+    """
+    The store holding the state of a FrameworkEnv as versioned snapshots.
+    A snapshot is never changed, a change is made on a copy of the parts
+    of the latest snapshot it touches, which then replaces it. The
+    version is kept in shared memory so that a process can check for a
+    newer snapshot without asking the store.
+    """
+
+    def __init__(self, state: dict = None):
+        if state is None:
+            state = {'volds': {}, 'clusteropt': {}, 'snapm': {}}
+        self.state = state
+        self.counter = RawValue('Q', 0)
+        self.lock = threading.Lock()
+
+    def apply(self, name: str, args: tuple, kwargs: dict):
+        """
+        Make a change to the state.
+        Args:
+            name (str): The FrameworkEnv method making the change.
+            args (tuple): Its positional arguments.
+            kwargs (dict): Its keyword arguments.
+        Returns:
+            The return value of the method.
+        """
+        with self.lock:
+            model = FrameworkEnv.model(self.state)
+            ret = getattr(model, name)(*args, **kwargs)
+            self.state = model._state
+            self.counter.value += 1
+        return ret
+
+    def snapshot(self) -> tuple:
+        """
+        Returns:
+            tuple: The version and the state of the latest snapshot.
+        """
+        with self.lock:
+            return (self.counter.value, self.state)
+
+
+class EnvManager(BaseManager):
+    """
+    The manager process serving the store of a shared FrameworkEnv.
+    """
+
+
 class FrameworkEnv:
     """
     A class for handling the framework environemnt details. This won't
     affect the environment directly. It is more of a data store.
+
+    The state is read from a snapshot of the store, which is refreshed
+    only when a newer version exists. A snapshot is never changed : the
+    changes are made through the methods meant for them, which copy the
+    parts they touch, and the getters return read only views of the
+    snapshot, which stay as they are whatever changes follow. A deep copy
+    of a view is a plain dict or list the caller may change. The lookups
+    return copies. When the state is shared, the store lives in a manager
+    process and the test processes forked later see the same state.
     """
 
     __instance = None
@@ -220,7 +489,129 @@ class FrameworkEnv:
             raise Exception("Singleton class can have only one Instance.")
         else:
             FrameworkEnv.__instance = self
+        self._manager = None
+        self._use_store(EnvStore())
+
+    @classmethod
+    def model(cls, state: dict):
+        """
+        Method to obtain a bare object over the given state, on which the
+        store makes the changes.
+        """
+        model = cls.__new__(cls)
+        model._store = None
+        model._state = state
+        model._index = (None, None)
+        return model
+
+    def _use_store(self, store, counter=None):
+        self._store = store
+        self._index = (None, None)
+        self._counter = store.counter if counter is None else counter
+        (self._version, self._state) = store.snapshot()
 
+    def _view(self) -> dict:
+        """
+        The latest snapshot, fetched from the store only if it changed.
+        """
+        if self._store is not None and self._version != self._counter.value:
+            (self._version, self._state) = self._store.snapshot()
+        return self._state
+
+    def _indexes(self) -> dict:
+        """
+        The reverse lookups of the latest snapshot. They are built on the
+        first lookup after a change and used till the next change.
+        Returns:
+            dict: {
+                    'bricks': {"node:brickpath": volname},
+                    'brick_lists': {volname: ["node:brickpath", ...]},
+                    'node_volumes': {node: [volnames]},
+                    'client_mounts': {client: [{"volname": volname,
+                                                "mountpath": path}]},
+                    'snap_mounts': {snapname: ["client:path", ...]}
+                  }
+        """
+        state = self._view()
+        (indexed_state, indexes) = self._index
+        if indexed_state is state:
+            return indexes
+        indexes = {'bricks': {}, 'brick_lists': {}, 'node_volumes': {},
+                   'client_mounts': {}, 'snap_mounts': {}}
+        for (volname, vol_dict) in state['volds'].items():
+            brick_list = []
+            for (node, bricks) in vol_dict['brickdata'].items():
+                if bricks:
+                    indexes['node_volumes'].setdefault(node, []).append(
+                        volname)
+                for brick in bricks:
+                    brick = f"{node}:{brick}"
+                    brick_list.append(brick)
+                    indexes['bricks'][brick] = volname
+            indexes['brick_lists'][volname] = brick_list
+            for (client, mnts) in vol_dict['mountpath'].items():
+                for mnt in mnts:
+                    indexes['client_mounts'].setdefault(client, []).append(
+                        {"volname": volname, "mountpath": mnt})
+        for (snapname, snap_dict) in state['snapm'].items():
+            indexes['snap_mounts'][snapname] = [
+                f"{client}:{mnt}" for (client, mnts) in snap_dict.items()
+                for mnt in mnts]
+        self._index = (state, indexes)
+        return indexes
+
+    @property
+    def volds(self) -> dict:
+        return self._view()['volds']
+
+    @volds.setter
+    def volds(self, value: dict):
+        self._state['volds'] = value
+
+    @property
+    def clusteropt(self) -> dict:
+        return self._view()['clusteropt']
+
+    @clusteropt.setter
+    def clusteropt(self, value: dict):
+        self._state['clusteropt'] = value
+
+    @property
+    def snapm(self) -> dict:
+        return self._view()['snapm']
+
+    @snapm.setter
+    def snapm(self, value: dict):
+        self._state['snapm'] = value
+
+    def share(self):
+        """
+        Method to move the state into a manager process so that the
+        processes forked afterwards share it. To be called before forking
+        the processes which run the tests.
+        """
+        if self._manager is not None:
+            return
+        store = self._store
+        EnvManager.register('get_store', callable=lambda: store,
+                            exposed=('apply', 'snapshot'))
+        self._manager = EnvManager()
+        self._manager.start()
+        self._use_store(self._manager.get_store(), store.counter)
+
+    def unshare(self):
+        """
+        Method to bring the shared state back into the process and stop
+        the manager process, once the processes sharing it are done.
+        """
+        if self._manager is None:
+            return
+        (_, state) = self._store.snapshot()
+        self._use_store(EnvStore(state))
+        self._manager.shutdown()
+        self._manager = None
+
+    @_state_change
     def init_ds(self):
         """
         Method to handle the creation of data structures to store the
@@ -240,6 +631,7 @@ class FrameworkEnv:
         if volname not in self.volds.keys():
             raise Exception(f"No such volume called {volname}")
 
+    @_state_change
     def set_new_volume(self, volname: str, brickdata: dict):
         """
         Add a new volume when created to volds.
@@ -258,6 +650,7 @@ class FrameworkEnv:
                                            "redundancy_count": 0,
                                            "transport": ""}}
 
+    @_state_change
     def reset_ds(self):
         """
         Method to reset the DSs.
@@ -286,6 +679,7 @@ class FrameworkEnv:
             return True
         return False
 
+    @_state_change
     def remove_volume_data(self, volname: str):
         """
         Removing a volume's data from the volds.
@@ -295,6 +689,17 @@ class FrameworkEnv:
         self._validate_volname(volname)
         del self.volds[volname]
 
+    @_state_change
+    def add_volume_data(self, volname: str, vol_dict: dict):
+        """
+        Adding the data of a volume set up elsewhere, as a volume leased
+        from the volume pool, to the volds.
+        Args:
+            volname (str)
+            vol_dict (dict): The volds entry of the volume.
+        """
+        self.volds[volname] = vol_dict
+
     def get_volume_dict(self, volname: str) -> dict:
         """
         Get the volume dictionary for requested volume.
@@ -304,7 +709,7 @@ class FrameworkEnv:
             volds dictionary specific to given volume.
         """
         self._validate_volname(volname)
-        return self.volds[volname]
+        return _read_only(self.volds[volname])
 
     def get_volds(self) -> dict:
         """
@@ -312,8 +717,9 @@ class FrameworkEnv:
         Returns:
             volds dictionary as a whole.
         """
-        return copy.deepcopy(self.volds)
+        return _read_only(self.volds)
 
+    @_state_change
     def set_vol_type(self, volname: str, voltype_dict: dict):
         """
         Modify volds voltype based on voltype_dict.
@@ -325,6 +731,7 @@ class FrameworkEnv:
         for (volt_key, volt_val) in list(voltype_dict.items()):
             self.volds[volname]['voltype'][volt_key] = volt_val
 
+    @_state_change
     def set_vol_type_param(self, volname: str, voltype_key: str,
                            delta_value: int):
         """
@@ -378,6 +785,7 @@ class FrameworkEnv:
                 return True
         return False
 
+    @_state_change
     def add_new_mountpath(self, volname: str, node: str, path: str):
         """
         Add a new mountpath for given volume and client node.
@@ -393,6 +801,7 @@ class FrameworkEnv:
         if path not in list(self.volds[volname]['mountpath'][node]):
             self.volds[volname]['mountpath'][node].append(path)
 
+    @_state_change
     def add_new_snap_mountpath(self, snapname: str, node: str, path: str):
         """
         Add a new mountpath for given snapshot.
@@ -409,6 +818,7 @@ class FrameworkEnv:
 
         self.snapm[snapname][node].append(path)
 
+    @_state_change
     def remove_mountpath(self, volname: str, node: str, path: str):
         """
         Removes the mountpath entries under a client node for a
@@ -424,6 +834,7 @@ class FrameworkEnv:
         else:
             self.volds[volname]['mountpath'][node].remove(path)
 
+    @_state_change
     def remove_snap_mountpath(self, snapname: str = None, node: str = None,
                               path: str = None):
         """
@@ -469,12 +880,12 @@ class FrameworkEnv:
             dictionary of mountpoints for a given snap(s) or empty dict.
         """
         if snapname is None:
-            return copy.deepcopy(self.snapm)
+            return _read_only(self.snapm)
         if snapname not in self.snapm.keys():
             return {}
-        return copy.deepcopy(self.snapm[snapname])
+        return _read_only(self.snapm[snapname])
 
-    def get_snap_mnt_dict_simplified(self, snapname: str = None) -> list:
+    def get_snap_mnt_dict_simplified(self, snapname: str = None) -> dict:
         """
         Method to obtain the snap data as a dictionary wherein keys
         correspond to the snapname and the list is client:path string.
@@ -486,25 +897,23 @@ class FrameworkEnv:
         Returns:
             dictionary of snapname-> list of string of client:path relation.
         """
-        temp_dict = {}
-        if snapname is not None:
-            if snapname not in self.snapm.keys():
-                return temp_dict
-            temp_list = []
-            for (client, mnts) in self.snapm[snapname].items():
-                for mnt in mnts:
-                    val = f"{client}:{mnt}"
-                    temp_list.appen(val)
-            temp_dict[snapname] = temp_list
-            return temp_dict
-        for snap in self.snapm.keys():
-            temp_list = []
-            for (client, mnts) in self.snapm[snap].items():
-                for mnt in mnts:
-                    val = f"{client}:{mnt}"
-                    temp_list.append(val)
-            temp_dict[snapname] = temp_list
-        return temp_dict
+        snap_mounts = self._indexes()['snap_mounts']
+        if snapname is None:
+            return {snap: list(mnts) for (snap, mnts) in snap_mounts.items()}
+        if snapname not in snap_mounts:
+            return {}
+        return {snapname: list(snap_mounts[snapname])}
+
+    def get_snap_mounts(self, snapname: str) -> list:
+        """
+        Method to obtain the mounts of a snapshot.
+        Arg:
+            snapname (str)
+        Returns:
+            list of client:path strings, empty if the snapshot isn't
+            mounted.
+        """
+        return list(self._indexes()['snap_mounts'].get(snapname, []))
 
     def get_mnt_pts_dict_in_list(self, volname: str) -> list:
         """
@@ -519,12 +928,8 @@ class FrameworkEnv:
 
         mnt_list = []
         for (client, mnts) in list(self.volds[volname]['mountpath'].items()):
-            temp_dict = {}
             for mnt in mnts:
-                temp_dict["client"] = client
-                temp_dict["mountpath"] = mnt
-                copy_dict = copy.deepcopy(temp_dict)
-                mnt_list.append(copy_dict)
+                mnt_list.append({"client": client, "mountpath": mnt})
 
         return mnt_list
 
@@ -542,13 +947,14 @@ class FrameworkEnv:
         if node is None:
             mount_point_list = []
             for (_, mnt_pts) in list(self.volds[volname]['mountpath'].items()):
-                mount_point_list.append(mnt_pts)
+                mount_point_list.append(_read_only(mnt_pts))
             return mount_point_list
         elif node not in self.volds[volname]['mountpath'].keys():
             raise KeyError
         else:
-            return self.volds[volname]['mountpath'][node]
+            return _read_only(self.volds[volname]['mountpath'][node])
 
+    @_state_change
     def add_bricks_to_brickdata(self, volname: str, brick_dict: dict):
         """
         Method to add new set of bricks into the existing brick
@@ -564,6 +970,7 @@ class FrameworkEnv:
                 self.volds[volname]['brickdata'][node] = []
             self.volds[volname]['brickdata'][node].extend(brick_dict[node])
 
+    @_state_change
     def set_brickdata(self, volname: str, brick_dict: dict):
         """
         Method will replace the existing brickdict of a volume with
@@ -576,6 +983,7 @@ class FrameworkEnv:
         self._validate_volname(volname)
         self.volds[volname]['brickdata'] = brick_dict
 
+    @_state_change
     def remove_bricks_from_brickdata(self, volname: str, brick_data: dict):
         """
         Method to remove the brick brickdata
@@ -583,9 +991,16 @@ class FrameworkEnv:
         self._validate_volname(volname)
 
         for node in brick_data:
-            for brick in brick_data[node]:
-                self.volds[volname]["brickdata"][node].remove(brick)
-
+            node_bricks = self.volds[volname]["brickdata"][node]
+            removed = set(brick_data[node])
+            missing = removed.difference(node_bricks)
+            if missing:
+                raise ValueError(f"Bricks {missing} of {node} not in"
+                                 f" {volname}")
+            node_bricks[:] = [brick for brick in node_bricks
+                              if brick not in removed]
+
+    @_state_change
     def replace_brick_from_brickdata(self, volname: str, src_brick: str,
                                      dest_brick: str):
         """
@@ -611,7 +1026,7 @@ class FrameworkEnv:
             dictionary of nodes and their list of bricks.
         """
         self._validate_volname(volname)
-        return self.volds[volname]['brickdata']
+        return _read_only(self.volds[volname]['brickdata'])
 
     def get_all_bricks_list(self, volname: str) -> list:
         """
@@ -623,14 +1038,39 @@ class FrameworkEnv:
         Returns:
             List of bricks
         """
-        brick_dict = self.get_brickdata(volname)
-        brick_list = []
-        for server in brick_dict:
-            for brick in brick_dict[server]:
-                brick = f"{server}:{brick}"
-                brick_list.append(brick)
+        self._validate_volname(volname)
+        return list(self._indexes()['brick_lists'][volname])
+
+    def get_brick_volume(self, brick: str) -> str:
+        """
+        Method to obtain the volume a brick is part of.
+        Args:
+            brick (str): The brick as node:brickpath.
+        Returns:
+            Name of the volume, or None if no volume has the brick.
+        """
+        return self._indexes()['bricks'].get(brick)
 
-        return brick_list
+    def get_node_volumes(self, node: str) -> list:
+        """
+        Method to obtain the volumes having bricks on a node.
+        Args:
+            node (str)
+        Returns:
+            list of volume names.
+        """
+        return list(self._indexes()['node_volumes'].get(node, []))
+
+    def get_client_mounts(self, client: str) -> list:
+        """
+        Method to obtain the volume mounts on a client.
+        Args:
+            client (str)
+        Returns:
+            list of dictionaries with the volname and the mountpath.
+        """
+        return [dict(mount) for mount in
+                self._indexes()['client_mounts'].get(client, [])]
 
     def get_brick_list(self, volname: str, node: str) -> list:
         """
@@ -647,8 +1087,9 @@ class FrameworkEnv:
         if node not in self.volds[volname]['brickdata'].keys():
             raise KeyError
         else:
-            return self.volds[volname]['brickdata'][node]
+            return _read_only(self.volds[volname]['brickdata'][node])
 
+    @_state_change
     def set_volume_start_status(self, volname: str, state: bool):
         """
         Method to set the volume start status to true or false.
@@ -670,6 +1111,7 @@ class FrameworkEnv:
         self._validate_volname(volname)
         return self.volds[volname]['started']
 
+    @_state_change
     def set_vol_option(self, volname: str, options_dict: dict):
         """
         Method to set a volume option for said volume
@@ -684,6 +1126,7 @@ class FrameworkEnv:
         for (opt, opt_val) in list(options_dict.items()):
             self.volds[volname]['options'][opt] = opt_val
 
+    @_state_change
     def set_vol_options_all(self, option_dict: dict):
         """
         Method to set a said cluster options.
@@ -693,6 +1136,7 @@ class FrameworkEnv:
         for (key, value) in option_dict.items():
             self.clusteropt[key] = value
 
+    @_state_change
     def reset_vol_options_all(self, option_list: list):
         """
         Method to remove a cluster option.
@@ -711,7 +1155,7 @@ class FrameworkEnv:
             Dictionary
         """
         self._validate_volname(volname)
-        return copy.deepcopy(self.volds[volname]['options'])
+        return _read_only(self.volds[volname]['options'])
 
     def get_vol_options_all(self) -> dict:
         """
@@ -719,7 +1163,7 @@ class FrameworkEnv:
         Returns:
             dict
         """
-        return self.clusteropt
+        return _read_only(self.clusteropt)
 
     def is_volume_options_populated(self, volname: str) -> bool:
         """
@@ -746,6 +1190,7 @@ class FrameworkEnv:
             for opt in list(self.volds[volname]['options']):
                 del self.volds[volname]['options'][opt]
 
+    @_state_change
     def reset_volume_option(self, volname: str, option: str):
         """
         Method to handle the reseting of the volume options
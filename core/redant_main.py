@@ -16,8 +16,11 @@ from environ import environ, FrameworkEnv
 from parsing.params_handler import ParamsHandler
 from test_list_builder import TestListBuilder
 from test_runner import TestRunner
+from cluster_runner import ClusterRunner
 from result_handler import handle_results
+from results_ledger import ResultsLedger
 from common.relog import Logger
+from common.rexe import Rexe
 sys.path.insert(1, ".")
 sys.path.insert(1, "./common")
 
@@ -30,8 +33,10 @@ def pars_args():
     parser = argparse.ArgumentParser(
         description='Redant test framework main script.')
     parser.add_argument("-c", "--config",
-                        help="Config file(s) to read.",
-                        action="store", dest="config_file",
+                        help="Config file(s) to read. With more than one "
+                        "config, the tests are sharded across the clusters "
+                        "of the configs and run on them in parallel.",
+                        nargs="+", dest="config_file",
                         default=None, type=str, required=True)
     parser.add_argument("-t", "--test-dir",
                         help="The test directory where TC(s) exist",
@@ -57,9 +62,50 @@ def pars_args():
                         "during environment setup. Default behavior is to "
                         "clear the logs directory on each run.",
                         dest="keep_logs", action='store_true')
+    parser.add_argument("-em", "--exec-mode",
+                        help="Remote command execution mode. 'channel' "
+                        "opens a new SSH channel per command and 'mux' "
+                        "runs the commands through one long lived agent "
+                        "per node. Default is channel.",
+                        dest="exec_mode", default="channel",
+                        choices=Rexe.valid_exec_modes, type=str)
+    parser.add_argument("-dh", "--duration-history",
+                        help="JSON file with the test durations of the "
+                        "earlier runs, used to order the non disruptive "
+                        "tests and updated after the run. Default is "
+                        "test_durations.json in the log directory.",
+                        dest="duration_history", default=None, type=str)
+    parser.add_argument("-rf", "--rerun-failed",
+                        help="Run only the tests which failed or were "
+                        "skipped in an earlier run, as recorded in its "
+                        "results ledger. Takes the name of a run directory "
+                        "in the log directory, a run directory or a ledger "
+                        "file. Default is the latest run.",
+                        dest="rerun_failed", nargs="?", const="latest",
+                        default=None, type=str)
+    parser.add_argument("-mf", "--max-failures",
+                        help="Skip the remaining tests once this many tests "
+                        "have failed.",
+                        dest="max_failures", default=None, type=int)
+    parser.add_argument("-vp", "--volume-pool",
+                        help="Build the volume of the next disruptive test "
+                        "between the tests, for the tests which don't set "
+                        "up their own volume.",
+                        dest="volume_pool", action='store_true')
     return parser.parse_args()
 
 
+def _handle_results(args, results: list, total_time: float, logger_obj):
+    """
+    Function to present the results on the CLI or in the spreadsheet.
+    """
+    if args.excel_sheet is None:
+        handle_results(results, total_time, logger_obj)
+    else:
+        handle_results(results, total_time, logger_obj,
+                       args.excel_sheet)
+
+
 def main():
     """
     Invocation order being.
@@ -84,11 +130,15 @@ def main():
 
     spinner = Halo(spinner='dots')
     spinner.start("Starting param handling")
-    try:
-        param_obj = ParamsHandler(args.config_file)
-    except OSError as e:
-        spinner.fail("error in param handling")
-        errer(e, "Error on loading config file: {exc}")
+    param_objs = []
+    for config_file in args.config_file:
+        try:
+            param_objs.append(ParamsHandler(config_file))
+        except OSError as e:
+            spinner.fail("error in param handling")
+            errer(e, "Error on loading config file: {exc}")
+    # The test list is built from the first config.
+    param_obj = param_objs[0]
     spinner.succeed("Param Handling Success.")
 
     spinner.start("Building test list")
@@ -103,10 +153,24 @@ def main():
                  and args.test_dir.split("/")[-1].startswith("test"))
     try:
         TestListBuilder.create_test_dict(args.test_dir, excluded_tests,
-                                         param_obj.volume_types, spec_test)
+                                         param_obj.volume_types, spec_test,
+                                         f"{args.log_dir}/test_index.json")
     except FileNotFoundError as e:
         spinner.fail("FileNotFoundError in test list builder")
         errer(e, "Error: Can't find the file")
+    if args.rerun_failed is not None:
+        # Resolved before the latest link moves to this run.
+        try:
+            ledger_path = ResultsLedger.find(args.log_dir, args.rerun_failed)
+        except FileNotFoundError as e:
+            spinner.fail("No results of the run to rerun")
+            errer(e)
+        selected = ResultsLedger.tests_to_rerun(
+            ResultsLedger.load(ledger_path))
+        TestListBuilder.retain_tests(selected)
+        count = sum(len(vol_types) for vol_types in selected.values())
+        spinner.info(f"Rerunning {count} failed or skipped test runs "
+                     f"of {ledger_path}")
     spinner.succeed("Test List built")
 
     spinner.start("Creating log dirs")
@@ -121,6 +185,34 @@ def main():
     os.rename(tmplink, f"{args.log_dir}/{latest}")
     spinner.succeed("Log dir creation successful.")
 
+    # Remote execution mode, inherited by the worker processes.
+    Rexe.set_exec_mode(args.exec_mode)
+
+    ledger = ResultsLedger(f"{log_dir_current}/{ResultsLedger.file_name}")
+
+    duration_history = args.duration_history
+    if duration_history is None:
+        duration_history = f"{args.log_dir}/test_durations.json"
+
+    if len(param_objs) > 1:
+        # Every cluster is set up, run and torn down by a process of its
+        # own, logging to main-<index>.log.
+        main_logger = Logger("redant")
+        main_logger.init_logger("redant", f"{log_dir_current}/main.log",
+                                args.log_level)
+        logger_obj = main_logger.logger
+        logger_obj.debug(f"Sharding the tests across {len(param_objs)} "
+                         "clusters.")
+        ClusterRunner.init(TestListBuilder, param_objs, log_dir_current,
+                           args.log_level, args.concur_count, spec_test,
+                           duration_history, logger_obj, ledger,
+                           args.max_failures, args.volume_pool)
+        results = ClusterRunner.run_tests(errer, args.keep_logs)
+        ledger.close()
+        logger_obj.debug("Collected test results.")
+        _handle_results(args, results, time.time() - start, logger_obj)
+        return
+
     # Framework Environment datastructure.
     env_obj = FrameworkEnv()
     env_obj.init_ds()
@@ -134,20 +226,23 @@ def main():
 
     # invoke the test_runner.
     logger_obj.debug("Running the test cases.")
+    volume_pool_log = None
+    if args.volume_pool:
+        volume_pool_log = f"{log_dir_current}/volume_pool.log"
     TestRunner.init(TestListBuilder, param_obj, env_set, log_dir_current,
-                    args.log_level, args.concur_count, spec_test)
-    result_queue = TestRunner.run_tests(env_obj)
-    logger_obj.debug("Collected test results queue.")
+                    args.log_level, args.concur_count, spec_test,
+                    duration_history, ledger=ledger,
+                    max_failures=args.max_failures,
+                    volume_pool_log=volume_pool_log)
+    results = TestRunner.run_tests(env_obj)
+    ledger.close()
+    logger_obj.debug("Collected test results.")
 
     # Environment cleanup. TBD.
     total_time = time.time() - start
 
     # Setup the result
-    if args.excel_sheet is None:
-        handle_results(result_queue, total_time, logger_obj)
-    else:
-        handle_results(result_queue, total_time, logger_obj,
-                       args.excel_sheet)
+    _handle_results(args, results, total_time, logger_obj)
 
     logger_obj.debug("Starting env teardown.")
     env_set.teardown_env()
@@ -11,6 +11,10 @@ import xlwt
 from xlwt import Workbook
 from prettytable import PrettyTable
 
+# Columns of the phase timing table.
+phaseTopicList = ['Phase', 'Tests', 'Total (sec)', 'Mean (sec)',
+                  'Max (sec)', 'Commands', 'Output Bytes']
+
 
 def _sanitize_time_format(data: int) -> str:
     """
@@ -83,12 +87,12 @@ def _time_rollover_conversion(time_in_sec: float,
     return f"{hours} hours {minutes} minutes {seconds} seconds"
 
 
-def _transform_queue_to_dict(resultQueue) -> dict:
+def _transform_results_to_dict(resultList: list) -> dict:
     """
-    Function to transform the queue to a dictionary.
+    Function to transform the results to a dictionary.
 
     Args:
-        resultQueue: It is a queue containing the test run results.
+        resultList: It is a list containing the test run results.
 
     Returns:
         A dictionary with classification of tests based on,
@@ -97,8 +101,7 @@ def _transform_queue_to_dict(resultQueue) -> dict:
         3. Test Name
     """
     testResults = {}
-    while not resultQueue.empty():
-        testDict = resultQueue.get()
+    for testDict in resultList:
         tName = list(testDict.keys())[0]
         component = testDict[tName]['component']
         tcNature = testDict[tName]['tcNature']
@@ -235,6 +238,59 @@ def _transform_to_percent(statDict: dict) -> dict:
     return tStatDict
 
 
+def _aggregate_phases(resultList: list) -> dict:
+    """
+    Function to aggregate the phase timelines of the tests.
+
+    Args:
+        resultList: It is a list containing the test run results.
+
+    Returns:
+        A dictionary of the phases, each with the count of the tests
+        having it, the total and the max time taken, and the remote
+        commands run and the bytes of output received during it.
+    """
+    phaseDict = {}
+    for testDict in resultList:
+        tStats = list(testDict.values())[0]
+        for phase in tStats.get('phases', []):
+            pDict = phaseDict.setdefault(phase['phase'], {
+                'count': 0, 'total': 0, 'max': 0, 'commands': 0,
+                'bytes': 0})
+            pDict['count'] += 1
+            pDict['total'] += phase['duration']
+            pDict['max'] = max(pDict['max'], phase['duration'])
+            pDict['commands'] += phase['commands']
+            pDict['bytes'] += phase['bytes']
+    return phaseDict
+
+
+def _phase_rows(phaseDict: dict) -> list:
+    """
+    Function to obtain the rows of the phase timing table, longest
+    phase first, followed by the framework overhead, which is the time
+    of all the phases but the body of the tests.
+    """
+    rows = []
+    for phase, pDict in sorted(phaseDict.items(),
+                               key=lambda item: -item[1]['total']):
+        rows.append([phase, pDict['count'], round(pDict['total'], 2),
+                     round(pDict['total'] / pDict['count'], 3),
+                     round(pDict['max'], 3), pDict['commands'],
+                     pDict['bytes']])
+    total = sum(pDict['total'] for pDict in phaseDict.values())
+    overhead = sum(pDict['total'] for (phase, pDict) in phaseDict.items()
+                   if phase != "body")
+    if total:
+        rows.append([f"overhead ({overhead * 100 / total:.0f}%)", "",
+                     round(overhead, 2), "", "",
+                     sum(pDict['commands'] for (phase, pDict)
+                         in phaseDict.items() if phase != "body"),
+                     sum(pDict['bytes'] for (phase, pDict)
+                         in phaseDict.items() if phase != "body")])
+    return rows
+
+
 def _adjust_column_width_in_excel_sheet(sheet: dict, data_list: list,
                                         max_col_width_list: list):
     """
@@ -260,7 +316,7 @@ def _adjust_column_width_in_excel_sheet(sheet: dict, data_list: list,
 
 
 def _data_to_xls(statDict: dict, resultDict: dict, filePath: str,
-                 totalRTime: str, logger):
+                 totalRTime: str, logger, phaseDict: dict = None):
     """
     Function to prepare a spreadsheet using the data for
     results.
@@ -270,6 +326,7 @@ def _data_to_xls(statDict: dict, resultDict: dict, filePath: str,
         resultDict (dict): The dict containing the test result metadata.
         filePath (str): File path of spreadsheet.
         totalRTime (str): Total runtime of the framework.
+        phaseDict (dict): The aggregated phase timings of the tests.
     """
     # Create mapping for the keys to description to be put in the sheet.
     rMap = [
@@ -356,6 +413,20 @@ def _data_to_xls(statDict: dict, resultDict: dict, filePath: str,
                      volType, volData['testResult'], timeVal,
                      volData['skipReason']], max_col_width_list))
                     row += 1
+
+    # Populating the phase timings.
+    if phaseDict:
+        tR = wb.add_sheet('Phases')
+        max_col_width_list = [2962] * len(phaseTopicList)
+        for col, topic in enumerate(phaseTopicList):
+            tR.write(0, col, topic, style_bold_center)
+        _adjust_column_width_in_excel_sheet(tR, phaseTopicList,
+                                            max_col_width_list)
+        for row, rowData in enumerate(_phase_rows(phaseDict), 1):
+            for col, val in enumerate(rowData):
+                tR.write(row, col, val, style_center)
+            _adjust_column_width_in_excel_sheet(tR, rowData,
+                                                max_col_width_list)
     # Push the changes to the file.
     try:
         wb.save(filePath)
@@ -366,7 +437,7 @@ def _data_to_xls(statDict: dict, resultDict: dict, filePath: str,
 
 
 def _data_to_pretty_tables(statDict: dict, resultDict: dict,
-                           totalRTime: str):
+                           totalRTime: str, phaseDict: dict = None):
     """
     Function to provide the output in stdout pretty tables.
 
@@ -374,6 +445,7 @@ def _data_to_pretty_tables(statDict: dict, resultDict: dict,
         statDict (dict): The dict containing the test run numerical stats.
         resultDict (dict): The dict containing the test result metadata.
         totalRTime (str): Total runtime of the framework.
+        phaseDict (dict): The aggregated phase timings of the tests.
     """
     rMap = [
         {'dCount': 'Disruptive Tests'},
@@ -415,17 +487,23 @@ def _data_to_pretty_tables(statDict: dict, resultDict: dict,
         for key, value in subDict.items():
             totalTable.add_row([value, totalVals[key]])
     print(totalTable)
+    if phaseDict:
+        print("Phase timings")
+        phaseTable = PrettyTable(phaseTopicList)
+        for rowData in _phase_rows(phaseDict):
+            phaseTable.add_row(rowData)
+        print(phaseTable)
     totalTime = _time_rollover_conversion(totalRTime, True)
     print(f"Total Time Taken : {totalTime}")
 
 
-def handle_results(resultQueue, totalTime: float, logger,
+def handle_results(resultList: list, totalTime: float, logger,
                    filePath: str = None):
     """
     Function to handle the results for redant.
 
     Args:
-        resultQueue: It is a queue containing the test run results.
+        resultList: It is a list containing the test run results.
         totalTime: The total time taken for test case execution.
         logger: The logger object used for logging.
 
@@ -434,8 +512,8 @@ def handle_results(resultQueue, totalTime: float, logger,
         if the output format is for xls.
     """
     logger.debug("Initializing result handling.")
-    # Transform queue data to dictionary.
-    resultDict = _transform_queue_to_dict(resultQueue)
+    # Transform the results to dictionary.
+    resultDict = _transform_results_to_dict(resultList)
 
     # Obtain the statistics for further use.
     statDict = _obtain_stat(resultDict)
@@ -449,10 +527,18 @@ def handle_results(resultQueue, totalTime: float, logger,
     # Convert the pass values to percentage.
     statDict = _transform_to_percent(statDict)
 
+    # Aggregate the phase timelines of the tests.
+    phaseDict = _aggregate_phases(resultList)
+    for rowData in _phase_rows(phaseDict):
+        logger.info(f"Phase {rowData[0]} : {rowData[2]}s over "
+                    f"{rowData[1]} tests, {rowData[5]} commands, "
+                    f"{rowData[6]} bytes")
+
     # Output the result.
     if filePath is not None:
         logger.info(f"Results to be put inside : {filePath}")
-        _data_to_xls(statDict, resultDict, filePath, totalTime, logger)
+        _data_to_xls(statDict, resultDict, filePath, totalTime, logger,
+                     phaseDict)
     else:
         logger.info("Results to be put to stdout")
-        _data_to_pretty_tables(statDict, resultDict, totalTime)
+        _data_to_pretty_tables(statDict, resultDict, totalTime, phaseDict)
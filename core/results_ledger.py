@@ -0,0 +1,131 @@
+"""
+The results ledger keeps a machine readable record of a run, one JSON
+line per test result, written as the results come in, so that even an
+interrupted run leaves the results of the tests it got through. The
+ledger lives in the log directory of the run as results.jsonl, and the
+tests which failed or were skipped in a run can be picked from it to be
+run again.
+"""
+import os
+import json
+
+
+class ResultsLedger:
+    """
+    The ledger of a run. Every entry is a dict,
+        {
+          "test": name of the test,
+          "modulePath": path of the test module,
+          "volType": volume type or Generic,
+          "tcNature": nature of the test,
+          "result": PASS | FAIL | SKIP,
+          "duration": seconds taken,
+          "logPath": log file of the test
+        }
+    """
+
+    file_name = "results.jsonl"
+    # Results of a test picked by a rerun.
+    rerun_results = ("FAIL", "SKIP")
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): The ledger file, appended to.
+        """
+        self.path = path
+        self.ledger_file = None
+
+    def record(self, result: dict):
+        """
+        Append a result to the ledger.
+        Args:
+            result (dict): {test name: test stats}, as returned by the
+                           test runner.
+        """
+        (test, test_stats) = list(result.items())[0]
+        entry = {
+            "test": test,
+            "modulePath": test_stats['modulePath'],
+            "volType": test_stats['volType'],
+            "tcNature": test_stats['tcNature'],
+            "result": test_stats['testResult'],
+            "duration": round(test_stats['timeTaken'], 3),
+            "logPath": test_stats.get('logPath')
+        }
+        if self.ledger_file is None:
+            self.ledger_file = open(self.path, 'a')
+        self.ledger_file.write(f"{json.dumps(entry)}\n")
+        self.ledger_file.flush()
+
+    def close(self):
+        """
+        Close the ledger file.
+        """
+        if self.ledger_file is not None:
+            self.ledger_file.close()
+            self.ledger_file = None
+
+    @classmethod
+    def find(cls, log_dir: str, run: str) -> str:
+        """
+        Find the ledger of a run.
+        Args:
+            log_dir (str): The log directory of the runs.
+            run (str): 'latest' for the last run, the name of a run
+                       directory under the log directory, a run directory
+                       or a ledger file.
+        Returns:
+            str: The path of the ledger.
+        Raises:
+            FileNotFoundError: If the run has no ledger.
+        """
+        candidates = [run, os.path.join(run, cls.file_name),
+                      os.path.join(log_dir, run, cls.file_name)]
+        for path in candidates:
+            if os.path.isfile(path):
+                return path
+        raise FileNotFoundError(f"No results ledger for the run {run}")
+
+    @staticmethod
+    def load(path: str) -> list:
+        """
+        Read the entries of a ledger. A partly written last line, left by
+        an interrupted run, is ignored.
+        Args:
+            path (str): The ledger file.
+        Returns:
+            list: The entries in the order they were recorded.
+        """
+        entries = []
+        with open(path) as ledger_file:
+            for line in ledger_file:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue
+        return entries
+
+    @classmethod
+    def tests_to_rerun(cls, entries: list) -> dict:
+        """
+        Pick the tests to be run again, the ones whose last result in the
+        ledger is a failure or a skip. The volume creation and deletion
+        tests aren't picked as such, they are run for the volume types of
+        the picked tests anyway.
+        Args:
+            entries (list): The entries of a ledger.
+        Returns:
+            dict: Module path to the set of the volume types to run the
+                  test for.
+        """
+        last = {}
+        for entry in entries:
+            if entry['tcNature'] == 's':
+                continue
+            last[(entry['modulePath'], entry['volType'])] = entry['result']
+        selected = {}
+        for ((module_path, vol_type), result) in last.items():
+            if result in cls.rerun_results:
+                selected.setdefault(module_path, set()).add(vol_type)
+        return selected
@@ -2,7 +2,9 @@
 The thread runner is responsible for the execution of a given TC.
 """
 
+import time
 import traceback
+from common.phase_timer import PhaseTimer
 
 
 class RunnerThread:
@@ -12,10 +14,12 @@ class RunnerThread:
     functions for running it.
     """
 
-    def __init__(self, tc_class, param_obj, volume_type: str,
+    def __init__(self, tc_loader, param_obj, volume_type: str,
                  mname: str, logger_obj, env_obj, log_path: str,
-                 log_level: str):
-        # Creating the test case object from the test case.
+                 log_level: str, vol_name: str = None, volume_pool=None):
+        # Creating the test case object from the test case. The class is
+        # obtained through the loader, which imports the test module, so
+        # that a module failing to import fails the test.
         self.skip_run_thread = False
         self.logger = logger_obj
         self.tname = (f"{mname}-{volume_type}")
@@ -24,9 +28,22 @@ class RunnerThread:
             'volType': volume_type,
             'skipReason': "NA"
         }
+        self.tc_obj = None
+        self.timer = PhaseTimer()
+        start = time.time()
         try:
-            self.tc_obj = tc_class(
-                mname, param_obj, volume_type, env_obj, log_path, log_level)
+            with self.timer.phase("load"):
+                tc_class = tc_loader()
+            tc_args = (mname, param_obj, volume_type, env_obj, log_path,
+                       log_level)
+            if vol_name is None:
+                self.tc_obj = tc_class(*tc_args)
+            else:
+                # The test runs on the volume of a scheduler lane.
+                self.tc_obj = tc_class(*tc_args, vol_name=vol_name)
+            if volume_pool is not None:
+                # The disruptive test takes its volume from the pool.
+                self.tc_obj.volume_pool = volume_pool
             self.run_test_func = getattr(self.tc_obj, "parent_run_test")
             self.terminate_test_func = getattr(self.tc_obj, "terminate")
         except Exception as error:
@@ -35,12 +52,17 @@ class RunnerThread:
             self.logger.error(f"{self.tname}: {tb}")
             self.test_stats['testResult'] = [False]
             self.skip_run_thread = True
+        # The framework overhead of the test, the import of its module
+        # and the set up of its logger and connections.
+        self.test_stats['initTime'] = time.time() - start
 
     def run_thread(self):
         """
         Method to trigger the run test and the terminate test functions.
         """
         if self.skip_run_thread:
+            self._record_phases()
+            self._close_test_logger()
             return self.test_stats
 
         self.logger.info(f"Running {self.tname}")
@@ -55,4 +77,30 @@ class RunnerThread:
             self.logger.error(f"{self.tname} : {error}")
             self.logger.error(f"{self.tname} : {tb}")
             self.test_stats['testResult'] = [False]
+        self._record_phases()
+        self._close_test_logger()
         return self.test_stats
+
+    def _record_phases(self):
+        """
+        Add the phase timeline of the test, and the totals of the remote
+        commands it ran, to the test stats.
+        """
+        tc_timer = getattr(self.tc_obj, "timer", None)
+        if isinstance(tc_timer, PhaseTimer):
+            self.timer.merge(tc_timer)
+        self.test_stats['phases'] = self.timer.timeline()
+        redant = getattr(self.tc_obj, "redant", None)
+        command_stats = getattr(redant, "command_stats", None)
+        if command_stats is not None:
+            self.test_stats['commands'] = command_stats['commands']
+            self.test_stats['bytes'] = command_stats['bytes']
+
+    def _close_test_logger(self):
+        """
+        Close the log file of the test, as the worker goes on to run
+        other tests.
+        """
+        redant = getattr(self.tc_obj, "redant", None)
+        if redant is not None and hasattr(redant, "close_logger"):
+            redant.close_logger()
@@ -0,0 +1,444 @@
+"""
+The scheduler orders the non disruptive test runs using the durations
+of the earlier runs, so that the concurrent workers finish at about the
+same time.
+
+The durations are kept in a JSON file, per test module and volume type,
+as an exponentially weighted average of the recorded run times. The
+tests of a volume type run one after the other on the volume created
+for them, hence a volume type with a lot of work is split into lanes,
+each lane getting a volume of its own. The plan gives the expected
+makespan and the number of volumes to create up front per type, and the
+dispatcher then hands the work out to the idle workers as they free up,
+longest first, letting any of them run the tests of any volume type on
+a volume which is not in use. This keeps the makespan close to the
+total work divided by the number of workers.
+"""
+import os
+import json
+import math
+import statistics
+
+
+class DurationHistory:
+    """
+    The recorded durations of the tests, keyed by the module path and
+    the volume type.
+    """
+
+    # Weight of the latest run in the average.
+    alpha = 0.5
+    # Duration assumed for a test not seen in any form before.
+    default_duration = 120
+    # Duration assumed for the volume creation and deletion tests.
+    default_special_duration = 60
+
+    def __init__(self, path: str = None):
+        """
+        Args:
+            path (str): The JSON file of the history. Without it nothing
+                        is loaded or saved.
+        """
+        self.path = path
+        self.durations = {}
+        if path is not None and os.path.isfile(path):
+            try:
+                with open(path) as history_file:
+                    self.durations = json.load(history_file)['durations']
+            except (OSError, ValueError, KeyError, TypeError):
+                self.durations = {}
+
+    def record(self, module_path: str, vol_type: str, seconds: float):
+        """
+        Fold in the duration of a run.
+        Args:
+            module_path (str): Path of the test module.
+            vol_type (str): The volume type it ran on.
+            seconds (float): The time it took.
+        """
+        per_vol = self.durations.setdefault(module_path, {})
+        if vol_type in per_vol:
+            seconds = (self.alpha * seconds
+                       + (1 - self.alpha) * per_vol[vol_type])
+        per_vol[vol_type] = round(seconds, 2)
+
+    def save(self):
+        """
+        Write the history out, through a temporary file so that an
+        interrupted run doesn't leave a truncated history.
+        """
+        if self.path is None:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as history_file:
+            json.dump({'version': 1, 'durations': self.durations},
+                      history_file, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def estimate(self, module_path: str, vol_type: str,
+                 special: bool = False) -> float:
+        """
+        Expected duration of a test. For a test without a record for the
+        volume type, the fallbacks are the average over its other volume
+        types, the median of its component, the median over all the tests
+        and the default duration, in that order.
+        Args:
+            module_path (str): Path of the test module.
+            vol_type (str): The volume type it would run on.
+            special (bool): Whether it is a volume creation or deletion
+                            test.
+        Returns:
+            float: The duration in seconds.
+        """
+        per_vol = self.durations.get(module_path)
+        if per_vol:
+            if vol_type in per_vol:
+                return per_vol[vol_type]
+            return statistics.mean(per_vol.values())
+        if special:
+            return self.default_special_duration
+
+        component = os.path.dirname(module_path)
+        in_component = [seconds for (path, per_vol)
+                        in self.durations.items()
+                        if os.path.dirname(path) == component
+                        for seconds in per_vol.values()]
+        if in_component:
+            return statistics.median(in_component)
+        everything = [seconds for per_vol in self.durations.values()
+                      for seconds in per_vol.values()]
+        if everything:
+            return statistics.median(everything)
+        return self.default_duration
+
+
+def lane_vol_name(vol_type: str, lane: int) -> str:
+    """
+    Name of the volume used by a lane of a volume type. The first lane
+    keeps the usual name.
+    """
+    if lane == 0:
+        return f"redant-{vol_type}"
+    return f"redant-{vol_type}-{lane}"
+
+
+def _spread(tests: list, lane_count: int) -> list:
+    """
+    Spread the (estimate, test) pairs over the lanes, longest first onto
+    the least loaded lane.
+    """
+    lanes = [[0, []] for _ in range(lane_count)]
+    for (seconds, test) in sorted(tests, key=lambda pair: -pair[0]):
+        lane = min(lanes, key=lambda lane: lane[0])
+        lane[0] += seconds
+        lane[1].append(test)
+    return lanes
+
+
+def estimate_makespan(estimates: list, workers: int) -> float:
+    """
+    Makespan of the jobs when the workers pick them in the given order,
+    each idle worker taking the next job.
+    Args:
+        estimates (list): Durations of the jobs, in pick order.
+        workers (int): Number of workers.
+    Returns:
+        float: The time till the last job ends.
+    """
+    loads = [0] * max(workers, 1)
+    for seconds in estimates:
+        idle = loads.index(min(loads))
+        loads[idle] += seconds
+    return max(loads)
+
+
+def plan_nd_jobs(vol_tests: dict, generic_tests: list, special_tests: list,
+                 workers: int, history: DurationHistory) -> dict:
+    """
+    Plan the non disruptive stage.
+    Args:
+        vol_tests (dict): Volume type to the list of its test dicts.
+        generic_tests (list): The Generic test dicts.
+        special_tests (list): The volume creation and deletion test dicts.
+        workers (int): Number of concurrent workers.
+        history (DurationHistory): The recorded durations.
+    Returns:
+        dict: {
+                'jobs': list of the jobs, longest first. A job is either
+                        {'volType', 'lane', 'volName', 'tests', 'estimate'}
+                        for a lane, wherein the tests run between the
+                        special tests, or {'volType': 'Generic', 'tests',
+                        'estimate'} for a single Generic test,
+                'totalWork': the sum of the estimates,
+                'makespan': the expected wall clock of the stage
+              }
+    """
+    workers = max(workers, 1)
+    estimated = {}
+    for (vol_type, tests) in vol_tests.items():
+        estimated[vol_type] = [(history.estimate(test['modulePath'],
+                                                 vol_type), test)
+                               for test in tests]
+    lane_overhead = {}
+    for vol_type in vol_tests:
+        lane_overhead[vol_type] = sum(
+            history.estimate(test['modulePath'], vol_type, special=True)
+            for test in special_tests)
+    generic = [(history.estimate(test['modulePath'], "Generic"), test)
+               for test in generic_tests]
+
+    total = (sum(seconds for pairs in estimated.values()
+                 for (seconds, _) in pairs)
+             + sum(lane_overhead.values())
+             + sum(seconds for (seconds, _) in generic))
+    share = total / workers
+
+    jobs = []
+    for (vol_type, pairs) in estimated.items():
+        if not pairs:
+            continue
+        work = sum(seconds for (seconds, _) in pairs)
+        lane_count = 1
+        if share > 0:
+            lane_count = math.ceil((work + lane_overhead[vol_type]) / share)
+        lane_count = max(1, min(lane_count, workers, len(pairs)))
+        for (lane, (seconds, tests)) in enumerate(_spread(pairs,
+                                                          lane_count)):
+            jobs.append({'volType': vol_type, 'lane': lane,
+                         'volName': lane_vol_name(vol_type, lane),
+                         'tests': tests,
+                         'estimate': seconds + lane_overhead[vol_type]})
+    for (seconds, test) in generic:
+        jobs.append({'volType': "Generic", 'tests': [test],
+                     'estimate': seconds})
+
+    jobs.sort(key=lambda job: -job['estimate'])
+    estimates = [job['estimate'] for job in jobs]
+    return {'jobs': jobs, 'totalWork': sum(estimates),
+            'makespan': estimate_makespan(estimates, workers)}
+
+
+class NdDispatcher:
+    """
+    Hands out the non disruptive work to the idle workers, one task at a
+    time, from the main process. The tests of a volume type are pooled
+    and any idle worker can take one, as long as a volume of that type is
+    created, healthy and not in use by another test, so a worker which
+    is done with its own work helps with the others. A volume is
+    destroyed once the tests of its type have drained.
+
+    A task is a dict,
+        {
+          'kind': 'create' | 'test' | 'destroy' | 'generic',
+          'volType': volume type or 'Generic',
+          'lane': lane of the volume, for the volume tasks,
+          'volName': name of the volume, for the volume tasks,
+          'test': the test dict to be run
+        }
+    """
+
+    def __init__(self, plan: dict, special_tests: list, workers: int,
+                 history: DurationHistory, pin_volumes: bool = False):
+        """
+        Args:
+            plan (dict): The plan from plan_nd_jobs. Its lanes give the
+                         number of volumes created up front per type.
+            special_tests (list): The volume creation and deletion tests.
+            workers (int): Number of concurrent workers.
+            history (DurationHistory): The recorded durations.
+            pin_volumes (bool): Hand the tests and the deletion of a
+                                volume only to the worker which created
+                                it, for workers which don't share the
+                                FrameworkEnv.
+        """
+        self.special_tests = special_tests
+        self.pin_volumes = pin_volumes
+        self.workers = max(workers, 1)
+        self.pending = {}
+        self.planned_lanes = {}
+        self.generic = []
+        for job in plan['jobs']:
+            vol_type = job['volType']
+            tests = [(history.estimate(test['modulePath'], vol_type), test)
+                     for test in job['tests']]
+            if vol_type == "Generic":
+                self.generic.extend(tests)
+                continue
+            self.pending.setdefault(vol_type, []).extend(tests)
+            self.planned_lanes[vol_type] = (
+                self.planned_lanes.get(vol_type, 0) + 1)
+        for tests in list(self.pending.values()) + [self.generic]:
+            tests.sort(key=lambda pair: -pair[0])
+        self.overhead = {vol_type: sum(
+            history.estimate(test['modulePath'], vol_type, special=True)
+            for test in special_tests) for vol_type in self.pending}
+        # Volume type to {lane: 'creating'|'idle'|'busy'|'broken'|
+        # 'destroying'}.
+        self.volumes = {vol_type: {} for vol_type in self.pending}
+        # (volume type, lane) to the worker which created the volume.
+        self.owners = {}
+        self.next_lane = {vol_type: 0 for vol_type in self.pending}
+        self.abandoned = []
+        self.outstanding = 0
+
+    def _alive(self, vol_type: str) -> int:
+        return sum(1 for state in self.volumes[vol_type].values()
+                   if state in ('creating', 'idle', 'busy'))
+
+    def _remaining(self, vol_type: str) -> float:
+        return sum(seconds for (seconds, _) in self.pending[vol_type])
+
+    def _volume_task(self, kind: str, vol_type: str, lane: int) -> dict:
+        test = self.special_tests[0 if kind == 'create' else 1]
+        self.volumes[vol_type][lane] = ('creating' if kind == 'create'
+                                        else 'destroying')
+        return {'kind': kind, 'volType': vol_type, 'lane': lane,
+                'volName': lane_vol_name(vol_type, lane), 'test': test}
+
+    def _create(self, vol_type: str, worker_id: int) -> dict:
+        lane = self.next_lane[vol_type]
+        self.next_lane[vol_type] += 1
+        self.owners[(vol_type, lane)] = worker_id
+        return self._volume_task('create', vol_type, lane)
+
+    def _usable(self, vol_type: str, lane: int, worker_id: int) -> bool:
+        """
+        Whether the worker can run the tasks of the volume.
+        """
+        return (not self.pin_volumes
+                or self.owners[(vol_type, lane)] == worker_id)
+
+    def next_task(self, worker_id: int = None):
+        """
+        Pick the task for an idle worker, in the order of,
+            1. creating a volume for a type which has tests but no volume,
+            2. the test with the most critical work, that is a test of the
+               type having the most remaining work per volume on an idle
+               volume of it, or the longest Generic test,
+            3. creating the planned volumes of a type,
+            4. creating one more volume for a type whose volumes are all
+               in use, when its remaining work makes it worthwhile,
+            5. destroying a volume which is broken or no longer needed.
+        Args:
+            worker_id (int): The idle worker, which only gets the tasks of
+                             its own volumes if the volumes are pinned.
+        Returns:
+            dict: The task, or None if there is nothing to do right now.
+        """
+        task = self._pick_task(worker_id)
+        if task is not None:
+            self.outstanding += 1
+        return task
+
+    def _pick_task(self, worker_id: int):
+        with_tests = sorted((vol_type for vol_type in self.pending
+                             if self.pending[vol_type]),
+                            key=lambda vol_type: -self._remaining(vol_type))
+        for vol_type in with_tests:
+            if self._alive(vol_type) == 0:
+                return self._create(vol_type, worker_id)
+
+        best = None
+        for vol_type in with_tests:
+            idle = [lane for (lane, state) in self.volumes[vol_type].items()
+                    if state == 'idle'
+                    and self._usable(vol_type, lane, worker_id)]
+            if not idle:
+                continue
+            priority = self._remaining(vol_type) / self._alive(vol_type)
+            if best is None or priority > best[0]:
+                best = (priority, vol_type, idle[0])
+        if self.generic and (best is None or self.generic[0][0] > best[0]):
+            (_, test) = self.generic.pop(0)
+            return {'kind': 'generic', 'volType': "Generic", 'test': test}
+        if best is not None:
+            (_, vol_type, lane) = best
+            (_, test) = self.pending[vol_type].pop(0)
+            self.volumes[vol_type][lane] = 'busy'
+            return {'kind': 'test', 'volType': vol_type, 'lane': lane,
+                    'volName': lane_vol_name(vol_type, lane), 'test': test}
+
+        for vol_type in with_tests:
+            if self._alive(vol_type) < self.planned_lanes[vol_type]:
+                return self._create(vol_type, worker_id)
+
+        for vol_type in with_tests:
+            alive = self._alive(vol_type)
+            if (alive < min(self.workers, len(self.pending[vol_type]))
+                    and (self._remaining(vol_type) / (alive + 1)
+                         > self.overhead[vol_type])):
+                return self._create(vol_type, worker_id)
+
+        for (vol_type, volumes) in self.volumes.items():
+            for (lane, state) in volumes.items():
+                if not self._usable(vol_type, lane, worker_id):
+                    continue
+                if (state == 'broken'
+                        or (state == 'idle' and not self.pending[vol_type])):
+                    return self._volume_task('destroy', vol_type, lane)
+        return None
+
+    def task_done(self, task: dict, passed: bool, lost: bool = False):
+        """
+        Account for a finished task.
+        Args:
+            task (dict): The task as returned by next_task.
+            passed (bool): Whether the test of the task passed.
+            lost (bool): Whether the worker died while running the task.
+                         The volume of a test is then left in whatever
+                         state the test left it, hence it is destroyed
+                         instead of being handed out again, another one
+                         being created if its tests need one.
+        """
+        self.outstanding -= 1
+        kind = task['kind']
+        if kind == 'generic':
+            return
+        (vol_type, lane) = (task['volType'], task['lane'])
+        volumes = self.volumes[vol_type]
+        if kind == 'destroy':
+            del volumes[lane]
+            del self.owners[(vol_type, lane)]
+        elif kind == 'test':
+            volumes[lane] = 'broken' if lost else 'idle'
+        elif passed:
+            volumes[lane] = 'idle'
+        else:
+            volumes[lane] = 'broken'
+            if self._alive(vol_type) == 0:
+                # No healthy volume of the type to run its tests on.
+                self.abandoned.extend((vol_type, test) for (_, test)
+                                      in self.pending[vol_type])
+                self.pending[vol_type] = []
+
+    def cancel(self) -> list:
+        """
+        Stop handing out tests. The tests already handed out run to the
+        end, and the volumes are destroyed as they free up.
+        Returns:
+            list: The (volume type, test) pairs which won't be run.
+        """
+        cancelled = [("Generic", test) for (_, test) in self.generic]
+        for (vol_type, tests) in self.pending.items():
+            cancelled.extend((vol_type, test) for (_, test) in tests)
+            self.pending[vol_type] = []
+        self.generic = []
+        return cancelled
+
+    def take_abandoned(self) -> list:
+        """
+        Returns:
+            list: The (volume type, test) pairs given up since the last
+                  call, as no volume of the type could be created.
+        """
+        (abandoned, self.abandoned) = (self.abandoned, [])
+        return abandoned
+
+    def finished(self) -> bool:
+        """
+        Whether every test has been handed out and every task and volume
+        is done with.
+        """
+        return (self.outstanding == 0 and not self.generic
+                and not any(self.pending.values())
+                and not any(self.volumes.values()))
@@ -0,0 +1,81 @@
+"""
+The helper scripts are deployed to the nodes by their content. A node
+keeps a manifest of the scripts it has, in the format of sha256sum, and
+the scripts whose hash differs from the local one are sent to it as one
+compressed bundle, which carries the updated manifest along.
+"""
+import io
+import os
+import hashlib
+import tarfile
+
+# Name of the manifest in the script dir of a node.
+manifest_name = ".manifest"
+
+
+def file_hashes(paths: dict) -> dict:
+    """
+    Hash the local scripts.
+    Args:
+        paths (dict): Script name to its local path.
+    Returns:
+        dict: Script name to the sha256 of its content.
+    """
+    hashes = {}
+    for (name, path) in paths.items():
+        with open(path, 'rb') as script:
+            hashes[name] = hashlib.sha256(script.read()).hexdigest()
+    return hashes
+
+
+def parse_manifest(lines: list) -> dict:
+    """
+    Read a manifest, ignoring the lines which aren't entries.
+    Args:
+        lines (list): The lines of the manifest.
+    Returns:
+        dict: Script name to its hash.
+    """
+    manifest = {}
+    for line in lines:
+        parts = line.split()
+        if len(parts) == 2 and len(parts[0]) == 64:
+            manifest[parts[1]] = parts[0]
+    return manifest
+
+
+def render_manifest(manifest: dict) -> str:
+    """
+    Returns:
+        str: The manifest in the format of sha256sum.
+    """
+    return "".join(f"{manifest[name]}  {name}\n"
+                   for name in sorted(manifest))
+
+
+def build_bundle(bundle_path: str, paths: dict, names: list,
+                 manifest: dict):
+    """
+    Write the bundle of the given scripts along with the manifest.
+    Args:
+        bundle_path (str): Local path of the tar.gz to be written.
+        paths (dict): Script name to its local path.
+        names (list): The scripts to be bundled.
+        manifest (dict): The manifest the node has after unpacking.
+    Returns:
+        int: Size of the bundle in bytes.
+    """
+    def owned_by_root(info):
+        info.uid = info.gid = 0
+        info.uname = info.gname = "root"
+        return info
+
+    with tarfile.open(bundle_path, "w:gz") as bundle:
+        for name in names:
+            bundle.add(paths[name], arcname=name, filter=owned_by_root)
+        data = render_manifest(manifest).encode()
+        info = tarfile.TarInfo(manifest_name)
+        info.size = len(data)
+        info.mode = 0o644
+        bundle.addfile(info, io.BytesIO(data))
+    return os.path.getsize(bundle_path)
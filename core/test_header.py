@@ -0,0 +1,189 @@
+"""
+The test header scanner reads the flags of a test module, the comment
+declaring the nature of the test and the volume types it runs on,
+
+    # disruptive;rep,dist-rep
+
+The module is tokenized only up to the first comment, which has to come
+before the first class or function of the module, hence only the leading
+lines of a module are read. The flags are validated as they are read and
+an error points at the file and the line of the offending header.
+
+The scanning of a lot of modules, as on a run without a discovery index,
+is spread over a process pool.
+"""
+import os
+import ast
+import hashlib
+import tokenize
+from multiprocessing import Pool
+
+
+valid_tc_natures = ['disruptive', 'nonDisruptive']
+valid_vol_types = ['rep', 'dist', 'arb', 'disp', 'dist-rep', 'dist-arb',
+                   'dist-disp', "Generic"]
+
+# Below this many modules the pool costs more than it saves.
+parallel_threshold = 64
+
+
+class TestHeaderError(Exception):
+    """
+    The flags of a test module are missing or invalid.
+    """
+
+    def __init__(self, tc_path: str, line: int, reason: str):
+        self.tc_path = tc_path
+        self.line = line
+        self.reason = reason
+        super().__init__(f"{tc_path}:{line}: {reason}")
+
+    def __reduce__(self):
+        return (TestHeaderError, (self.tc_path, self.line, self.reason))
+
+
+def parse_test_flags(comment: str, tc_path: str = "<test>",
+                     line: int = 1) -> dict:
+    """
+    Parse and validate the flags comment of a test module.
+    Args:
+        comment (str): The comment, with or without the leading '#'.
+        tc_path (str): The path of the module, for the errors.
+        line (int): The line of the comment, for the errors.
+    Returns:
+        dict: {
+                "tcNature" : nature of the TC,
+                "volType" : list of volume types, [ "Generic" ] if none
+                            are given,
+                "line" : line of the flags
+              }
+    Raises:
+        TestHeaderError
+    """
+    flags = comment.lstrip('#').strip()
+    if ';' not in flags:
+        raise TestHeaderError(tc_path, line, "expected the test flags "
+                              f"'<nature>;<volume types>', got '{flags}'")
+    (tc_nature, vol_types) = flags.split(';', 1)
+    tc_nature = tc_nature.strip()
+    if tc_nature not in valid_tc_natures:
+        raise TestHeaderError(tc_path, line,
+                              f"invalid test nature '{tc_nature}'")
+    vol_types = [vol_type.strip() for vol_type in vol_types.split(',')]
+    if vol_types == ['']:
+        vol_types = ["Generic"]
+    for vol_type in vol_types:
+        if vol_type not in valid_vol_types:
+            raise TestHeaderError(tc_path, line,
+                                  f"invalid volume type '{vol_type}'")
+    return {"tcNature": tc_nature, "volType": vol_types, "line": line}
+
+
+def scan_test_header(tc_path: str) -> dict:
+    """
+    Read the flags of a test module from its leading lines.
+    Args:
+        tc_path (str): The path of the test case.
+    Returns:
+        dict: As returned by parse_test_flags.
+    Raises:
+        TestHeaderError
+    """
+    with open(tc_path, 'rb') as tc_file:
+        try:
+            for token in tokenize.tokenize(tc_file.readline):
+                if token.type == tokenize.COMMENT:
+                    return parse_test_flags(token.string, tc_path,
+                                            token.start[0])
+                if (token.type == tokenize.NAME and token.start[1] == 0
+                        and token.string in ('class', 'def')):
+                    raise TestHeaderError(tc_path, token.start[0],
+                                          "no test flags before the "
+                                          f"first {token.string}")
+        except (tokenize.TokenError, SyntaxError) as error:
+            raise TestHeaderError(tc_path, 1, f"couldn't be tokenized : "
+                                  f"{error}")
+    raise TestHeaderError(tc_path, 1, "no test flags in the module")
+
+
+def find_test_class_name(content: bytes) -> str:
+    """
+    Find the name of the test class, the class deriving from one of the
+    parent tests, without importing the module.
+    Returns:
+        str: The class name, or None if it couldn't be found, in which
+             case the class is looked up on import.
+    """
+    try:
+        tree = ast.parse(content)
+    except SyntaxError:
+        return None
+    classes = [node for node in tree.body
+               if isinstance(node, ast.ClassDef)]
+    for node in classes:
+        for base in node.bases:
+            if isinstance(base, ast.Name) and base.id.endswith("ParentTest"):
+                return node.name
+    if len(classes) == 1:
+        return classes[0].name
+    return None
+
+
+def scan_test_module(tc_path: str, known_hash: str = None) -> dict:
+    """
+    Obtain the discovery info of a test module.
+    Args:
+        tc_path (str): The path of the test case.
+        known_hash (str): The content hash recorded for the module. If it
+                          is unchanged the module isn't parsed again and
+                          only the hash and the stat are returned.
+    Returns:
+        dict: {
+                "tcNature", "volType", "component", "className" : the
+                parsed info, absent if the content is unchanged,
+                "hash" : SHA-1 of the content,
+                "mtime", "size" : stat of the module
+              }
+    Raises:
+        TestHeaderError
+    """
+    stat = os.stat(tc_path)
+    with open(tc_path, 'rb') as tc_file:
+        content = tc_file.read()
+    entry = {"hash": hashlib.sha1(content).hexdigest(),
+             "mtime": stat.st_mtime_ns, "size": stat.st_size}
+    if entry["hash"] == known_hash:
+        return entry
+    test_flags = scan_test_header(tc_path)
+    entry["tcNature"] = test_flags["tcNature"]
+    entry["volType"] = test_flags["volType"]
+    entry["component"] = tc_path.split("/")[-2]
+    entry["className"] = find_test_class_name(content)
+    return entry
+
+
+def _scan_test_module_args(args: tuple) -> dict:
+    return scan_test_module(*args)
+
+
+def scan_test_modules(modules: list, processes: int = None) -> list:
+    """
+    Scan a list of test modules, over a process pool if there are enough
+    of them to make up for starting it.
+    Args:
+        modules (list): ( path, known hash or None ) of every module.
+        processes (int): Size of the pool, defaults to the CPU count.
+    Returns:
+        list: The info of the modules as returned by scan_test_module, in
+              the same order.
+    Raises:
+        TestHeaderError: For the first invalid module in the list.
+    """
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = min(processes, len(modules) // parallel_threshold)
+    if processes <= 1:
+        return [scan_test_module(*module) for module in modules]
+    with Pool(processes) as pool:
+        return pool.map(_scan_test_module_args, modules,
+                        chunksize=parallel_threshold // 4)
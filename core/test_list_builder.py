@@ -8,15 +8,11 @@ to be executed in the current session.
 
 """
 import os
+import json
 import inspect
 import importlib
-import copy
 import sys
-from comment_parser.comment_parser import extract_comments
-
-
-valid_vol_types = ['rep', 'dist', 'arb', 'disp', 'dist-rep', 'dist-arb',
-                   'dist-disp', "Generic"]
+from test_header import valid_vol_types, scan_test_modules
 
 
 class TestListBuilder:
@@ -38,6 +34,11 @@ class TestListBuilder:
     dtest_list = []
     test_nd_volc_dict = {}
     test_nd_vold_dict = {}
+    # Discovery index, module path to the parsed info of the module.
+    test_index = {}
+    test_index_changed = False
+    # Test classes imported in this process, by module path and class.
+    test_classes = {}
     nd_category = {'rep': r_ndtest_list, 'dist': dt_ndtest_list,
                    'arb': a_ndtest_list, 'disp': ds_ndtest_list,
                    'dist-rep': dtr_ndtest_list, 'dist-arb': dta_ndtest_list,
@@ -45,10 +46,12 @@ class TestListBuilder:
 
     @classmethod
     def create_test_dict(cls, path: str, excluded_tests: list,
-                         volume_types_config: dict, single_tc: bool = False):
+                         volume_types_config: dict, single_tc: bool = False,
+                         index_path: str = None):
         """
         This method creates a dict of TCs wrt the given directory
-        path.
+        path. The test modules are not imported here, the test class is
+        loaded only when the test is run.
         Args:
             path (str): The directory path which contains the TCs
                         to be run.
@@ -57,12 +60,14 @@ class TestListBuilder:
                                         config file
             single_tc (bool): If the user wants to run a single TC instead
                               of the complete suite.
+            index_path (str): Optional JSON file of the discovery index.
+                              Only the modules changed since it was saved
+                              are parsed again.
         Returns:
         """
         def path_error_handler(exception_instance):
             raise FileNotFoundError
 
-        global valid_vol_types
         # Obtaining list of paths to the TCs under given directory.
         if not single_tc:
             if path.endswith("/"):
@@ -82,13 +87,15 @@ class TestListBuilder:
             cls.tests_path_list.append(path)
 
         # Extracting the test case flags and adding module level info.
+        cls._load_index(index_path)
+        cls._update_index(cls.tests_path_list)
         for test_case_path in cls.tests_path_list:
-            test_flags = cls._get_test_module_info(test_case_path)
+            test_flags = cls.test_index[test_case_path]
             test_dict = {}
             test_dict["modulePath"] = test_case_path
             test_dict["moduleName"] = test_case_path.split("/")[-1]
             test_dict["componentName"] = test_case_path.split("/")[-2]
-            test_dict["testClass"] = cls._get_test_class(test_case_path)
+            test_dict["className"] = test_flags["className"]
             test_dict["testType"] = test_case_path.split("/")[-3]
             test_dict["tcNature"] = test_flags["tcNature"]
             if test_flags["tcNature"] == "disruptive":
@@ -98,8 +105,8 @@ class TestListBuilder:
                                         f" invalid volume type {vol_type}")
                     if ((vol_type == "Generic")
                        or (vol_type in volume_types_config)):
-                        temp_test_dict = copy.deepcopy(test_dict)
-                        temp_test_dict["volType"] = copy.deepcopy(vol_type)
+                        temp_test_dict = dict(test_dict)
+                        temp_test_dict["volType"] = vol_type
                         cls.dtest_list.append(temp_test_dict)
             elif test_flags["tcNature"] == "nonDisruptive":
                 for vol_type in test_flags["volType"]:
@@ -108,7 +115,7 @@ class TestListBuilder:
                                         f" invalid volume type {vol_type}")
                     if ((vol_type == "Generic")
                        or (vol_type in volume_types_config)):
-                        temp_test_dict = copy.deepcopy(test_dict)
+                        temp_test_dict = dict(test_dict)
                         cls.nd_category[vol_type].append(temp_test_dict)
             else:
                 raise Exception(f"Invalid test nature : "
@@ -124,6 +131,93 @@ class TestListBuilder:
                 cls.spec_vol.append(vol_t)
         if nd_tests_count > 0:
             cls._create_nd_special_tests()
+        cls._save_index(index_path)
+        # The index isn't needed further, no need to carry it into the
+        # forked workers.
+        cls.test_index = {}
+
+    @classmethod
+    def _load_index(cls, index_path: str):
+        """
+        Load the discovery index saved by an earlier run.
+        """
+        if index_path is None or not os.path.isfile(index_path):
+            return
+        try:
+            with open(index_path) as index_file:
+                cls.test_index = json.load(index_file)['modules']
+        except (OSError, ValueError, KeyError, TypeError):
+            cls.test_index = {}
+
+    @classmethod
+    def _save_index(cls, index_path: str):
+        """
+        Save the discovery index if any module was parsed afresh.
+        """
+        if index_path is None or not cls.test_index_changed:
+            return
+        try:
+            tmp_path = f"{index_path}.tmp"
+            with open(tmp_path, 'w') as index_file:
+                json.dump({'version': 1, 'modules': cls.test_index},
+                          index_file, indent=1, sort_keys=True)
+            os.replace(tmp_path, index_path)
+            cls.test_index_changed = False
+        except OSError:
+            # The index is only a cache, the next run parses again.
+            pass
+
+    @classmethod
+    def _update_index(cls, tc_paths: list):
+        """
+        Bring the discovery index up to date for the given modules. A
+        module whose modification time or size changed is hashed, and
+        its header scanned again only if its content changed.
+        Args:
+           tc_paths (list): The paths of the test cases.
+        """
+        stale = []
+        for tc_path in tc_paths:
+            stat = os.stat(tc_path)
+            entry = cls.test_index.get(tc_path)
+            if (entry is None or entry['mtime'] != stat.st_mtime_ns
+                    or entry['size'] != stat.st_size):
+                stale.append((tc_path, None if entry is None
+                              else entry['hash']))
+        if not stale:
+            return
+        for ((tc_path, _), scanned) in zip(stale,
+                                           scan_test_modules(stale)):
+            entry = cls.test_index.get(tc_path, {})
+            entry.update(scanned)
+            cls.test_index[tc_path] = entry
+        cls.test_index_changed = True
+
+    @classmethod
+    def retain_tests(cls, selected: dict):
+        """
+        Method to narrow the built test list down to the selected tests,
+        as for a rerun of the tests which failed in an earlier run.
+        Args:
+            selected (dict): Module path to the volume types for which
+                             the test is to be run.
+        """
+        cls.tests_path_list[:] = [path for path in cls.tests_path_list
+                                  if path in selected]
+        cls.dtest_list[:] = [test for test in cls.dtest_list
+                             if test['volType'] in
+                             selected.get(test['modulePath'], ())]
+        nd_tests_count = 0
+        for (vol_type, listv) in cls.nd_category.items():
+            listv[:] = [test for test in listv
+                        if vol_type in selected.get(test['modulePath'], ())]
+            if vol_type != "Generic":
+                nd_tests_count += len(listv)
+        cls.spec_vol = [vol_type for vol_type in cls.spec_vol
+                        if cls.nd_category[vol_type]]
+        if nd_tests_count == 0:
+            cls.test_nd_volc_dict = {}
+            cls.test_nd_vold_dict = {}
 
     @classmethod
     def get_spec_vol_types(cls):
@@ -148,7 +242,7 @@ class TestListBuilder:
             special_nd = {}
             special_nd['modulePath'] = path
             special_nd['moduleName'] = path.split("/")[-1]
-            special_nd['testClass'] = cls._get_test_class(path)
+            special_nd['className'] = None
             special_nd['tcNature'] = 's'
             if cls.test_nd_volc_dict == {}:
                 cls.test_nd_volc_dict = special_nd
@@ -192,7 +286,6 @@ class TestListBuilder:
         Returns:
             *_ndtest_list (list)
         """
-        global valid_vol_types
         if vol_type not in valid_vol_types:
             return []
         return cls.nd_category[vol_type]
@@ -203,47 +296,55 @@ class TestListBuilder:
         Method to obtain a count of nd tests.
         Returns integer value.
         """
-        global valid_vol_types
         count = 0
         for vol_type in valid_vol_types:
             count += len(cls.nd_category[vol_type])
         return count
 
-    @classmethod
-    def _get_test_module_info(cls, tc_path: str) -> dict:
+    @staticmethod
+    def job_descriptor(test_dict: dict) -> dict:
         """
-        This method gets the volume types for which the TC is to be run
-        and the nature of a TC
+        Method to obtain the part of a test dict which a worker needs to
+        run the test, to be sent to it in place of the whole dict.
         Args:
-           tc_path (str): The path of the test case.
+            test_dict (dict)
+        Returns:
+            dict: The modulePath, moduleName, className and tcNature.
+        """
+        return {key: test_dict.get(key) for key in
+                ('modulePath', 'moduleName', 'className', 'tcNature')}
 
+    @classmethod
+    def load_test_class(cls, test_dict: dict):
+        """
+        Method to import the module of a test and obtain its class, done
+        when the test is about to run, in the process running it. The
+        class is cached for the later runs of the test in the process.
+        Args:
+            test_dict (dict): The test dict, with the modulePath and the
+                              className found during discovery.
         Returns:
-           test_flags (dict): This dictionary contains the volume types
-                              for which the TC is to be run and the nature
-                              of the TC, i.e. Disruptive / Non-Disruptive.
-           For example,
-                      {
-                        "tcNature" : "disruptive",
-                        "volType" : [replicated, ...]
-                      }
-        """
-        flags = str(extract_comments(tc_path, mime="text/x-python")[0])
-        tc_flags = {}
-        tc_flags["tcNature"] = flags.split(';')[0].strip()
-        tc_flags["volType"] = flags.split(';')[1].split(',')
-        if tc_flags["volType"] == ['']:
-            tc_flags["volType"] = ["Generic"]
-        return tc_flags
+            class: The test class.
+        """
+        if "testClass" in test_dict:
+            return test_dict["testClass"]
+        key = (test_dict["modulePath"], test_dict.get("className"))
+        if key not in cls.test_classes:
+            cls.test_classes[key] = cls._get_test_class(*key)
+        return cls.test_classes[key]
 
     @classmethod
-    def _get_test_class(cls, tc_path: str):
+    def _get_test_class(cls, tc_path: str, class_name: str = None):
         """
         Method to import the module and inspect the class to be stored
         for creating objects later.
         """
         tc_module_str = tc_path.replace("/", ".")[:-3]
-        sys.path.insert(1, ".")
+        if "." not in sys.path:
+            sys.path.insert(1, ".")
         tc_module = importlib.import_module(tc_module_str)
+        if class_name is not None and hasattr(tc_module, class_name):
+            return getattr(tc_module, class_name)
         tc_class_str = inspect.getmembers(tc_module,
                                           inspect.isclass)[1][0]
         tc_class = getattr(tc_module, tc_class_str)
@@ -3,9 +3,13 @@ The test runner is responsible for handling the list of TCs
 to be run and invoking them.
 """
 import time
-from multiprocessing import Process, Queue
+import traceback
 from halo import Halo
 from runner_thread import RunnerThread
+from test_list_builder import TestListBuilder
+from scheduler import DurationHistory, NdDispatcher, plan_nd_jobs
+from worker_pool import WorkerPool
+from volume_pool import VolumePool
 
 
 class TestRunner:
@@ -15,9 +19,15 @@ class TestRunner:
     created by the test list builder.
     """
 
+    # Skip reason of the tests left out on reaching the failure limit.
+    stop_reason = "Run stopped on reaching the failure limit"
+
     @classmethod
     def init(cls, TestListBuilder, param_obj, fmwk_obj, base_log_path: str,
-             log_level: str, multiprocess_count: int, spec_test: bool):
+             log_level: str, multiprocess_count: int, spec_test: bool,
+             duration_history: str = None, result_sink=None, ledger=None,
+             max_failures: int = None, stop_event=None,
+             volume_pool_log: str = None):
         """
         Test runner intialization.
         Args:
@@ -27,6 +37,23 @@ class TestRunner:
             log_level (str)
             multiprocess_count (int)
             spec_test (bool) True if only one test is run.
+            duration_history (str) Optional JSON file with the durations
+                                   of the earlier runs, used for ordering
+                                   the tests and updated after the run.
+            result_sink (callable) Optional callable given every result as
+                                   it is collected. The history is then
+                                   left for the owner of the sink to
+                                   update.
+            ledger (ResultsLedger) Optional ledger to record the results
+                                   in.
+            max_failures (int) Optional count of failures after which the
+                               remaining tests are skipped.
+            stop_event (Event) Optional event on which the remaining tests
+                               are skipped, set by the owner of the run.
+            volume_pool_log (str) Optional log of the volume pool, which
+                                  builds the volumes of the disruptive
+                                  tests ahead of them. No pool is used if
+                                  it isn't given.
         """
         cls.param_obj = param_obj
         cls.concur_count = multiprocess_count
@@ -39,37 +66,33 @@ class TestRunner:
         cls.get_spec_vol_types_fn = TestListBuilder.get_spec_vol_types
         cls.nd_tests_count = TestListBuilder.get_nd_tests_count()
         cls.logger = fmwk_obj.get_framework_logger()
+        cls.history = DurationHistory(duration_history)
+        cls.result_sink = result_sink
+        cls.ledger = ledger
+        cls.max_failures = max_failures
+        cls.stop_event = stop_event
+        cls.volume_pool_log = volume_pool_log
+        cls.volume_pool = None
+        cls.failures = 0
         cls.logger.info("Creating thread queues for the tests")
         cls._prepare_thread_queues(spec_test)
 
     @classmethod
     def _prepare_thread_queues(cls, spec_test: bool):
         """
-        This method creates the requisite queues for the test run.
+        This method creates the requisite queues for the test run and
+        plans the non disruptive stage.
         Arg:
             spec_test (bool) True if only one test is to be run.
         """
-        cls.job_result_queue = Queue()
-        cls.r_nd_jobq = Queue()
-        cls.dt_nd_jobq = Queue()
-        cls.a_nd_jobq = Queue()
-        cls.ds_nd_jobq = Queue()
-        cls.dtr_nd_jobq = Queue()
-        cls.dta_nd_jobq = Queue()
-        cls.dtds_nd_jobq = Queue()
-        cls.gen_nd_jobq = Queue()
-        cls.nd_vol_queue = Queue()
         vol_types = ['rep', 'dist', 'disp', 'arb', 'dist-rep', 'dist-disp',
                      'dist-arb']
-        cls.queue_map = {'arb': cls.a_nd_jobq, 'disp': cls.ds_nd_jobq,
-                         'dist-rep': cls.dtr_nd_jobq, 'rep': cls.r_nd_jobq,
-                         'dist-arb': cls.dta_nd_jobq, 'dist': cls.dt_nd_jobq,
-                         'dist-disp': cls.dtds_nd_jobq}
 
         # Get special tests dict
-        special_test_dict = cls.get_snd_test_fn()
+        cls.special_tests = cls.get_snd_test_fn()
 
-        if special_test_dict != []:
+        vol_tests = {}
+        if cls.special_tests != []:
             # When a single test is ran
             if spec_test:
                 spec_vols = cls.get_spec_vol_types_fn()
@@ -79,114 +102,356 @@ class TestRunner:
                     vol_types = spec_vols
 
             for vol_type in vol_types:
-                cls.queue_map[vol_type].put(special_test_dict[0])
+                vol_tests[vol_type] = cls.get_ndtest_fn(vol_type)
 
-            for vol_type in vol_types:
-                cls.nd_vol_queue.put(vol_type)
-                for test in cls.get_ndtest_fn(vol_type):
-                    cls.queue_map[vol_type].put(test)
+        plan = plan_nd_jobs(vol_tests, cls.get_ndtest_fn('Generic'),
+                            cls.special_tests, cls.concur_count, cls.history)
+        cls.dispatcher = NdDispatcher(plan, cls.special_tests,
+                                      cls.concur_count, cls.history)
+        if plan['jobs']:
+            cls.logger.info(f"Planned {len(plan['jobs'])} non disruptive "
+                            f"jobs for {cls.concur_count} workers. "
+                            f"Estimated work {plan['totalWork']:.0f}s, "
+                            f"estimated makespan {plan['makespan']:.0f}s")
 
-            for vol_type in vol_types:
-                cls.queue_map[vol_type].put(special_test_dict[1])
+    @classmethod
+    def _run_nd_stage(cls, results: list):
+        """
+        Dispatch the non disruptive tasks to the workers as they become
+        idle, and collect the results as they arrive, till the dispatcher
+        is done. A worker which dies is replaced, its test being failed
+        and the volume it ran on being destroyed. The tests left when no
+        worker can take them are failed too.
+        Args:
+            results (list): List to which the results are appended.
+        """
+        dispatcher = cls.dispatcher
+        idle = list(range(cls.concur_count))
+        running = {}
+        stopped = False
+        while True:
+            if not stopped and cls._stop_requested():
+                stopped = True
+                cls.logger.error("Failure limit reached, skipping the "
+                                 "remaining non disruptive tests.")
+                for (vol_type, test) in dispatcher.cancel():
+                    cls._collect_result(cls._abandoned_result(
+                        test, vol_type, cls.stop_reason), results)
+            for worker_id in list(idle):
+                task = dispatcher.next_task(worker_id)
+                if task is None:
+                    continue
+                idle.remove(worker_id)
+                running[worker_id] = task
+                job_data = cls._job_message(task)
+                cls.logger.info(f"Worker {worker_id} picked up job "
+                                f"{job_data}")
+                if not cls._send_job(cls.nd_pool, worker_id, job_data):
+                    # The worker can't be brought back, hence it is left
+                    # out for the rest of the stage.
+                    del running[worker_id]
+                    dispatcher.task_done(task, False)
+                    cls._collect_result(cls._lost_result(
+                        task['test'], task['volType'],
+                        "No worker could take"), results)
+            for (vol_type, test) in dispatcher.take_abandoned():
+                cls._collect_result(cls._abandoned_result(test, vol_type),
+                                    results)
+            if dispatcher.finished() or not running:
+                break
+
+            for (worker_id, result) in cls.nd_pool.receive(timeout=5):
+                task = running.pop(worker_id, None)
+                if task is None:
+                    # The worker died while idle, it stays in idle.
+                    cls.nd_pool.start(worker_id)
+                    continue
+                if result is None:
+                    cls.nd_pool.start(worker_id)
+                    dispatcher.task_done(task, False, lost=True)
+                    result = cls._lost_result(task['test'], task['volType'])
+                else:
+                    dispatcher.task_done(task, list(result.values())[0]
+                                         ['testResult'] == "PASS")
+                cls._collect_result(result, results)
+                idle.append(worker_id)
 
-        # Populating the generic queue.
-        for test in cls.get_ndtest_fn('Generic'):
-            cls.gen_nd_jobq.put(test)
+        if not dispatcher.finished():
+            cls.logger.error("Non disruptive stage ended with work left.")
+            for (vol_type, test) in dispatcher.cancel():
+                cls._collect_result(cls._lost_result(
+                    test, vol_type, "No worker left to run"), results)
 
     @classmethod
-    def _nd_worker_process(cls, vol_queue, queue_map, gen_nd_jobq, ):
-        """
-        Worker process has two set of queue hierarchy to deal with.
-        It picks up a volume type from the volume queue and then
-        starts picking off jobs specific to that particular volume. Once, the
-        jobs related to this volume ends, it picks up a new volume to work
-        with. Once a worker find the vol queue as empty, it goes ahead and
-        starts working with Generic cases.
+    def _run_disruptive_test(cls, test: dict, upcoming: dict) -> dict:
+        """
+        Run a disruptive test on the disruptive worker and wait for its
+        result. A worker which dies is replaced, its test being failed.
         Args:
-            vol_queue (Queue) : Queue containing volume types of gluster.
-            queue_map (Dict) : A dictionary mapping volume types to sub queues
-                               for given volume type.
-            gen_nd_jobq (Queue) : Queue containing jobs for Generic
-                                  non disruptive cases.
-        """
-        while not vol_queue.empty():
-            job_vol = vol_queue.get()
-            cls.logger.info(f"Worker picked up job_volume {job_vol}")
-            job_queue = queue_map[job_vol]
-            while not job_queue.empty():
-                job_data = job_queue.get()
-                cls.logger.info(f"Worker picked up job {job_data}")
-                job_data['volType'] = job_vol
-                cls._run_test(job_data)
-
-        if gen_nd_jobq.qsize() != 0:
-            while not gen_nd_jobq.empty():
-                job_data = gen_nd_jobq.get()
-                cls.logger.info(f"Worker picked up job {job_data}")
-                job_data['volType'] = "Generic"
-                cls._run_test(job_data)
+            test (dict)
+            upcoming (dict): The test expected to run next, for which the
+                             volume pool builds a volume, or None.
+        """
+        job_data = TestListBuilder.job_descriptor(test)
+        job_data['volType'] = test['volType']
+        if cls.volume_pool_log is not None:
+            job_data['poolNext'] = None
+            if upcoming is not None:
+                job_data['poolNext'] = TestListBuilder.job_descriptor(
+                    upcoming)
+                job_data['poolNext']['volType'] = upcoming['volType']
+        if not cls._send_job(cls.d_pool, 0, job_data):
+            return cls._lost_result(test, test['volType'])
+        while True:
+            for (_, result) in cls.d_pool.receive():
+                if result is None:
+                    cls.d_pool.start(0)
+                    return cls._lost_result(test, test['volType'])
+                return result
+
+    @classmethod
+    def _send_job(cls, pool, worker_id: int, job_data: dict) -> bool:
+        """
+        Hand a job to an idle worker. A worker which died while idle is
+        replaced and the job is handed to the fresh one.
+        Returns:
+            bool: False if the job couldn't be handed over.
+        """
+        for _ in range(2):
+            try:
+                pool.send(worker_id, job_data)
+                return True
+            except OSError as error:
+                cls.logger.error(f"Worker {worker_id} is gone : {error}")
+                pool.start(worker_id)
+        return False
+
+    @staticmethod
+    def _upcoming_dtest(dtests, idx: int, test: dict) -> dict:
+        """
+        The disruptive test expected to run after the one at the index.
+        The shared queue of the clusters can't be looked ahead into, a
+        test taken off it is expected to be followed by one of the same
+        volume type.
+        """
+        if not isinstance(dtests, list):
+            return test
+        if idx + 1 < len(dtests):
+            return dtests[idx + 1]
+        return None
+
+    @staticmethod
+    def _job_message(task: dict) -> dict:
+        """
+        The job sent to a worker for a task, carrying only what the
+        worker needs to import and run the test.
+        """
+        job_data = TestListBuilder.job_descriptor(task['test'])
+        job_data['volType'] = task['volType']
+        if task['kind'] != 'generic':
+            job_data['lane'] = task['lane']
+            job_data['volName'] = task['volName']
+        return job_data
+
+    @classmethod
+    def _stop_requested(cls) -> bool:
+        """
+        Whether the remaining tests are to be skipped, the failure limit
+        having been reached.
+        """
+        if cls.stop_event is not None and cls.stop_event.is_set():
+            return True
+        return (cls.max_failures is not None
+                and cls.failures >= cls.max_failures)
+
+    @classmethod
+    def _abandoned_result(cls, test_dict: dict, vol_type: str,
+                          reason: str = None) -> dict:
+        """
+        Result of a test which wasn't run, as no volume of its type could
+        be created or as the run was stopped.
+        """
+        if reason is None:
+            reason = f"Volume creation of {vol_type} failed"
+        test_stats = {
+            'timeTaken': 0,
+            'volType': vol_type,
+            'skipReason': reason,
+            'testResult': "SKIP",
+            'tcNature': test_dict['tcNature'],
+            'modulePath': test_dict['modulePath'],
+            'component': test_dict['modulePath'].split('/')[-2]
+        }
+        return {test_dict['moduleName'][:-3]: test_stats}
+
+    @classmethod
+    def _log_overhead(cls, results: list):
+        """
+        Log the framework overhead of the tests which were run, the time
+        spent on importing each and setting up its logger and connections.
+        """
+        init_times = [list(result.values())[0]['initTime']
+                      for result in results
+                      if 'initTime' in list(result.values())[0]]
+        if init_times:
+            cls.logger.info(f"Framework overhead per test : mean "
+                            f"{sum(init_times) / len(init_times):.3f}s, "
+                            f"max {max(init_times):.3f}s over "
+                            f"{len(init_times)} tests")
+
+    @classmethod
+    def _lost_result(cls, test_dict: dict, vol_type: str,
+                     message: str = "Worker died while running") -> dict:
+        """
+        Result of a test whose worker died while running it, or which no
+        worker was left to run. The test is failed as worker lost.
+        """
+        cls.logger.error(f"{message} {test_dict['modulePath']}-{vol_type}")
+        result = cls._abandoned_result(test_dict, vol_type, "Worker lost")
+        list(result.values())[0]['testResult'] = "FAIL"
+        return result
+
+    @classmethod
+    def _collect_result(cls, result: dict, results: list):
+        """
+        Add the result of a test to the results of the run and fold its
+        duration into the history.
+        """
+        results.append(result)
+        if cls.result_sink is not None:
+            cls.result_sink(result)
+        if cls.ledger is not None:
+            cls.ledger.record(result)
+        test_stats = list(result.values())[0]
+        if test_stats['testResult'] == "FAIL":
+            cls.failures += 1
+        cls.logger.info(f"Result of {list(result.keys())[0]}-"
+                        f"{test_stats['volType']} : "
+                        f"{test_stats['testResult']}")
+        if test_stats['testResult'] != "SKIP":
+            cls.history.record(test_stats['modulePath'],
+                               test_stats['volType'],
+                               test_stats['timeTaken'])
 
     @classmethod
-    def run_tests(cls, env_obj):
+    def run_tests(cls, env_obj) -> list:
         """
         The test runs are of three stages,
         1. Stage 1 is for non disruptive test cases which can run in the
            concurrent flow and can use a pre-existing volume or don't
            even need a pre-existing volume ( psst. Generic cases ).
         3. Stage 2 is the run of Disruptive test cases.
+        Returns:
+            list: The results of the tests, in the order they ended.
         """
         cls.env_obj = env_obj
+        results = []
+        # The workers see the volumes created and changed by each other
+        # through the shared state.
+        cls.env_obj.share()
+        # The workers are forked once for the run. The disruptive worker
+        # gets ready while the non disruptive tests run.
+        nodes = (cls.param_obj.get_server_ip_list()
+                 + cls.param_obj.get_client_ip_list())
+        cls.d_pool = WorkerPool(cls._run_test, nodes, cls.logger,
+                                cls._close_volume_pool)
+        cls.d_pool.start(0)
         # Stage 1
-        jobs = []
         if bool(cls.nd_tests_count):
             cls.logger.info("Starting Non Disruptive test case runs.")
-            for _ in range(cls.concur_count):
-                proc = Process(target=cls._nd_worker_process,
-                               args=(cls.nd_vol_queue, cls.queue_map,
-                                     cls.gen_nd_jobq,))
-                jobs.append(proc)
-                proc.start()
-
-            # TODO replace sleep with a signalling and lock.
-            while len(jobs) > 0:
-                jobs = [job for job in jobs if job.is_alive()]
-                time.sleep(1)
-
-            for _ in range(cls.concur_count):
-                proc.join()
-
-        # Stage 2
-        if cls.get_dtest_fn():
-            cls.logger.info("Starting Disruptive test case runs.")
-            for test in cls.get_dtest_fn():
-                cls._run_test(test)
-
-        # Because of the infinitesimal delay in value being reflected in Queue
-        # it was found that sometimes the Queue which was empty had been given
-        # some value, it still showed itself as empty.
-        # TODO: Handle it without sleep.
-        itr = 0
-        while itr < 5:
-            if cls.job_result_queue.empty():
-                time.sleep(1)
-            else:
-                break
-            itr += 1
+            cls.nd_pool = WorkerPool(cls._run_test, nodes, cls.logger)
+            for worker_id in range(cls.concur_count):
+                cls.nd_pool.start(worker_id)
+            cls._run_nd_stage(results)
+            cls.nd_pool.stop()
+
+        # Stage 2, the disruptive tests can also be a shared queue being
+        # drained by the runners of other clusters.
+        started = False
+        dtests = cls.get_dtest_fn()
+        for (idx, test) in enumerate(dtests):
+            if cls._stop_requested():
+                cls._collect_result(cls._abandoned_result(
+                    test, test['volType'], cls.stop_reason), results)
+                continue
+            if not started:
+                cls.logger.info("Starting Disruptive test case runs.")
+                started = True
+            cls._collect_result(cls._run_disruptive_test(
+                test, cls._upcoming_dtest(dtests, idx, test)), results)
+        cls.d_pool.stop()
+        cls.env_obj.unshare()
+        cls._log_overhead(results)
 
+        if cls.result_sink is None:
+            try:
+                cls.history.save()
+            except OSError as error:
+                cls.logger.error("Couldn't save the duration history: "
+                                 f"{error}")
         cls.logger.info("Finished test executions.")
-        return cls.job_result_queue
+        return results
+
+    @classmethod
+    def _get_volume_pool(cls):
+        """
+        The volume pool of the disruptive worker, created with its first
+        test. The tests set up their own volumes if it can't be created.
+        """
+        if cls.volume_pool is None and cls.volume_pool_log is not None:
+            try:
+                cls.volume_pool = VolumePool(cls.param_obj,
+                                             cls.volume_pool_log,
+                                             cls.log_level)
+            except Exception as error:
+                tb = traceback.format_exc()
+                cls.logger.error(f"Volume pool creation failed : {error}")
+                cls.logger.error(tb)
+                cls.volume_pool_log = None
+        return cls.volume_pool
+
+    @classmethod
+    def _close_volume_pool(cls):
+        """
+        Close the volume pool of the disruptive worker as it exits.
+        """
+        if cls.volume_pool is not None:
+            cls.volume_pool.close()
+            cls.volume_pool = None
+
+    @staticmethod
+    def _pool_vol_type(upcoming: dict) -> str:
+        """
+        The volume type of the volume to be built for the test expected
+        next, None if it doesn't take a volume from the pool.
+        """
+        if upcoming is None or upcoming['volType'] == "Generic":
+            return None
+        try:
+            tc_class = TestListBuilder.load_test_class(upcoming)
+        except Exception:
+            # The import error is reported when the test is run.
+            return None
+        if getattr(tc_class.setup_test, 'custom_setup', False):
+            return None
+        return upcoming['volType']
 
     @classmethod
-    def _run_test(cls, test_dict: dict):
+    def _run_test(cls, test_dict: dict) -> dict:
         """
         A generic method handling the run of both disruptive and non
         disruptive tests.
+        Returns:
+            dict: {test name: test stats}
         """
 
         spinner = Halo(spinner='dots', text_color='yellow')
-        tc_class = test_dict["testClass"]
         volume_type = test_dict["volType"]
         mname = test_dict["moduleName"][:-3]
+        lane = test_dict.get("lane", 0)
+        if test_dict['tcNature'] == 's' and lane:
+            # The volume of every lane is created and destroyed.
+            mname = f"{mname}-{lane}"
 
         tc_log_path = (f"{cls.base_log_path+test_dict['modulePath'][5:-3]}/"
                        f"{volume_type}/{mname}.log")
@@ -194,17 +459,31 @@ class TestRunner:
         # to calculate time spent to execute the test
         start = time.time()
 
+        volume_pool = None
+        if 'poolNext' in test_dict:
+            volume_pool = cls._get_volume_pool()
+        if volume_pool is not None:
+            volume_pool.plan(cls._pool_vol_type(test_dict['poolNext']))
+
         spinner.succeed(text=f"Running test case : {mname}-{volume_type}")
-        runner_thread_obj = RunnerThread(tc_class, cls.param_obj, volume_type,
-                                         mname, cls.logger, cls.env_obj,
-                                         tc_log_path, cls.log_level)
+        runner_thread_obj = RunnerThread(
+            lambda: TestListBuilder.load_test_class(test_dict),
+            cls.param_obj, volume_type, mname, cls.logger, cls.env_obj,
+            tc_log_path, cls.log_level, test_dict.get("volName"),
+            volume_pool)
 
         test_stats = runner_thread_obj.run_thread()
+        if volume_pool is not None:
+            # The volume of the next test is built once this one is torn
+            # down, no test body runs beside the build.
+            volume_pool.refill()
 
         test_stats['timeTaken'] = time.time() - start
         test_stats['tcNature'] = test_dict['tcNature']
+        test_stats['modulePath'] = test_dict['modulePath']
+        test_stats['logPath'] = tc_log_path
         spinner.clear()
-        result_text = f"{test_dict['moduleName'][:-3]}-{test_dict['volType']}"
+        result_text = f"{mname}-{volume_type}"
         if test_stats['testResult'][0] is True:
             test_stats['testResult'] = "PASS"
             result_text += " PASS"
@@ -222,5 +501,4 @@ class TestRunner:
             spinner.info(f"{mname}-{volume_type} SKIP")
         test_stats['component'] = tc_log_path.split('/')[-4]
 
-        result_value = {test_dict["moduleName"][:-3]: test_stats}
-        cls.job_result_queue.put(result_value)
+        return {mname: test_stats}
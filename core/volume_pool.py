@@ -0,0 +1,193 @@
+"""
+The volume pool builds the volumes of the disruptive tests ahead of them.
+Once a test is torn down, the volume which the next test is expected to
+need is created, started and mounted in the background, while the next
+test brings up its cluster, and the next test leases it in place of
+setting up a volume of its own. No test body runs beside a build, as a
+disruptive test lists, cleans up and breaks the volumes of the cluster.
+A pooled volume is kept in a data store of the pool till it is leased,
+and is then moved into the data store of the test, which cleans it up
+like the volume it would have created.
+"""
+import os
+import time
+import traceback
+import concurrent.futures
+from common.mixin import RedantMixin
+from environ import FrameworkEnv
+
+
+class VolumePool:
+    """
+    The pool of the disruptive worker, holding at most one volume, built
+    for the volume type of the next test.
+    """
+
+    def __init__(self, param_obj, log_path: str, log_level: str):
+        """
+        Args:
+            param_obj (ParamsHandler): The config of the cluster.
+            log_path (str): The log of the pool.
+            log_level (str)
+        """
+        self.server_list = param_obj.get_server_ip_list()
+        self.client_list = param_obj.get_client_ip_list()
+        self.brick_roots = param_obj.get_brick_roots()
+        self.vol_type_inf = param_obj.get_volume_types()
+        es = FrameworkEnv.model({'volds': {}, 'clusteropt': {}, 'snapm': {}})
+        self.redant = RedantMixin(param_obj.get_server_config(),
+                                  param_obj.get_client_config(), es, [True])
+        self.redant.init_logger("volume_pool", log_path, log_level)
+        self.redant.establish_connection()
+        # The builds and the removals run one at a time, in order.
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self.count = 0
+        self.next_type = None
+        self.build = None
+
+    def plan(self, vol_type: str):
+        """
+        Note the volume type the next test is expected to need.
+        Args:
+            vol_type (str): None if the next test doesn't take a volume
+                            from the pool.
+        """
+        self.next_type = vol_type
+
+    def refill(self):
+        """
+        Start building the volume of the next test in the background, to
+        be called once the current test is torn down. A volume built
+        earlier which is not of the type needed is removed.
+        """
+        if self.build is not None and self.build[0] != self.next_type:
+            self.executor.submit(self._remove, self.build[1])
+            self.build = None
+        if self.build is None and self.next_type is not None:
+            self.count += 1
+            volname = (f"{self.next_type}-pool-{os.getpid()}-{self.count}")
+            self.build = (self.next_type,
+                          self.executor.submit(self._create, volname,
+                                               self.next_type))
+
+    def lease(self, vol_type: str, es):
+        """
+        Hand out the volume of the type, waiting for its build if it is
+        under way. The volume is checked to be started and mounted, as the
+        test run beside its build might have brought the cluster down.
+        Args:
+            vol_type (str): The volume type the test needs.
+            es (FrameworkEnv): The data store of the test, into which the
+                               volume is moved.
+        Returns:
+            str: Name of the volume, mounted at /mnt/<name> on all the
+                 clients, or None if there is no usable volume of the type.
+        """
+        if self.build is None or self.build[0] != vol_type:
+            return None
+        (_, build) = self.build
+        self.build = None
+        volname = build.result()
+        if volname is None:
+            return None
+        if not self._is_usable(volname):
+            self.redant.logger.info(f"Discarding {volname}, it is no longer"
+                                    " started and mounted.")
+            self.executor.submit(self._remove, build)
+            return None
+        es.add_volume_data(volname, self.redant.es.get_volume_dict(volname))
+        self.redant.es.remove_volume_data(volname)
+        self.redant.logger.info(f"Leased {volname}.")
+        return volname
+
+    def close(self):
+        """
+        Remove the volume which wasn't leased, wait for the builds and the
+        removals to end and release the connections of the pool.
+        """
+        if self.build is not None:
+            self.executor.submit(self._remove, self.build[1])
+            self.build = None
+        self.executor.shutdown(wait=True)
+        self.redant.deconstruct_connection()
+        self.redant.close_logger()
+
+    def _create(self, volname: str, vol_type: str) -> str:
+        """
+        Create, start and mount a volume, the way a test sets up its own.
+        Returns:
+            str: Name of the volume, or None if it couldn't be set up.
+        """
+        start = time.time()
+        mountpoint = f"/mnt/{volname}"
+        try:
+            self.redant.setup_volume(volname, self.server_list[0],
+                                     self.vol_type_inf[vol_type],
+                                     self.server_list, self.brick_roots,
+                                     force=True)
+            for client in self.client_list:
+                self.redant.execute_abstract_op_node(f"mkdir -p {mountpoint}",
+                                                     client)
+                self.redant.volume_mount(self.server_list[0], volname,
+                                         mountpoint, client)
+        except Exception as error:
+            tb = traceback.format_exc()
+            self.redant.logger.error(f"Building {volname} failed : {error}")
+            self.redant.logger.error(tb)
+            self._cleanup(volname)
+            return None
+        self.redant.logger.info(f"Built {volname} in "
+                                f"{time.time() - start:.1f}s")
+        return volname
+
+    def _is_usable(self, volname: str) -> bool:
+        """
+        Whether the volume is started and mounted on all the clients.
+        """
+        try:
+            vol_info = self.redant.get_volume_info(self.server_list[0],
+                                                   volname)
+        except Exception as error:
+            self.redant.logger.error(f"Checking {volname} failed : {error}")
+            return False
+        if (volname not in vol_info
+           or vol_info[volname].get('statusStr') != 'Started'):
+            return False
+        return all(self.redant.is_mounted(volname, f"/mnt/{volname}",
+                                          client, self.server_list[0])
+                   for client in self.client_list)
+
+    def _remove(self, build):
+        """
+        Remove the volume of a build which won't be leased.
+        Args:
+            build (Future): The build of the volume.
+        """
+        volname = build.result()
+        if volname is not None:
+            self._cleanup(volname)
+
+    def _cleanup(self, volname: str):
+        """
+        Unmount and delete a pooled volume, dropping its data even if that
+        fails, as the volume is then left for the teardown of the
+        environment.
+        """
+        if not self.redant.es.does_volume_exists(volname):
+            return
+        # Only the volume is cleaned up, not the snapshots of the cluster
+        # as in cleanup_volumes, since a test might be running beside.
+        mountpoint = f"/mnt/{volname}"
+        try:
+            for client in self.client_list:
+                self.redant.volume_unmount(volname, mountpoint, client,
+                                           excep=False)
+                self.redant.execute_abstract_op_node(f"rm -rf {mountpoint}",
+                                                     client, False)
+            self.redant.cleanup_volume(self.server_list[0], volname)
+        except Exception as error:
+            tb = traceback.format_exc()
+            self.redant.logger.error(f"Removing {volname} failed : {error}")
+            self.redant.logger.error(tb)
+        if self.redant.es.does_volume_exists(volname):
+            self.redant.es.remove_volume_data(volname)
@@ -0,0 +1,139 @@
+"""
+The worker pool keeps the processes which run the tests. A worker is
+forked once per run, connects its SSH connection pool to all the nodes
+while it waits for its first test, and then runs the tests sent to it,
+one at a time, for the whole run. The tests and their results travel
+over a pipe per worker, and a worker which dies is noticed as soon as
+its pipe closes.
+"""
+import concurrent.futures
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import wait
+from common.rexe import ConnectionPool
+
+
+class WorkerPool:
+    """
+    A set of long lived worker processes, addressed by their index.
+    """
+
+    def __init__(self, run_fn, nodes: list, logger, exit_fn=None):
+        """
+        Args:
+            run_fn (callable): Runs a job in the worker and returns its
+                               result.
+            nodes (list): The nodes whose connections the workers open
+                          up front.
+            logger: The logger of the owning process.
+            exit_fn (callable): Run in the worker as it exits, if given.
+        """
+        self.run_fn = run_fn
+        self.exit_fn = exit_fn
+        self.nodes = nodes
+        self.logger = logger
+        self.procs = {}
+        self.conns = {}
+
+    def start(self, worker_id: int):
+        """
+        Fork a worker, replacing the earlier worker of the index if any.
+        """
+        self.discard(worker_id)
+        (parent_conn, child_conn) = Pipe()
+        proc = Process(target=self._worker_loop,
+                       args=(worker_id, child_conn,))
+        proc.start()
+        child_conn.close()
+        self.procs[worker_id] = proc
+        self.conns[worker_id] = parent_conn
+
+    def _warm_up(self):
+        """
+        Open the pooled connections of the worker to all the nodes, so
+        that the tests find them ready. A node which can't be reached is
+        left for the tests to report.
+        """
+        if not self.nodes:
+            return
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=len(self.nodes)) as executor:
+            for node in self.nodes:
+                executor.submit(ConnectionPool.lease, node)
+        for node in self.nodes:
+            ConnectionPool.release(node)
+
+    def _worker_loop(self, worker_id: int, conn):
+        """
+        The worker runs the jobs it gets till it gets a None or the pipe
+        is closed.
+        """
+        self._warm_up()
+        while True:
+            try:
+                job = conn.recv()
+            except EOFError:
+                break
+            if job is None:
+                break
+            conn.send(self.run_fn(job))
+        if self.exit_fn is not None:
+            self.exit_fn()
+        conn.close()
+
+    def send(self, worker_id: int, job: dict):
+        """
+        Hand a job to an idle worker.
+        """
+        self.conns[worker_id].send(job)
+
+    def receive(self, timeout: float = None) -> list:
+        """
+        Wait for results from the workers.
+        Args:
+            timeout (float): Seconds to wait, forever if None.
+        Returns:
+            list: (worker id, result) pairs, the result being None for a
+                  worker which died. A dead worker is removed from the
+                  pool.
+        """
+        ready = wait(list(self.conns.values()), timeout)
+        events = []
+        for (worker_id, conn) in list(self.conns.items()):
+            if conn not in ready:
+                continue
+            try:
+                events.append((worker_id, conn.recv()))
+            except (EOFError, OSError):
+                self.logger.error(f"Worker {worker_id} exited.")
+                self.discard(worker_id)
+                events.append((worker_id, None))
+        return events
+
+    def discard(self, worker_id: int):
+        """
+        Drop a worker, terminating it if it is still around.
+        """
+        conn = self.conns.pop(worker_id, None)
+        if conn is not None:
+            conn.close()
+        proc = self.procs.pop(worker_id, None)
+        if proc is not None:
+            if proc.is_alive():
+                proc.terminate()
+            proc.join()
+
+    def stop(self):
+        """
+        Let every worker finish and wait for them to exit.
+        """
+        for conn in self.conns.values():
+            try:
+                conn.send(None)
+            except OSError:
+                pass
+        for proc in self.procs.values():
+            proc.join()
+        for conn in self.conns.values():
+            conn.close()
+        self.procs = {}
+        self.conns = {}
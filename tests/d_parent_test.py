@@ -1,6 +1,7 @@
 import traceback
 import abc
 from common.mixin import RedantMixin
+from common.phase_timer import PhaseTimer
 
 
 class DParentTest(metaclass=abc.ABCMeta):
@@ -13,6 +14,14 @@ class DParentTest(metaclass=abc.ABCMeta):
 
     """
 
+    # The volume pool of the disruptive worker, set by the runner when the
+    # run has one.
+    volume_pool = None
+
+    # Seconds for which the results of the read only gluster queries of
+    # the test are cached, set by a test to opt in to the query cache.
+    query_cache_ttl = None
+
     def __init__(self, mname: str, param_obj, volume_type: str,
                  env_obj, log_path: str, log_level: str = 'I'):
         """
@@ -25,6 +34,7 @@ class DParentTest(metaclass=abc.ABCMeta):
         client_details = param_obj.get_client_config()
 
         self.TEST_RES = [True]
+        self.timer = PhaseTimer()
         self.setup_done = False
         self.volume_type = volume_type
         self.vol_type_inf = param_obj.get_volume_types()
@@ -39,10 +49,14 @@ class DParentTest(metaclass=abc.ABCMeta):
     def _configure(self, mname: str, server_details: dict,
                    client_details: dict, env_obj, log_path: str,
                    log_level: str):
-        self.redant = RedantMixin(server_details, client_details, env_obj,
-                                  self.TEST_RES)
-        self.redant.init_logger(mname, log_path, log_level)
-        self.redant.establish_connection()
+        self.redant = RedantMixin.for_test(server_details, client_details,
+                                           env_obj, self.TEST_RES)
+        if self.query_cache_ttl is not None:
+            self.redant.enable_query_cache(self.query_cache_ttl)
+        self.timer.watch(self.redant)
+        with self.timer.phase("setup.connect"):
+            self.redant.init_logger(mname, log_path, log_level)
+            self.redant.establish_connection()
 
     def setup_test(self):
         pass
@@ -52,40 +66,69 @@ class DParentTest(metaclass=abc.ABCMeta):
         def inner(self, *args, **kwargs):
             self.setup_done = True
             return fun(self, *args, **kwargs)
+        # Marks the test for the runner, which doesn't build a pooled
+        # volume for it.
+        inner.custom_setup = True
         return inner
 
     @abc.abstractmethod
     def run_test(self, redant):
         pass
 
+    def _lease_volume(self) -> bool:
+        """
+        Take the volume of the test from the volume pool, if the run has
+        one and a volume of the type is ready.
+        Returns:
+            bool: True if a volume was leased.
+        """
+        if self.volume_pool is None:
+            return False
+        with self.timer.phase("setup.lease"):
+            vol_name = self.volume_pool.lease(self.volume_type,
+                                              self.redant.es)
+        if vol_name is None:
+            return False
+        self.redant.logger.info(f"Leased the pooled volume {vol_name}")
+        self.vol_name = vol_name
+        self.mountpoint = (f"/mnt/{self.vol_name}")
+        return True
+
     def parent_run_test(self):
         """
         Function to handle the exception logic and invokes the run_test
         which is overridden by every TC.
         """
+        timer = self.timer
         try:
-            self.redant.start_glusterd(self.server_list)
-            self.redant.create_cluster(self.server_list)
-            self.redant.wait_till_all_peers_connected(self.server_list)
+            with timer.phase("setup.start_glusterd"):
+                self.redant.start_glusterd(self.server_list)
+            with timer.phase("setup.create_cluster"):
+                self.redant.create_cluster(self.server_list)
+                self.redant.wait_till_all_peers_connected(self.server_list)
 
             # Call setup in case you want to override volume creation,
             # start, mounting in the TC
-            self.setup_test()
-
-            if not self.setup_done and self.volume_type != "Generic":
-                self.redant.setup_volume(self.vol_name, self.server_list[0],
-                                         self.vol_type_inf[self.volume_type],
-                                         self.server_list, self.brick_roots,
-                                         force=True)
+            with timer.phase("setup.test_setup"):
+                self.setup_test()
+
+            if (not self.setup_done and self.volume_type != "Generic"
+               and not self._lease_volume()):
+                with timer.phase("setup.volume"):
+                    self.redant.setup_volume(
+                        self.vol_name, self.server_list[0],
+                        self.vol_type_inf[self.volume_type],
+                        self.server_list, self.brick_roots, force=True)
                 self.mountpoint = (f"/mnt/{self.vol_name}")
-                for client in self.client_list:
-                    self.redant.execute_abstract_op_node(f"mkdir -p "
-                                                         f"{self.mountpoint}",
-                                                         client)
-                    self.redant.volume_mount(self.server_list[0],
-                                             self.vol_name,
-                                             self.mountpoint, client)
-            self.run_test(self.redant)
+                with timer.phase("setup.mount"):
+                    for client in self.client_list:
+                        self.redant.execute_abstract_op_node(
+                            f"mkdir -p {self.mountpoint}", client)
+                        self.redant.volume_mount(self.server_list[0],
+                                                 self.vol_name,
+                                                 self.mountpoint, client)
+            with timer.phase("body"):
+                self.run_test(self.redant)
 
         except Exception as error:
             tb = traceback.format_exc()
@@ -100,36 +143,43 @@ class DParentTest(metaclass=abc.ABCMeta):
         """
         Closes connection for now.
         """
+        timer = self.timer
         # Check if all nodes are up and running.
-        for machine in self.server_list + self.client_list:
-            ret = self.redant.wait_node_power_up(machine)
-            if not ret:
-                self.redant.logger.error(f"{machine} is offline.")
+        with timer.phase("terminate.power_up"):
+            for machine in self.server_list + self.client_list:
+                ret = self.redant.wait_node_power_up(machine)
+                if not ret:
+                    self.redant.logger.error(f"{machine} is offline.")
 
         # Validate that glusterd is up and running in the servers.
-        self.redant.start_glusterd(self.server_list)
-        if not self.redant.wait_for_glusterd_to_start(self.server_list):
-            raise Exception("Glusterd start failed.")
+        with timer.phase("terminate.start_glusterd"):
+            self.redant.start_glusterd(self.server_list)
+            if not self.redant.wait_for_glusterd_to_start(self.server_list):
+                raise Exception("Glusterd start failed.")
 
         try:
             # Peer probe and validate all peers are in connected state.
-            self.redant.peer_probe_servers(self.server_list,
-                                           self.server_list[0])
+            with timer.phase("terminate.peer_probe"):
+                self.redant.peer_probe_servers(self.server_list,
+                                               self.server_list[0])
         except Exception as error:
             tb = traceback.format_exc()
             self.redant.logger.error(error)
             self.redant.logger.error(tb)
 
         try:
-            for (opt, _) in self.redant.es.get_vol_options_all().items():
-                self.redant.reset_volume_option('all', opt,
-                                                self.server_list[0])
-            self.redant.cleanup_volumes(self.server_list)
+            with timer.phase("terminate.cleanup"):
+                for (opt, _) in self.redant.es.get_vol_options_all().items():
+                    self.redant.reset_volume_option('all', opt,
+                                                    self.server_list[0])
+                self.redant.cleanup_volumes(self.server_list)
         except Exception as error:
             tb = traceback.format_exc()
             self.redant.logger.error(error)
             self.redant.logger.error(tb)
-            self.redant.hard_terminate(self.server_list, self.client_list,
-                                       self.brick_roots)
+            with timer.phase("terminate.hard_terminate"):
+                self.redant.hard_terminate(self.server_list,
+                                           self.client_list,
+                                           self.brick_roots)
         finally:
             self.redant.deconstruct_connection()
@@ -1,6 +1,7 @@
 import traceback
 import abc
 from common.mixin import RedantMixin
+from common.phase_timer import PhaseTimer
 
 
 class LazyParentTest(metaclass=abc.ABCMeta):
@@ -13,17 +14,25 @@ class LazyParentTest(metaclass=abc.ABCMeta):
     TEST_RES: states the result of the test case
     """
 
+    # Seconds for which the results of the read only gluster queries of
+    # the test are cached, set by a test to opt in to the query cache.
+    query_cache_ttl = None
+
     def __init__(self, mname: str, param_obj, volume_type: str,
-                 env_obj, log_path: str, log_level: str = 'I'):
+                 env_obj, log_path: str, log_level: str = 'I',
+                 vol_name: str = None):
         """
-        Lazy parent will only initialize the connection.
+        Lazy parent will only initialize the connection. The volume name
+        is given when the volume isn't redant-<volume type>.
         """
 
         server_details = param_obj.get_server_config()
         client_details = param_obj.get_client_config()
 
         self.TEST_RES = [True]
+        self.timer = PhaseTimer()
         self.volume_type = volume_type
+        self.lane_vol_name = vol_name
         self.vol_type_inf = param_obj.get_volume_types()
         self._configure(f"{mname}-{volume_type}", server_details,
                         client_details, env_obj, log_path, log_level)
@@ -34,10 +43,14 @@ class LazyParentTest(metaclass=abc.ABCMeta):
     def _configure(self, mname: str, server_details: dict,
                    client_details: dict, env_obj, log_path: str,
                    log_level: str):
-        self.redant = RedantMixin(server_details, client_details, env_obj,
-                                  self.TEST_RES)
-        self.redant.init_logger(mname, log_path, log_level)
-        self.redant.establish_connection()
+        self.redant = RedantMixin.for_test(server_details, client_details,
+                                           env_obj, self.TEST_RES)
+        if self.query_cache_ttl is not None:
+            self.redant.enable_query_cache(self.query_cache_ttl)
+        self.timer.watch(self.redant)
+        with self.timer.phase("setup.connect"):
+            self.redant.init_logger(mname, log_path, log_level)
+            self.redant.establish_connection()
         self.test_name = mname
 
     @abc.abstractmethod
@@ -50,9 +63,11 @@ class LazyParentTest(metaclass=abc.ABCMeta):
         which is overridden by by child test.
         """
         try:
-            self.vol_name = (f"redant-{self.volume_type}")
-            self.mountpoint = (f"/mnt/redant-{self.volume_type}")
-            self.run_test(self.redant)
+            self.vol_name = (self.lane_vol_name
+                             or f"redant-{self.volume_type}")
+            self.mountpoint = (f"/mnt/{self.vol_name}")
+            with self.timer.phase("body"):
+                self.run_test(self.redant)
         except Exception as error:
             tb = traceback.format_exc()
             self.redant.logger.error(error)
@@ -1,6 +1,7 @@
 import traceback
 import abc
 from common.mixin import RedantMixin
+from common.phase_timer import PhaseTimer
 
 
 class NdParentTest(metaclass=abc.ABCMeta):
@@ -13,15 +14,22 @@ class NdParentTest(metaclass=abc.ABCMeta):
 
     """
 
+    # Seconds for which the results of the read only gluster queries of
+    # the test are cached, set by a test to opt in to the query cache.
+    query_cache_ttl = None
+
     def __init__(self, mname: str, param_obj, volume_type: str,
-                 env_obj, log_path: str, log_level: str = 'I'):
+                 env_obj, log_path: str, log_level: str = 'I',
+                 vol_name: str = None):
         """
-        Initializing connection and logging.
+        Initializing connection and logging. The volume name is given
+        when the test runs on a volume other than redant-<volume type>.
         """
 
         server_details = param_obj.get_server_config()
         client_details = param_obj.get_client_config()
         self.TEST_RES = [True]
+        self.timer = PhaseTimer()
         self.volume_type = volume_type
         self.vol_type_inf = param_obj.get_volume_types()
         self._configure(f"{mname}-{volume_type}", server_details,
@@ -30,16 +38,20 @@ class NdParentTest(metaclass=abc.ABCMeta):
         self.client_list = param_obj.get_client_ip_list()
         self.brick_roots = param_obj.get_brick_roots()
         if self.volume_type != "Generic":
-            self.vol_name = (f"redant-{volume_type}")
+            self.vol_name = vol_name or (f"redant-{volume_type}")
             self.mountpoint = (f"/mnt/{self.vol_name}")
 
     def _configure(self, mname: str, server_details: dict,
                    client_details: dict, env_obj, log_path: str,
                    log_level: str):
-        self.redant = RedantMixin(server_details, client_details, env_obj,
-                                  self.TEST_RES)
-        self.redant.init_logger(mname, log_path, log_level)
-        self.redant.establish_connection()
+        self.redant = RedantMixin.for_test(server_details, client_details,
+                                           env_obj, self.TEST_RES)
+        if self.query_cache_ttl is not None:
+            self.redant.enable_query_cache(self.query_cache_ttl)
+        self.timer.watch(self.redant)
+        with self.timer.phase("setup.connect"):
+            self.redant.init_logger(mname, log_path, log_level)
+            self.redant.establish_connection()
         self.test_name = mname
         self.pre_test_env = env_obj
 
@@ -53,7 +65,8 @@ class NdParentTest(metaclass=abc.ABCMeta):
         which is overridden by every TC.
         """
         try:
-            self.run_test(self.redant)
+            with self.timer.phase("body"):
+                self.run_test(self.redant)
         except Exception as error:
             tb = traceback.format_exc()
             self.redant.logger.error(error)
@@ -67,21 +80,25 @@ class NdParentTest(metaclass=abc.ABCMeta):
         """
         Closes connection and checks the env
         """
+        timer = self.timer
         # Check if all nodes are up and running.
-        for machine in self.server_list + self.client_list:
-            ret = self.redant.wait_node_power_up(machine)
-            if not ret:
-                self.redant.logger.error(f"{machine} is offline.")
+        with timer.phase("terminate.power_up"):
+            for machine in self.server_list + self.client_list:
+                ret = self.redant.wait_node_power_up(machine)
+                if not ret:
+                    self.redant.logger.error(f"{machine} is offline.")
 
         # Validate that glusterd is up and running in the servers.
-        self.redant.start_glusterd(self.server_list)
-        if not self.redant.wait_for_glusterd_to_start(self.server_list):
-            raise Exception("Glusterd start failed.")
+        with timer.phase("terminate.start_glusterd"):
+            self.redant.start_glusterd(self.server_list)
+            if not self.redant.wait_for_glusterd_to_start(self.server_list):
+                raise Exception("Glusterd start failed.")
 
         try:
             # Peer probe and validate all peers are in connected state.
-            self.redant.peer_probe_servers(self.server_list,
-                                           self.server_list[0])
+            with timer.phase("terminate.peer_probe"):
+                self.redant.peer_probe_servers(self.server_list,
+                                               self.server_list[0])
         except Exception as error:
             tb = traceback.format_exc()
             self.redant.logger.error(error)
@@ -91,9 +108,11 @@ class NdParentTest(metaclass=abc.ABCMeta):
             try:
                 # Volume started state.
                 vol_param = self.vol_type_inf[self.volume_type]
-                self.redant.sanitize_volume(self.vol_name, self.server_list,
-                                            self.client_list, self.brick_roots,
-                                            vol_param)
+                with timer.phase("terminate.cleanup"):
+                    self.redant.sanitize_volume(self.vol_name,
+                                                self.server_list,
+                                                self.client_list,
+                                                self.brick_roots, vol_param)
             except Exception as e:
                 tb = traceback.format_exc()
                 self.redant.logger.error(e)
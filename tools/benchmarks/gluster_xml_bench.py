@@ -0,0 +1,78 @@
+"""
+Benchmark for the decoding of the gluster CLI XML output. Every recorded
+output under tools/benchmarks/samples is decoded with the earlier path
+( xmltodict followed by a json round trip ) and with the gluster_xml
+decoder. The script checks that both produce the same result and reports
+the throughput of each.
+
+    python3 tools/benchmarks/gluster_xml_bench.py -i 50
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import xmltodict
+sys.path.insert(1, ".")
+from common.gluster_xml import decode_cli_output
+
+SAMPLES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                           "samples")
+
+
+def pars_args():
+    """
+    Function to handle command line parsing for the benchmark.
+    """
+    parser = argparse.ArgumentParser(
+        description='Gluster CLI XML decoding benchmark.')
+    parser.add_argument("-i", "--iterations",
+                        help="Number of decodes per sample and decoder.",
+                        dest="iterations", default=50, type=int)
+    parser.add_argument("-s", "--samples-dir",
+                        help="Directory with the recorded XML outputs.",
+                        dest="samples_dir", default=SAMPLES_DIR, type=str)
+    return parser.parse_args()
+
+
+def xmltodict_decode(data: str) -> dict:
+    """
+    The decoding which Rexe used earlier.
+    """
+    return json.loads(json.dumps(xmltodict.parse(data)))['cliOutput']
+
+
+def measure(decoder, data: str, iterations: int) -> float:
+    """
+    Returns the time taken by one decode, best of the iterations.
+    """
+    best = None
+    for _ in range(iterations):
+        start = time.perf_counter()
+        decoder(data)
+        taken = time.perf_counter() - start
+        if best is None or taken < best:
+            best = taken
+    return best
+
+
+def main():
+    args = pars_args()
+    print(f"{'sample':<28}{'KiB':>8}{'xmltodict MB/s':>16}"
+          f"{'gluster_xml MB/s':>18}{'speedup':>9}")
+    for name in sorted(os.listdir(args.samples_dir)):
+        if not name.endswith(".xml"):
+            continue
+        with open(os.path.join(args.samples_dir, name)) as sample:
+            data = sample.read()
+        if decode_cli_output(data) != xmltodict_decode(data):
+            raise Exception(f"Decoded output of {name} differs")
+        size = len(data.encode()) / 1e6
+        old = measure(xmltodict_decode, data, args.iterations)
+        new = measure(decode_cli_output, data, args.iterations)
+        print(f"{name:<28}{size * 1e3 / 1.024:>8.1f}{size / old:>16.1f}"
+              f"{size / new:>18.1f}{old / new:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
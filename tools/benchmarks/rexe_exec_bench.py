@@ -0,0 +1,74 @@
+"""
+Benchmark for the remote execution modes of Rexe. It runs the same set of
+small commands against a node, once opening a new channel per command
+(the 'channel' mode) and once through the multiplexed agent (the 'mux'
+mode), and reports the per command latency of both.
+
+A local sshd works as a stand-in for a gluster node,
+    python3 tools/benchmarks/rexe_exec_bench.py -n localhost -i 500
+Passwordless root ssh to the node is required, same as for redant runs.
+"""
+import sys
+import time
+import logging
+import argparse
+import statistics
+sys.path.insert(1, ".")
+from common.rexe import Rexe
+
+
+def pars_args():
+    """
+    Function to handle command line parsing for the benchmark.
+    """
+    parser = argparse.ArgumentParser(
+        description='Rexe execution mode benchmark.')
+    parser.add_argument("-n", "--node", help="Node to run the commands on.",
+                        dest="node", default="localhost", type=str)
+    parser.add_argument("-i", "--iterations",
+                        help="Number of commands per mode.",
+                        dest="iterations", default=200, type=int)
+    parser.add_argument("--cmd", help="Command to be run.",
+                        dest="cmd", default="echo redant", type=str)
+    return parser.parse_args()
+
+
+def run_mode(rexe, mode: str, node: str, cmd: str,
+             iterations: int) -> list:
+    """
+    Run the command iterations times in the given mode and return the
+    latency of every run.
+    """
+    Rexe.set_exec_mode(mode)
+    # Warm up, so that the agent start is not part of the numbers.
+    rexe.execute_command(cmd, node)
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        ret = rexe.execute_command(cmd, node)
+        latencies.append(time.perf_counter() - start)
+        if ret['error_code'] != 0:
+            raise Exception(f"{cmd} failed in {mode} mode : {ret}")
+    return latencies
+
+
+def main():
+    args = pars_args()
+    rexe = Rexe({args.node: {}}, {})
+    rexe.logger = logging.getLogger("rexe_bench")
+    rexe.establish_connection()
+
+    print(f"{'mode':<8}{'total(s)':>10}{'mean(ms)':>10}{'p50(ms)':>10}"
+          f"{'p95(ms)':>10}")
+    for mode in Rexe.valid_exec_modes:
+        lat = run_mode(rexe, mode, args.node, args.cmd, args.iterations)
+        lat_ms = sorted(val * 1000 for val in lat)
+        p95 = lat_ms[int(len(lat_ms) * 0.95) - 1]
+        print(f"{mode:<8}{sum(lat):>10.2f}{statistics.mean(lat_ms):>10.2f}"
+              f"{statistics.median(lat_ms):>10.2f}{p95:>10.2f}")
+
+    rexe.deconstruct_connection(purge=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark for the reading of the test flags during the test discovery.
+The header of every test module under the given directory is read with
+the earlier path ( comment_parser, if it is installed ) and with the
+header scanner of core/test_header.py. The script checks that both read
+the same flags and reports the time taken by each, followed by the time
+of a full scan of the modules, serial and over a process pool.
+
+    python3 tools/benchmarks/test_header_bench.py -t tests -i 5
+"""
+import os
+import sys
+import time
+import argparse
+sys.path.insert(1, ".")
+from core.test_header import (scan_test_header, scan_test_module,
+                              scan_test_modules)
+try:
+    from comment_parser.comment_parser import extract_comments
+except ImportError:
+    extract_comments = None
+
+
+def pars_args():
+    """
+    Function to handle command line parsing for the benchmark.
+    """
+    parser = argparse.ArgumentParser(
+        description='Test header scanning benchmark.')
+    parser.add_argument("-t", "--test-dir",
+                        help="Directory with the test modules.",
+                        dest="test_dir", default="tests", type=str)
+    parser.add_argument("-i", "--iterations",
+                        help="Number of passes over the modules per reader.",
+                        dest="iterations", default=5, type=int)
+    parser.add_argument("-p", "--processes",
+                        help="Size of the pool for the parallel scan.",
+                        dest="processes", default=os.cpu_count(), type=int)
+    return parser.parse_args()
+
+
+def comment_parser_flags(tc_path: str) -> dict:
+    """
+    The reading of the flags which the TestListBuilder did earlier.
+    """
+    flags = str(extract_comments(tc_path, mime="text/x-python")[0])
+    vol_types = flags.split(';')[1].split(',')
+    if vol_types == ['']:
+        vol_types = ["Generic"]
+    return {"tcNature": flags.split(';')[0].strip(), "volType": vol_types}
+
+
+def measure(reader, tc_paths: list, iterations: int) -> float:
+    """
+    Returns the time taken by one pass over the modules, best of the
+    iterations.
+    """
+    best = None
+    for _ in range(iterations):
+        start = time.perf_counter()
+        reader(tc_paths)
+        taken = time.perf_counter() - start
+        if best is None or taken < best:
+            best = taken
+    return best
+
+
+def main():
+    args = pars_args()
+    tc_paths = []
+    for root, _, files in os.walk(args.test_dir):
+        tc_paths.extend(os.path.join(root, tfile) for tfile in files
+                        if tfile.startswith("test") and tfile.endswith(".py"))
+    tc_paths.sort()
+    print(f"{len(tc_paths)} test modules under {args.test_dir}")
+
+    results = []
+    if extract_comments is not None:
+        for tc_path in tc_paths:
+            old = comment_parser_flags(tc_path)
+            new = scan_test_header(tc_path)
+            if (old["tcNature"], old["volType"]) != (new["tcNature"],
+                                                     new["volType"]):
+                raise Exception(f"Flags of {tc_path} differ")
+        results.append(("comment_parser", measure(
+            lambda paths: [comment_parser_flags(path) for path in paths],
+            tc_paths, args.iterations)))
+    else:
+        print("comment_parser isn't installed, skipping the earlier path")
+    results.append(("header scan", measure(
+        lambda paths: [scan_test_header(path) for path in paths],
+        tc_paths, args.iterations)))
+    results.append(("full scan, serial", measure(
+        lambda paths: [scan_test_module(path) for path in paths],
+        tc_paths, args.iterations)))
+    results.append((f"full scan, {args.processes} processes", measure(
+        lambda paths: scan_test_modules([(path, None) for path in paths],
+                                        args.processes),
+        tc_paths, args.iterations)))
+
+    print(f"{'reader':<32}{'total ms':>10}{'per module us':>16}")
+    for (name, taken) in results:
+        print(f"{name:<32}{taken * 1e3:>10.1f}"
+              f"{taken * 1e6 / max(len(tc_paths), 1):>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
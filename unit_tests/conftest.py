@@ -0,0 +1,14 @@
+"""
+The unit tests of the framework itself, which run without a cluster,
+
+    python3 -m pytest unit_tests
+
+The core modules import each other as top level modules, hence the core
+directory is put on the path, like redant_main does.
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "core"))
@@ -0,0 +1,135 @@
+"""
+Tests for the sharding of the test list across the clusters.
+"""
+import logging
+import os
+import sys
+import cluster_runner
+from cluster_runner import ClusterRunner
+
+
+def make_test(name: str, nature: str = "nonDisruptive") -> dict:
+    return {'modulePath': f"tests/functional/afr/{name}.py",
+            'moduleName': f"{name}.py", 'tcNature': nature}
+
+
+class FakeBuilder:
+
+    nd_tests = {'rep': [make_test(f"test_r{i}") for i in range(3)],
+                'dist': [make_test(f"test_d{i}") for i in range(3)],
+                'Generic': [make_test(f"test_g{i}") for i in range(2)]}
+
+    @classmethod
+    def get_ndtest_list(cls, vol_type):
+        return cls.nd_tests.get(vol_type, [])
+
+    @staticmethod
+    def get_dtest_list():
+        return [dict(make_test("test_x", "disruptive"), volType='rep')]
+
+    @staticmethod
+    def get_special_tests_dict():
+        return []
+
+    @staticmethod
+    def get_spec_vol_types():
+        return []
+
+
+class FakeParams:
+
+    def __init__(self, idx: int):
+        self.idx = idx
+        self.volume_types = {'rep': {}, 'dist': {}}
+
+
+class FakeEnviron:
+    """
+    The environ of a cluster, whose set up fails on the cluster 1.
+    """
+
+    def __init__(self, param_obj, *args):
+        self.param_obj = param_obj
+
+    def setup_env(self, keep_logs):
+        if self.param_obj.idx == 1:
+            sys.exit(0)
+
+    def teardown_env(self):
+        pass
+
+
+class FakeTestRunner:
+    """
+    Passes the non disruptive tests of the shard and the disruptive
+    tests it takes, the cluster 2 dying after its first test.
+    """
+
+    _abandoned_result = cluster_runner.TestRunner._abandoned_result
+
+    @classmethod
+    def init(cls, shard, param_obj, env_set, *args, **kwargs):
+        cls.shard = shard
+        cls.idx = param_obj.idx
+        cls.sink = args[5]
+
+    @classmethod
+    def run_tests(cls, env_obj):
+        tests = [(vol_type, test)
+                 for (vol_type, vol_tests) in cls.shard.nd_tests.items()
+                 for test in vol_tests]
+        tests.extend((test['volType'], test)
+                     for test in cls.shard.get_dtest_list())
+        for (count, (vol_type, test)) in enumerate(tests):
+            if cls.idx == 2 and count == 1:
+                # Flush the results sent so far before dying.
+                ClusterRunner.result_queue.close()
+                ClusterRunner.result_queue.join_thread()
+                os._exit(1)
+            cls.sink({test['moduleName'][:-3]: {
+                'timeTaken': 1, 'volType': vol_type, 'testResult': "PASS",
+                'skipReason': "NA", 'tcNature': test['tcNature'],
+                'modulePath': test['modulePath']}})
+
+
+def shard_tests(idx: int) -> list:
+    return [test for tests in ClusterRunner.shards[idx].nd_tests.values()
+            for test in tests]
+
+
+class FakeEnv:
+
+    def init_ds(self):
+        pass
+
+
+def test_failed_clusters_report_their_shards(monkeypatch, tmp_path):
+    monkeypatch.setattr(cluster_runner, "environ", FakeEnviron)
+    monkeypatch.setattr(cluster_runner, "TestRunner", FakeTestRunner)
+    monkeypatch.setattr(cluster_runner.FrameworkEnv, "getInstance",
+                        staticmethod(FakeEnv))
+    ClusterRunner.init(FakeBuilder, [FakeParams(idx) for idx in range(3)],
+                       str(tmp_path), 'I', 1, False, None,
+                       logging.getLogger("clusters"))
+    results = ClusterRunner.run_tests(None, False)
+
+    expected = {(test['modulePath'], vol_type)
+                for (vol_type, tests) in FakeBuilder.nd_tests.items()
+                for test in tests}
+    expected.add((make_test("test_x")['modulePath'], 'rep'))
+    stats = [list(result.values())[0] for result in results]
+    assert {(test_stats['modulePath'], test_stats['volType'])
+            for test_stats in stats} == expected
+    assert len(stats) == len(expected)
+    reasons = {test_stats['modulePath']: test_stats['skipReason']
+               for test_stats in stats
+               if test_stats['testResult'] == "SKIP"}
+    for test in shard_tests(1):
+        assert (reasons[test['modulePath']]
+                == "Cluster 1 failed : Environment setup failed")
+    lost = [test for test in shard_tests(2)
+            if test['modulePath'] in reasons]
+    assert len(lost) == ClusterRunner.shards[2].get_nd_tests_count() - 1
+    assert all(reasons[test['modulePath']]
+               == "Cluster 2 failed : Cluster process exited with code 1"
+               for test in lost)
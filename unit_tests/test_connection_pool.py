@@ -0,0 +1,89 @@
+"""
+Tests for the leases of the ConnectionPool.
+"""
+import concurrent.futures
+import time
+import pytest
+from common.rexe import ConnectionPool, Rexe
+
+
+class FakeClient:
+
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    ConnectionPool._owner_pid = None
+    ConnectionPool._check_owner()
+    monkeypatch.setattr(ConnectionPool, "_open",
+                        staticmethod(lambda node, timeout=None: FakeClient()))
+    monkeypatch.setattr(ConnectionPool, "is_healthy",
+                        staticmethod(lambda client: (client is not None
+                                                     and not client.closed)))
+    yield ConnectionPool
+    ConnectionPool._owner_pid = None
+
+
+def test_evict_keeps_a_leased_client_open(pool):
+    first = pool.lease("n1")
+    assert pool.lease("n1") is first
+    pool.evict("n1")
+    assert not first.closed
+    second = pool.lease("n1")
+    assert second is not first
+    pool.release("n1", first)
+    assert not first.closed
+    pool.release("n1", first)
+    assert first.closed
+    assert not second.closed
+
+
+def test_evict_closes_an_unleased_client(pool):
+    client = pool.lease("n1")
+    pool.release("n1", client)
+    pool.evict("n1")
+    assert client.closed
+
+
+def test_release_defaults_to_the_pooled_client(pool):
+    client = pool.lease("n1")
+    pool.release("n1")
+    assert pool._leases.get(client) is None
+    pool.close_all()
+    assert client.closed
+
+
+def test_late_connect_is_dropped(pool, monkeypatch):
+    opened = []
+
+    def slow_open(node, timeout=None):
+        if node == "slow":
+            time.sleep(0.3)
+        client = FakeClient()
+        opened.append((node, client))
+        return client
+
+    monkeypatch.setattr(ConnectionPool, "_open", staticmethod(slow_open))
+    rexe = Rexe({"fast": {}, "slow": {}}, {})
+    rexe.logger = type("L", (), {"debug": print, "error": print})()
+    with pytest.raises(Exception):
+        rexe.establish_connection(timeout=1, deadline=0.1)
+    assert list(rexe.node_dict) == ["fast"]
+    time.sleep(0.5)
+    assert list(rexe.node_dict) == ["fast"]
+    slow_client = dict(opened)["slow"]
+    assert pool._leases.get(slow_client) is None
+    rexe.deconstruct_connection()
+    assert not any(pool._leases.values())
+
+
+def test_lease_is_thread_safe(pool):
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        clients = list(executor.map(lambda _: pool.lease("n1"), range(32)))
+    assert len(set(map(id, clients))) == 1
+    assert pool._leases[clients[0]] == 32
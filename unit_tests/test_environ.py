@@ -0,0 +1,112 @@
+"""
+Tests for the state of the FrameworkEnv.
+"""
+import copy
+import pytest
+from environ import EnvStore, FrameworkEnv
+
+
+def new_model():
+    return FrameworkEnv.model({'volds': {}, 'clusteropt': {}, 'snapm': {}})
+
+
+def new_env():
+    es = FrameworkEnv.__new__(FrameworkEnv)
+    es._manager = None
+    es._use_store(EnvStore())
+    return es
+
+
+def test_model_lookups_follow_the_changes():
+    es = new_model()
+    es.set_new_volume('a', {'n1': ["/b/a1"], 'n2': ["/b/a2"]})
+    assert es.get_brick_volume("n1:/b/a1") == 'a'
+    assert es.get_node_volumes('n2') == ['a']
+
+    es.remove_volume_data('a')
+    es.set_new_volume('b', {'n1': ["/b/b1"]})
+    assert es.get_brick_volume("n1:/b/a1") is None
+    assert es.get_brick_volume("n1:/b/b1") == 'b'
+    assert es.get_all_bricks_list('b') == ["n1:/b/b1"]
+    assert es.get_node_volumes('n2') == []
+
+    es.add_bricks_to_brickdata('b', {'n2': ["/b/b2"]})
+    es.add_new_mountpath('b', 'c1', "/mnt/b")
+    assert es.get_all_bricks_list('b') == ["n1:/b/b1", "n2:/b/b2"]
+    assert es.get_client_mounts('c1') == [{"volname": 'b',
+                                          "mountpath": "/mnt/b"}]
+
+
+@pytest.mark.parametrize("make_env", [new_model, new_env])
+def test_views_of_a_snapshot_stay_as_they_are(make_env):
+    es = make_env()
+    es.set_new_volume('a', {'n1': ["/b/a1"]})
+    es.add_new_mountpath('a', 'c1', "/mnt/a")
+    es.add_new_snap_mountpath('s1', 'c1', "/mnt/s1")
+    es.set_vol_options_all({'cluster.brick-multiplex': "on"})
+    vol_dict = es.get_volume_dict('a')
+    bricks = es.get_brick_list('a', 'n1')
+    mounts = es.get_mnt_pts_list('a')
+    snap_mounts = es.get_snap_mnt_dict()
+    cluster_options = es.get_vol_options_all()
+
+    es.add_bricks_to_brickdata('a', {'n1': ["/b/a2"]})
+    es.remove_mountpath('a', 'c1', "/mnt/a")
+    es.set_vol_option('a', {'performance.cache-size': "32MB"})
+    es.remove_snap_mountpath('s1', 'c1', "/mnt/s1")
+    es.reset_vol_options_all(['cluster.brick-multiplex'])
+    assert vol_dict['brickdata'] == {'n1': ["/b/a1"]}
+    assert vol_dict['mountpath'] == {'c1': ["/mnt/a"]}
+    assert vol_dict['options'] == {}
+    assert bricks == ["/b/a1"]
+    assert mounts == [["/mnt/a"]]
+    assert snap_mounts == {'s1': {'c1': ["/mnt/s1"]}}
+    assert cluster_options == {'cluster.brick-multiplex': "on"}
+    assert es.get_brick_list('a', 'n1') == ["/b/a1", "/b/a2"]
+    assert es.get_snap_mnt_dict('s1') == {'c1': []}
+
+
+def test_views_are_read_only():
+    es = new_env()
+    es.set_new_volume('a', {'n1': ["/b/a1"]})
+    vol_dict = es.get_volume_dict('a')
+    with pytest.raises(TypeError):
+        vol_dict['started'] = True
+    with pytest.raises(TypeError):
+        vol_dict['brickdata']['n2'] = []
+    with pytest.raises(AttributeError):
+        es.get_brick_list('a', 'n1').append("/b/a2")
+
+    vol_copy = copy.deepcopy(vol_dict)
+    vol_copy['brickdata']['n1'].append("/b/a2")
+    assert type(vol_copy['brickdata']['n1']) is list
+    assert es.get_all_bricks_list('a') == ["n1:/b/a1"]
+
+
+def test_changes_copy_only_what_they_touch():
+    es = new_env()
+    es.set_new_volume('a', {'n1': ["/b/a1"]})
+    es.set_new_volume('b', {'n1': ["/b/b1"]})
+    (_, before) = es._store.snapshot()
+    es.set_vol_option('a', {'performance.cache-size': "32MB"})
+    (_, after) = es._store.snapshot()
+    assert after is not before
+    assert after['volds']['b'] is before['volds']['b']
+    assert after['volds']['a'] is not before['volds']['a']
+    assert before['volds']['a']['options'] == {}
+
+
+def test_arguments_are_copied_and_failed_changes_dropped():
+    es = new_model()
+    brickdata = {'n1': ["/b/a1"]}
+    es.set_new_volume('a', brickdata)
+    brickdata['n1'].append("/b/a2")
+    assert es.get_brick_list('a', 'n1') == ["/b/a1"]
+
+    # The bricks of n1 are removed before the missing brick of n2 fails
+    # the change.
+    es.add_bricks_to_brickdata('a', {'n2': ["/b/a2"]})
+    with pytest.raises(ValueError):
+        es.remove_bricks_from_brickdata('a', {'n1': ["/b/a1"],
+                                              'n2': ["/b/a3"]})
+    assert es.get_all_bricks_list('a') == ["n1:/b/a1", "n2:/b/a2"]
@@ -0,0 +1,46 @@
+"""
+Tests for the ops object a worker reuses across its tests.
+"""
+import copy
+import logging
+from common.mixin import RedantMixin
+from common.rexe import ConnectionPool
+
+SERVERS = {'n1': {'ip': "127.0.0.1"}}
+CLIENTS = {'c1': {'ip': "127.0.0.1"}}
+
+
+def test_no_state_leaks_between_tests(monkeypatch):
+    released = []
+    monkeypatch.setattr(ConnectionPool, "release",
+                        classmethod(lambda cls, node, client=None:
+                                    released.append((node, client))))
+    first = RedantMixin.for_test(SERVERS, CLIENTS, "es1", [None])
+    fresh = copy.deepcopy({attr: value
+                           for (attr, value) in vars(first).items()
+                           if attr not in ('es', 'TEST_RES')})
+
+    # The first test changes what it can and dies before its terminate.
+    first.logger = logging.getLogger("test_first")
+    first.enable_query_cache(60)
+    first.query_cache_ttl = 60
+    first.command_stats['commands'] += 5
+    first.host_generic.append('n1')
+    first.node_dict = {'n1': "client"}
+    first.volname = "vol1"
+
+    second = RedantMixin.for_test(SERVERS, CLIENTS, "es2", [True])
+    assert second is first
+    assert released == [('n1', "client")]
+    assert second.es == "es2" and second.TEST_RES == [True]
+    assert second.query_cache is None
+    assert second.query_cache_ttl == RedantMixin.query_cache_ttl
+    assert {attr: value for (attr, value) in vars(second).items()
+            if attr not in ('es', 'TEST_RES')} == fresh
+
+
+def test_new_object_for_another_config():
+    first = RedantMixin.for_test(SERVERS, CLIENTS, "es1", [None])
+    second = RedantMixin.for_test(SERVERS, {}, "es2", [None])
+    assert second is not first
+    assert second.client_dict == {}
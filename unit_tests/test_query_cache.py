@@ -0,0 +1,79 @@
+"""
+Tests for the query cache of the AbstractOps.
+"""
+import logging
+import time
+from common.command_result import CommandResult
+from common.ops.abstract_ops import AbstractOps
+
+
+class FakeOps(AbstractOps):
+    """
+    Runs no command, but has every command observed by the query cache
+    the way Rexe does.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger("query_cache")
+        self.query_cache = None
+        self.runs = []
+
+    def execute_command(self, cmd, node, **kwargs):
+        self.runs.append(cmd)
+        if self.query_cache is not None:
+            self.query_cache.observe(cmd)
+        return CommandResult(cmd, node, 0, f"{len(self.runs)}\n".encode())
+
+
+def test_disabled_by_default():
+    ops = FakeOps()
+    for _ in range(2):
+        ops.execute_abstract_op_node("gluster volume list", "n1")
+    assert len(ops.runs) == 2
+
+
+def test_hit():
+    ops = FakeOps()
+    ops.enable_query_cache(10)
+    first = ops.execute_abstract_op_node("gluster volume list", "n1")
+    second = ops.execute_abstract_op_node("gluster  volume list", "n1")
+    assert ops.runs == ["gluster volume list"]
+    assert second['msg'] == first['msg']
+    assert ops.query_cache.hits == 1
+    # Another node is a different entry.
+    ops.execute_abstract_op_node("gluster volume list", "n2")
+    assert len(ops.runs) == 2
+
+
+def test_invalidated_by_a_write():
+    ops = FakeOps()
+    ops.enable_query_cache(10)
+    ops.execute_abstract_op_node("gluster volume info v1", "n1")
+    ops.execute_abstract_op_node("gluster volume set v1 a b", "n1")
+    ops.execute_abstract_op_node("gluster volume info v1", "n1")
+    assert len(ops.runs) == 3
+    assert ops.query_cache.invalidations == 1
+    # A read only query which isn't cached leaves the cache alone.
+    ops.execute_abstract_op_node("gluster volume status v1", "n1")
+    ops.execute_abstract_op_node("gluster volume info v1", "n1")
+    assert len(ops.runs) == 4
+
+
+def test_ttl_expiry():
+    ops = FakeOps()
+    ops.enable_query_cache(0.05)
+    ops.execute_abstract_op_node("gluster volume list", "n1")
+    ops.execute_abstract_op_node("gluster volume list", "n1")
+    time.sleep(0.1)
+    ops.execute_abstract_op_node("gluster volume list", "n1")
+    assert len(ops.runs) == 2
+
+
+def test_runtime_state_not_cached():
+    ops = FakeOps()
+    ops.enable_query_cache(10)
+    for cmd in ("gluster pool list", "gluster peer status",
+                "gluster volume status"):
+        for _ in range(2):
+            ops.execute_abstract_op_node(cmd, "n1")
+    assert len(ops.runs) == 6
@@ -0,0 +1,92 @@
+"""
+Tests for the NdDispatcher and the non disruptive stage of the runner.
+"""
+import logging
+from scheduler import DurationHistory, NdDispatcher, plan_nd_jobs
+from test_runner import TestRunner
+
+
+def make_test(name: str, nature: str = "nonDisruptive") -> dict:
+    return {'modulePath': f"tests/functional/afr/{name}.py",
+            'moduleName': f"{name}.py", 'tcNature': nature}
+
+
+SPECIAL = [make_test("vol_create_test", "s"),
+           make_test("vol_destroy_test", "s")]
+
+
+def make_dispatcher(tests: int, workers: int = 1,
+                    generic: int = 0) -> NdDispatcher:
+    history = DurationHistory()
+    vol_tests = {'rep': [make_test(f"test_r{i}") for i in range(tests)]}
+    generic_tests = [make_test(f"test_g{i}") for i in range(generic)]
+    plan = plan_nd_jobs(vol_tests, generic_tests, SPECIAL, workers, history)
+    return NdDispatcher(plan, SPECIAL, workers, history)
+
+
+def test_lost_test_volume_is_destroyed_and_recreated():
+    dispatcher = make_dispatcher(2)
+    create = dispatcher.next_task(0)
+    assert create['kind'] == 'create'
+    dispatcher.task_done(create, True)
+    test = dispatcher.next_task(0)
+    assert test['kind'] == 'test'
+    dispatcher.task_done(test, False, lost=True)
+    assert dispatcher.volumes['rep'][test['lane']] == 'broken'
+    # The remaining test gets a fresh volume, the broken one is destroyed.
+    recreate = dispatcher.next_task(0)
+    assert recreate['kind'] == 'create'
+    assert recreate['lane'] != test['lane']
+    destroy = dispatcher.next_task(1)
+    assert destroy['kind'] == 'destroy'
+    assert destroy['lane'] == test['lane']
+
+
+def test_failed_test_keeps_its_volume():
+    dispatcher = make_dispatcher(2)
+    dispatcher.task_done(dispatcher.next_task(0), True)
+    test = dispatcher.next_task(0)
+    dispatcher.task_done(test, False)
+    assert dispatcher.volumes['rep'][test['lane']] == 'idle'
+
+
+class DeadPool:
+    """
+    A worker pool whose workers can't be handed a job.
+    """
+
+    def send(self, worker_id, job_data):
+        raise BrokenPipeError("worker gone")
+
+    def start(self, worker_id):
+        pass
+
+    def receive(self, timeout=None):
+        return []
+
+
+def test_unfinished_tests_are_failed(monkeypatch):
+    dispatcher = make_dispatcher(0, workers=2, generic=4)
+    monkeypatch.setattr(TestRunner, "dispatcher", dispatcher, raising=False)
+    monkeypatch.setattr(TestRunner, "nd_pool", DeadPool(), raising=False)
+    monkeypatch.setattr(TestRunner, "concur_count", 2, raising=False)
+    monkeypatch.setattr(TestRunner, "logger", logging.getLogger("runner"),
+                        raising=False)
+    monkeypatch.setattr(TestRunner, "stop_event", None, raising=False)
+    monkeypatch.setattr(TestRunner, "max_failures", None, raising=False)
+    monkeypatch.setattr(TestRunner, "failures", 0, raising=False)
+    monkeypatch.setattr(TestRunner, "result_sink", None, raising=False)
+    monkeypatch.setattr(TestRunner, "ledger", None, raising=False)
+    monkeypatch.setattr(TestRunner, "history", DurationHistory(),
+                        raising=False)
+    results = []
+    TestRunner._run_nd_stage(results)
+    stats = {name: list(result.values())[0] for result in results
+             for name in result}
+    # Two tests couldn't be handed to the workers, and the other two were
+    # left with no worker to run them.
+    assert set(stats) == {f"test_g{i}" for i in range(4)}
+    assert all(test_stats['testResult'] == "FAIL"
+               and test_stats['skipReason'] == "Worker lost"
+               for test_stats in stats.values())
+    assert dispatcher.finished()